@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Activity Similarity Edges
+Sub-quadratic builder for the activity_similarity/verified_connection rules
+
+Two active agents are connected when their posts_count differs by at
+most 2 or both have positive karma, with weight max(1, 5 - post_diff).
+Instead of testing every pair, partners are generated from two indexes:
+
+    posts buckets   agents grouped by posts_count, so the |diff| <= 2
+                    partners of an agent are at most five sorted lists
+    karma tier      the sorted list of agents with karma > 0
+
+Each agent's later partners are produced by merging those sorted lists,
+so the total work is O(n log n + E) and the edges come out in the same
+order as the pairwise loop.
+"""
+
+import heapq
+from bisect import bisect_right
+
+from edge_accumulator import EdgeAccumulator
+
+POST_WINDOW = 2
+HUB_COUNT = 10
+
+
+def activity_edge(id1, posts1, id2, posts2):
+    """The activity_similarity edge dict between two active agents"""
+    post_diff = abs(posts1 - posts2)
+    return {
+        'source': id1,
+        'target': id2,
+        'weight': max(1, 5 - post_diff),  # Higher weight for closer matches
+        'type': 'activity_similarity',
+        'reason': f"Similar activity ({posts1} vs {posts2} posts)"
+    }
+
+
+def _later_partners(posts, karma):
+    """Yield (i, j) for every qualifying pair with i < j, in (i, j) order"""
+    buckets = {}
+    karma_tier = []
+    for i, (agent_posts, agent_karma) in enumerate(zip(posts, karma)):
+        buckets.setdefault(agent_posts, []).append(i)
+        if agent_karma > 0:
+            karma_tier.append(i)
+
+    for i, (agent_posts, agent_karma) in enumerate(zip(posts, karma)):
+        sources = []
+        for value in range(agent_posts - POST_WINDOW, agent_posts + POST_WINDOW + 1):
+            bucket = buckets.get(value)
+            if bucket:
+                sources.append(bucket[bisect_right(bucket, i):])
+        if agent_karma > 0:
+            sources.append(karma_tier[bisect_right(karma_tier, i):])
+
+        last = None
+        for j in heapq.merge(*sources):
+            if j != last:
+                yield i, j
+                last = j
+
+
+def _nearest_partners(posts, karma, max_per_agent):
+    """
+    Yield up to `max_per_agent` strongest partners per agent as (i, j).
+
+    Weight only depends on the posts gap, so the strongest partners are
+    the nearest ones by posts_count among the agents that qualify: the
+    |diff| <= 2 window for everyone, plus the whole karma tier for agents
+    with positive karma. Both are walked outward from the agent's rank.
+    """
+    def ranked(indexes):
+        order = sorted(indexes, key=lambda i: (posts[i], i))
+        return order, {i: r for r, i in enumerate(order)}
+
+    everyone, everyone_rank = ranked(range(len(posts)))
+    karma_tier, karma_rank = ranked(i for i, k in enumerate(karma) if k > 0)
+
+    for i, agent_posts in enumerate(posts):
+        frontier = []
+
+        def push(order, r, step, max_gap):
+            if 0 <= r < len(order):
+                gap = abs(posts[order[r]] - agent_posts)
+                if max_gap is None or gap <= max_gap:
+                    heapq.heappush(frontier, (gap, order[r], r, step, id(order), max_gap))
+
+        walks = {id(everyone): everyone}
+        push(everyone, everyone_rank[i] - 1, -1, POST_WINDOW)
+        push(everyone, everyone_rank[i] + 1, 1, POST_WINDOW)
+        if karma[i] > 0:
+            walks[id(karma_tier)] = karma_tier
+            push(karma_tier, karma_rank[i] - 1, -1, None)
+            push(karma_tier, karma_rank[i] + 1, 1, None)
+
+        taken = set()
+        while frontier and len(taken) < max_per_agent:
+            _, j, r, step, walk, max_gap = heapq.heappop(frontier)
+            if j != i and j not in taken:
+                taken.add(j)
+                yield (i, j) if i < j else (j, i)
+            push(walks[walk], r + step, step, max_gap)
+
+
+def top_posters(active, count=HUB_COUNT):
+    """The `count` most active agents, ties kept in input order"""
+    return active.top('posts_count', count)
+
+
+def build_activity_edges(active, max_per_agent=None):
+    """
+    Build activity_similarity and verified_connection edges.
+
+    `active` is an AgentView of the agents with posts_count > 0; the
+    builders only read its id/posts_count/karma columns. Without a cap
+    the result is identical to comparing every pair. With
+    max_per_agent=k each agent contributes at most its k strongest
+    partners, so there are at most k * len(active) similarity edges.
+    """
+    edges = EdgeAccumulator()
+    ids = active.values('id')
+    posts = active.values('posts_count')
+    karma = active.values('karma')
+
+    if max_per_agent is None:
+        for i, j in _later_partners(posts, karma):
+            edges.insert(activity_edge(ids[i], posts[i], ids[j], posts[j]), unique=False)
+    else:
+        pairs = set(_nearest_partners(posts, karma, max_per_agent))
+        for i, j in sorted(pairs):
+            edges.insert(activity_edge(ids[i], posts[i], ids[j], posts[j]))
+
+    # Verified agents connect to top posters, picked once with a partial sort
+    hubs = top_posters(active).values('id')
+    for v_id in active.where('verified', '!=', 0).values('id'):
+        for top_id in hubs:
+            if top_id != v_id:
+                edges.insert({
+                    'source': v_id,
+                    'target': top_id,
+                    'weight': 3,
+                    'type': 'verified_connection'
+                })
+
+    return edges.to_list()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Agent Directory Capture
+Reads agents from the /u page's own data responses instead of its DOM
+
+The directory loads agents as JSON while it scrolls. AgentCapture listens
+for those XHR/fetch responses and keeps every agent record it finds
+(username plus karma, posts_count, etc.), so a scroll costs no per-element
+browser round-trips. Records are recognised by shape, not by endpoint:
+any list of objects carrying a username, or a name plus agent stats, at
+any depth of the payload.
+
+When no JSON with agents has been seen (e.g. the first page arrived
+server-rendered), extract_usernames() reads every /u/ link in one
+page.evaluate call. For long scroll sessions LinkHarvester goes further:
+an injected MutationObserver buffers only the agent links added since the
+last drain, so each tick costs in proportion to the new content rather
+than the whole list.
+"""
+
+from page_readiness import AGENT_LINKS, is_data_response
+
+AGENT_STATS = ('karma', 'posts_count', 'follower_count', 'followers', 'is_verified', 'verified')
+
+# One round trip for all links, with the same href -> username rule the
+# scrapers always used
+EXTRACT_USERNAMES_JS = """(selector) => {
+    const names = new Set();
+    for (const link of document.querySelectorAll(selector)) {
+        const href = link.getAttribute('href');
+        if (href && href !== '/u') {
+            const name = href.replace('/u/', '');
+            if (name) names.add(name);
+        }
+    }
+    return Array.from(names);
+}"""
+
+# Installed once per document; seeds the buffer with the links already
+# rendered, then only queues usernames it has not seen before
+HARVEST_INSTALL_JS = """(selector) => {
+    if (window.__agentHarvest) return false;
+    const harvest = {seen: new Set(), pending: []};
+    const take = (link) => {
+        const href = link.getAttribute('href');
+        if (!href || href === '/u') return;
+        const name = href.replace('/u/', '');
+        if (name && !harvest.seen.has(name)) {
+            harvest.seen.add(name);
+            harvest.pending.push(name);
+        }
+    };
+    const scan = (node) => {
+        if (node.nodeType !== Node.ELEMENT_NODE) return;
+        if (node.matches(selector)) take(node);
+        node.querySelectorAll(selector).forEach(take);
+    };
+    document.querySelectorAll(selector).forEach(take);
+    harvest.observer = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            if (mutation.type === 'attributes') scan(mutation.target);
+            else mutation.addedNodes.forEach(scan);
+        }
+    });
+    harvest.observer.observe(document.body, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['href']
+    });
+    window.__agentHarvest = harvest;
+    return true;
+}"""
+
+HARVEST_DRAIN_JS = """() => {
+    const harvest = window.__agentHarvest;
+    if (!harvest) return null;
+    const names = harvest.pending;
+    harvest.pending = [];
+    return names;
+}"""
+
+HARVEST_PENDING_JS = "() => !!window.__agentHarvest && window.__agentHarvest.pending.length > 0"
+
+
+def _agent_username(item):
+    if not isinstance(item, dict):
+        return None
+    name = item.get('username')
+    if name is None and any(key in item for key in AGENT_STATS):
+        name = item.get('name')
+    return name if isinstance(name, str) and name else None
+
+
+def find_agent_records(payload):
+    """Yield flat agent dicts (scalar fields only) from any JSON payload"""
+    if isinstance(payload, list):
+        if payload and all(_agent_username(item) for item in payload):
+            for item in payload:
+                record = {key: value for key, value in item.items()
+                          if not isinstance(value, (dict, list))}
+                record['username'] = _agent_username(item)
+                yield record
+            return
+        for item in payload:
+            yield from find_agent_records(item)
+    elif isinstance(payload, dict):
+        for value in payload.values():
+            if isinstance(value, (dict, list)):
+                yield from find_agent_records(value)
+
+
+def extract_usernames(page, selector=AGENT_LINKS):
+    """All agent usernames linked from the page, in a single evaluate call"""
+    return page.evaluate(EXTRACT_USERNAMES_JS, selector)
+
+
+class LinkHarvester:
+    """
+    Incremental agent-link harvest for a sync Playwright page.
+
+    drain() returns only usernames first seen since the previous drain;
+    wait_for_new() is the "new nodes" event that scroll loops stop on.
+    A full navigation drops the observer, so drain() reinstalls it.
+    """
+
+    def __init__(self, page, selector=AGENT_LINKS):
+        self.page = page
+        self.selector = selector
+        self.install()
+
+    def install(self):
+        self.page.evaluate(HARVEST_INSTALL_JS, self.selector)
+
+    def drain(self):
+        names = self.page.evaluate(HARVEST_DRAIN_JS)
+        if names is None:
+            self.install()
+            names = self.page.evaluate(HARVEST_DRAIN_JS)
+        return names
+
+    def wait_for_new(self, waiter, label='new-nodes', timeout=None):
+        """True once new agent links are buffered, False if none arrive in time"""
+        return waiter.until(self.page, HARVEST_PENDING_JS, label=label, timeout=timeout)
+
+
+class AgentCapture:
+    """
+    Collects agent records from a sync Playwright page's data responses.
+
+    Attach it before navigating so the directory's first request is seen.
+    """
+
+    def __init__(self, page, match=None):
+        self.match = match
+        self.records = {}       # username -> merged record
+        self.fresh = []         # usernames first seen since the last drain()
+        self.responses = 0      # data responses that contained agents
+        self.errors = 0
+        page.on('response', self._on_response)
+
+    def _on_response(self, response):
+        if not is_data_response(response, self.match):
+            return
+        if 'json' not in response.headers.get('content-type', ''):
+            return
+        try:
+            payload = response.json()
+        except Exception:
+            self.errors += 1
+            return
+
+        found = False
+        for record in find_agent_records(payload):
+            username = record['username']
+            if username not in self.records:
+                self.fresh.append(username)
+            self.records[username] = {**self.records.get(username, {}), **record}
+            found = True
+        if found:
+            self.responses += 1
+
+    @property
+    def active(self):
+        """True once at least one response with agents was captured"""
+        return self.responses > 0
+
+    def usernames(self):
+        return self.records.keys()
+
+    def drain(self):
+        """Usernames captured since the previous drain()"""
+        fresh, self.fresh = self.fresh, []
+        return fresh
+
+    def harvest(self, page, agents):
+        """
+        Add this tick's agents to the `agents` set.
+
+        Captured records are used while the directory serves JSON; until
+        then the links are read with one batched evaluate.
+        """
+        if self.active:
+            agents.update(self.records)
+        else:
+            agents.update(extract_usernames(page))
+
+    def sorted_records(self):
+        return [self.records[name] for name in sorted(self.records)]
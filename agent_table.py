@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Columnar Agent Table
+Agents as typed columns instead of one dict per agent
+
+An agent dict costs about 200 bytes before its strings (the dict, its
+hash table and an int object per count), and the builders used to keep
+several lists of them. AgentTable stores one column per field instead:
+
+    id                  StringPool of interned ids; id k is row k, so the
+                        pool's index doubles as index_of()
+    username            list of the API's username strings
+    posts_count, karma,
+    comments_made       array('q')
+    verified            array('b')
+
+which is about 105 bytes per agent at 1M agents, most of it the id index.
+
+Selections are AgentView objects - a table plus an array of row indexes
+(or no array at all for every row) - so where(), sort() and top() never
+copy agent data, and chained views share the table. With NumPy installed
+the filters and sorts run as array operations over zero-copy views of the
+columns (AgentTable.numpy); without it they fall back to plain Python.
+Rows read as AgentRow, which supports agent['field'] and agent.get() like
+the dicts it replaces. to_nodes() builds the node dicts of the export
+once, at the end.
+
+    table = AgentTable.from_agents(agents)
+    active = table.view().where('posts_count', '>', 0)
+    hubs = active.top('posts_count', 10)
+"""
+
+import operator
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+STRING_FIELDS = ('id', 'username')
+NUMERIC_FIELDS = {'posts_count': 'q', 'karma': 'q', 'comments_made': 'q', 'verified': 'b'}
+FIELDS = STRING_FIELDS + tuple(NUMERIC_FIELDS)
+BOOLEAN_FIELDS = ('verified',)
+OPERATORS = {
+    '>': operator.gt, '>=': operator.ge, '<': operator.lt,
+    '<=': operator.le, '==': operator.eq, '!=': operator.ne,
+}
+
+
+class StringPool:
+    """Interned strings addressed by index"""
+
+    __slots__ = ('_index', '_strings')
+
+    def __init__(self, strings=()):
+        self._strings = list(strings)
+        self._index = dict(zip(self._strings, range(len(self._strings))))
+
+    def __len__(self):
+        return len(self._strings)
+
+    def __getitem__(self, i):
+        return self._strings[i]
+
+    def __iter__(self):
+        return iter(self._strings)
+
+    def intern(self, value):
+        value = str(value)
+        i = self._index.get(value)
+        if i is None:
+            i = self._index[value] = len(self._strings)
+            self._strings.append(value)
+        return i
+
+    def lookup(self, value):
+        """Index of an already interned string, or None"""
+        return self._index.get(value)
+
+
+class AgentRow:
+    """One row of an AgentTable, read like an agent dict"""
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, field):
+        if field not in FIELDS:
+            raise KeyError(field)
+        return self.table.get(self.index, field)
+
+    def get(self, field, default=None):
+        if field not in FIELDS:
+            return default
+        return self.table.get(self.index, field)
+
+    def to_dict(self, fields=FIELDS):
+        return {field: self.table.get(self.index, field) for field in fields}
+
+    def __repr__(self):
+        return f"AgentRow({self.to_dict()!r})"
+
+
+class AgentTable:
+    """All agents as typed columns, one row per distinct agent id"""
+
+    __slots__ = ('ids', 'usernames', 'columns')
+
+    def __init__(self):
+        self.ids = StringPool()     # interned ids; id k belongs to row k
+        self.usernames = []
+        self.columns = {field: array(code) for field, code in NUMERIC_FIELDS.items()}
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_agents(cls, agents):
+        """
+        Table of API agent dicts in first-seen order.
+
+        An id seen again updates its row, the same as keying a dict by id.
+        """
+        agents = agents if isinstance(agents, list) else list(agents)
+        table = cls()
+        ids = [agent['id'] for agent in agents]
+        if len(set(ids)) != len(ids):
+            for agent in agents:
+                table.add(agent)
+            return table
+
+        # Distinct ids: fill whole columns at once
+        table.ids = StringPool(ids)
+        table.usernames = [agent.get('username', agent['id']) for agent in agents]
+        for field, code in NUMERIC_FIELDS.items():
+            table.columns[field] = array(code, [int(agent.get(field) or 0) for agent in agents])
+        return table
+
+    def add(self, agent):
+        """Insert an agent dict (or update the row with its id); returns the row"""
+        row = self.ids.lookup(agent['id'])
+        values = [int(agent.get(field) or 0) for field in NUMERIC_FIELDS]
+        username = agent.get('username', agent['id'])
+        if row is None:
+            row = self.ids.intern(agent['id'])
+            self.usernames.append(username)
+            for field, value in zip(NUMERIC_FIELDS, values):
+                self.columns[field].append(value)
+        else:
+            self.usernames[row] = username
+            for field, value in zip(NUMERIC_FIELDS, values):
+                self.columns[field][row] = value
+        return row
+
+    def index_of(self, agent_id):
+        """Row of an agent id, or None"""
+        return self.ids.lookup(agent_id)
+
+    def get(self, row, field):
+        if field == 'id':
+            return self.ids[row]
+        if field == 'username':
+            return self.usernames[row]
+        value = self.columns[field][row]
+        return bool(value) if field in BOOLEAN_FIELDS else value
+
+    def set(self, row, field, value):
+        if field in STRING_FIELDS:
+            raise ValueError(f"{field} is not writable")
+        self.columns[field][row] = int(value)
+
+    def row(self, index):
+        return AgentRow(self, index)
+
+    def column(self, field):
+        """Zero-copy memoryview of a numeric column"""
+        return memoryview(self.columns[field])
+
+    def numpy(self, field):
+        """Zero-copy NumPy view of a numeric column; needs NumPy"""
+        if np is None:
+            raise ImportError("AgentTable.numpy needs NumPy: pip3 install numpy")
+        return np.frombuffer(self.columns[field], dtype=self.columns[field].typecode)
+
+    def view(self, rows=None):
+        """AgentView of the given rows, or of every row"""
+        return AgentView(self, rows)
+
+    def to_nodes(self, fields=FIELDS, rows=None):
+        """Node dicts for the export, in row order"""
+        return self.view(rows).to_nodes(fields)
+
+
+class AgentView:
+    """A selection of AgentTable rows; never copies agent data"""
+
+    __slots__ = ('table', 'rows')
+
+    def __init__(self, table, rows=None):
+        self.table = table
+        self.rows = rows            # None = every row, in order
+
+    def __len__(self):
+        return len(self.table) if self.rows is None else len(self.rows)
+
+    def __getitem__(self, k):
+        return AgentRow(self.table, self.row_index(k))
+
+    def __iter__(self):
+        table = self.table
+        return (AgentRow(table, i) for i in self.row_indexes())
+
+    def row_index(self, k):
+        """Table row of the k-th agent in the view"""
+        if self.rows is None:
+            if not -len(self) <= k < len(self):
+                raise IndexError(k)
+            return k % len(self)
+        return int(self.rows[k])
+
+    def row_indexes(self):
+        return range(len(self.table)) if self.rows is None else (int(i) for i in self.rows)
+
+    def values(self, field):
+        """Values of one field for the agents in the view, as a list"""
+        if field in STRING_FIELDS:
+            strings = self.table.ids if field == 'id' else self.table.usernames
+            if self.rows is None:
+                return list(strings)
+            return [strings[i] for i in self.row_indexes()]
+        column = self.table.columns[field]
+        if self.rows is None:
+            raw = column.tolist()
+        elif np is not None:
+            raw = self.table.numpy(field)[self.rows].tolist()
+        else:
+            raw = [column[i] for i in self.rows]
+        return [bool(v) for v in raw] if field in BOOLEAN_FIELDS else raw
+
+    def _positions(self):
+        """Row indexes as a NumPy array (NumPy only)"""
+        return np.arange(len(self.table)) if self.rows is None else np.asarray(self.rows)
+
+    def where(self, field, op, value):
+        """View of the agents whose field compares true against value (op: > >= < <= == !=)"""
+        compare = OPERATORS[op]
+        if field in STRING_FIELDS:
+            return AgentView(self.table, array('q', (i for i in self.row_indexes()
+                                                      if compare(self.table.get(i, field), value))))
+        if np is not None:
+            positions = self._positions()
+            mask = compare(self.table.numpy(field)[positions], value)
+            return AgentView(self.table, positions[mask])
+        column = self.table.columns[field]
+        return AgentView(self.table, array('q', (i for i in self.row_indexes() if compare(column[i], value))))
+
+    def sort(self, field, reverse=False):
+        """View sorted by one field; ties keep view order"""
+        if field in STRING_FIELDS:
+            get = self.table.get
+            rows = sorted(self.row_indexes(), key=lambda i: get(i, field), reverse=reverse)
+            return AgentView(self.table, array('q', rows))
+        if np is not None:
+            positions = self._positions()
+            values = self.table.numpy(field)[positions].astype(np.int64)
+            order = np.argsort(-values if reverse else values, kind='stable')
+            return AgentView(self.table, positions[order])
+        column = self.table.columns[field]
+        rows = sorted(self.row_indexes(), key=lambda i: column[i], reverse=reverse)
+        return AgentView(self.table, array('q', rows))
+
+    def top(self, field, k):
+        """The k agents with the largest field, ties in view order (like heapq.nlargest)"""
+        if np is not None and len(self) > k:
+            positions = self._positions()
+            values = self.table.numpy(field)[positions].astype(np.int64)
+            # Everything at or above the k-th largest value, then a stable sort of that
+            cutoff = np.partition(values, len(values) - k)[len(values) - k] if k else None
+            if cutoff is None:
+                return AgentView(self.table, positions[:0])
+            candidates = np.flatnonzero(values >= cutoff)
+            order = np.argsort(-values[candidates], kind='stable')[:k]
+            return AgentView(self.table, positions[candidates[order]])
+        return AgentView(self.table, self.sort(field, reverse=True)._slice(k))
+
+    def _slice(self, k):
+        if self.rows is None:
+            return array('q', range(min(k, len(self.table))))
+        return self.rows[:k]
+
+    def to_nodes(self, fields=FIELDS):
+        """Node dicts of the agents in the view"""
+        columns = [self.values(field) for field in fields]
+        return [dict(zip(fields, values)) for values in zip(*columns)]
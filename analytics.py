@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Graph Analytics
+Degree, PageRank, components, k-cores and betweenness over CSR arrays
+
+Every measure is a sequence of whole-array operations over the symmetric
+CSR adjacency from csr_graph.py, so a 1M-node / 10M-edge graph takes
+seconds (degree, components, PageRank) to a minute or two (k-core,
+sampled betweenness) rather than hours:
+
+    degree, weighted_degree   neighbour count and summed edge weight
+    pagerank                  weighted power iteration, dangling mass spread
+                              evenly; warm-started from the graph's existing
+                              `pagerank` values in incremental mode, which
+                              after a delta update converges in a few steps
+    component                 connected components by array union-find
+                              (hook larger roots onto smaller ones, then
+                              compress paths), numbered by size
+    core                      k-core number, peeling every node of degree
+                              <= k at once until none is left
+    betweenness               Brandes from `samples` random sources with
+                              frontier-at-a-time BFS, scaled up to all
+                              sources and normalized to 0..1
+
+Each measure becomes a node attribute; metadata['analytics'] holds the
+summary (degree distribution, PageRank leaders, component and core sizes,
+betweenness leaders).
+
+    python3 analytics.py network-data.json
+    python3 analytics.py network-data.json --incremental --measures pagerank
+"""
+
+import argparse
+import time
+
+from communities import relabel_by_size
+from csr_graph import CsrGraph, np, require_numpy
+from graph_json import load_graph, save_graph
+
+MEASURES = ('degree', 'pagerank', 'components', 'kcore', 'betweenness')
+DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-8   # L1 change per iteration
+PAGERANK_MAX_ITER = 100
+BETWEENNESS_SAMPLES = 32
+SUMMARY_TOP = 10
+
+
+def _entries_of(indptr, rows):
+    """CSR entry indexes of all the given rows, row after row"""
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    offsets = np.repeat(starts - np.r_[0, np.cumsum(counts)[:-1]], counts)
+    return offsets + np.arange(counts.sum())
+
+
+def pagerank(csr, damping=DAMPING, start=None, tolerance=PAGERANK_TOLERANCE, max_iter=PAGERANK_MAX_ITER):
+    """
+    Weighted PageRank vector (sums to 1) and the iterations it took.
+
+    `start` is an initial vector, e.g. the previous run's ranks with new
+    nodes filled in; it is renormalized before use.
+    """
+    require_numpy()
+    n = csr.n_nodes
+    if n == 0:
+        return np.zeros(0), 0
+
+    strength = csr.strength()
+    dangling = strength == 0
+    inverse = np.divide(1.0, strength, out=np.zeros(n), where=~dangling)
+    rows = csr.rows()
+
+    if start is None:
+        rank = np.full(n, 1.0 / n)
+    else:
+        rank = np.asarray(start, dtype=np.float64).clip(min=0)
+        total = rank.sum()
+        rank = rank / total if total > 0 else np.full(n, 1.0 / n)
+
+    for iteration in range(1, max_iter + 1):
+        share = rank * inverse
+        spread = np.bincount(rows, weights=csr.weights * share[csr.indices], minlength=n)
+        teleport = (1 - damping + damping * rank[dangling].sum()) / n
+        updated = damping * spread + teleport
+        change = np.abs(updated - rank).sum()
+        rank = updated
+        if change < tolerance:
+            break
+    return rank, iteration
+
+
+def connected_components(csr):
+    """Component number per node (0 = largest) via array union-find"""
+    require_numpy()
+    n = csr.n_nodes
+    parent = np.arange(n)
+    rows = csr.rows()
+    upper = rows < csr.indices
+    a, b = rows[upper].astype(np.int64), csr.indices[upper].astype(np.int64)
+
+    while len(a):
+        # Hook the larger root of every edge onto the smaller one
+        ra, rb = parent[a], parent[b]
+        lo, hi = np.minimum(ra, rb), np.maximum(ra, rb)
+        split = lo != hi
+        a, b, lo, hi = a[split], b[split], lo[split], hi[split]
+        if not len(a):
+            break
+        np.minimum.at(parent, hi, lo)
+        # Compress until every node points at its root
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+    return relabel_by_size(parent) if n else parent
+
+
+def core_numbers(csr):
+    """k-core number of every node (unweighted degree, merged parallel edges)"""
+    require_numpy()
+    n = csr.n_nodes
+    degree = csr.degree().astype(np.int64)
+    core = np.zeros(n, dtype=np.int64)
+    alive = np.ones(n, dtype=bool)
+    remaining = n
+    k = 0
+
+    while remaining:
+        k = max(k, int(degree[alive].min()))
+        peel = np.flatnonzero(alive & (degree <= k))
+        while len(peel):
+            core[peel] = k
+            alive[peel] = False
+            remaining -= len(peel)
+            neighbours = csr.indices[_entries_of(csr.indptr, peel)]
+            degree -= np.bincount(neighbours, minlength=n)
+            # Only neighbours of peeled nodes can have dropped to k
+            touched = np.unique(neighbours)
+            peel = touched[alive[touched] & (degree[touched] <= k)]
+    return core
+
+
+def _brandes_from(csr, source, sigma, dist, delta):
+    """Dependency of every node on shortest paths from one source (unweighted BFS)"""
+    sigma[:] = 0
+    dist[:] = -1
+    delta[:] = 0
+    sigma[source] = 1
+    dist[source] = 0
+    frontier = np.array([source])
+    levels = []
+    depth = 0
+
+    while len(frontier):
+        entries = _entries_of(csr.indptr, frontier)
+        counts = csr.indptr[frontier + 1] - csr.indptr[frontier]
+        tail = np.repeat(frontier, counts)
+        head = csr.indices[entries].astype(np.int64)
+
+        fresh = dist[head] == -1
+        dist[head[fresh]] = depth + 1
+        tree = dist[head] == depth + 1
+        tail, head = tail[tree], head[tree]
+        np.add.at(sigma, head, sigma[tail])
+        levels.append((tail, head))
+        frontier = np.unique(head)
+        depth += 1
+
+    for tail, head in reversed(levels):
+        np.add.at(delta, tail, sigma[tail] / sigma[head] * (1 + delta[head]))
+    delta[source] = 0
+    return delta
+
+
+def sampled_betweenness(csr, samples=BETWEENNESS_SAMPLES, seed=0):
+    """
+    Betweenness centrality estimated from `samples` random BFS sources,
+    normalized to 0..1 like the exact undirected measure.
+    """
+    require_numpy()
+    n = csr.n_nodes
+    if n < 3:
+        return np.zeros(n)
+    sources = np.random.default_rng(seed).choice(n, size=min(samples, n), replace=False)
+    sigma, dist, delta = np.zeros(n), np.zeros(n, dtype=np.int64), np.zeros(n)
+
+    total = np.zeros(n)
+    for source in sources.tolist():
+        total += _brandes_from(csr, source, sigma, dist, delta)
+    # Scale the sample to all n sources; each path counted from both ends
+    scale = n / len(sources) / 2
+    return total * scale / ((n - 1) * (n - 2) / 2)
+
+
+def degree_distribution(degree):
+    """Node counts per power-of-two degree bin: [{'min', 'max', 'count'}]"""
+    bins = []
+    zero = int((degree == 0).sum())
+    if zero:
+        bins.append({'min': 0, 'max': 0, 'count': zero})
+    positive = degree[degree > 0]
+    if len(positive):
+        exponent = np.floor(np.log2(positive)).astype(np.int64)
+        for e, count in enumerate(np.bincount(exponent).tolist()):
+            if count:
+                bins.append({'min': 2 ** e, 'max': 2 ** (e + 1) - 1, 'count': count})
+    return bins
+
+
+def _leaders(values, names, top=SUMMARY_TOP, digits=6):
+    order = np.argsort(-values, kind='stable')[:top]
+    return [{'agent': names[i], 'value': round(float(values[i]), digits)} for i in order.tolist()]
+
+
+def degree_stats(graph):
+    """
+    Average/max connections per agent and the degree distribution of a graph dict
+
+    Works without NumPy (by counting distinct neighbors in plain Python),
+    so the scripts that only print these stats keep to the standard library.
+    """
+    if np is None:
+        return _degree_stats_python(graph)
+    csr = CsrGraph.from_graph(graph)
+    degree = csr.degree()
+    names = _names(graph, csr)
+    connected = degree > 0
+    stats = {
+        'average': round(float(degree[connected].mean()), 2) if connected.any() else 0.0,
+        'max': int(degree.max()) if len(degree) else 0,
+        'max_agent': names[int(degree.argmax())] if len(degree) else None,
+        'distribution': degree_distribution(degree),
+    }
+    return stats
+
+
+def _degree_stats_python(graph):
+    """degree_stats without NumPy, with the same node order and tie-breaking"""
+    degree = {}
+    names = {}
+    for node in graph['nodes']:
+        if node['id'] not in degree:
+            degree[node['id']] = 0
+            names[node['id']] = node.get('username', node['id'])
+    pairs = {(min(e['source'], e['target']), max(e['source'], e['target']))
+             for e in graph['edges'] if e['source'] != e['target']}
+    for pair in pairs:
+        for end in pair:
+            degree[end] = degree.get(end, 0) + 1
+
+    counts = list(degree.values())
+    connected = [d for d in counts if d > 0]
+    max_id = max(degree, key=degree.get) if degree else None
+    bins = {}
+    for d in connected:
+        bins[d.bit_length() - 1] = bins.get(d.bit_length() - 1, 0) + 1
+    distribution = [{'min': 0, 'max': 0, 'count': len(counts) - len(connected)}] if len(counts) > len(connected) else []
+    distribution += [{'min': 2 ** e, 'max': 2 ** (e + 1) - 1, 'count': bins[e]} for e in sorted(bins)]
+    return {
+        'average': round(sum(connected) / len(connected), 2) if connected else 0.0,
+        'max': degree[max_id] if degree else 0,
+        'max_agent': names.get(max_id, max_id),
+        'distribution': distribution,
+    }
+
+
+def _names(graph, csr):
+    names = [node.get('username', node['id']) for node in graph['nodes']]
+    return names + csr.node_ids[len(names):]
+
+
+def analyze(graph, measures=MEASURES, incremental=False, samples=BETWEENNESS_SAMPLES, seed=0, verbose=False):
+    """
+    Compute graph measures on a network graph dict in place.
+
+    Sets the per-node attributes of the chosen measures and
+    graph['metadata']['analytics'] to the summary; returns the summary.
+    With incremental=True PageRank starts from the nodes' current
+    `pagerank` values (new nodes start at the mean).
+    """
+    unknown = set(measures) - set(MEASURES)
+    if unknown:
+        raise ValueError(f"Unknown measures: {sorted(unknown)} (expected some of {MEASURES})")
+    require_numpy()
+    start = time.perf_counter()
+
+    csr = CsrGraph.from_graph(graph)
+    nodes = graph['nodes']
+    listed = len(nodes)
+    names = _names(graph, csr)
+    summary = {'nodes': csr.n_nodes, 'edges': csr.n_edges}
+    attributes = {}
+
+    def timed(label, func, *args, **kwargs):
+        began = time.perf_counter()
+        result = func(*args, **kwargs)
+        if verbose:
+            print(f"  {label}: {time.perf_counter() - began:.1f}s")
+        return result
+
+    if 'degree' in measures:
+        degree = csr.degree()
+        strength = csr.strength()
+        connected = degree > 0
+        summary['degree'] = {
+            'average': round(float(degree[connected].mean()), 2) if connected.any() else 0.0,
+            'max': int(degree.max()) if len(degree) else 0,
+            'max_agent': names[int(degree.argmax())] if len(degree) else None,
+            'distribution': degree_distribution(degree),
+            'top_weighted': _leaders(strength, names, digits=2),
+        }
+        attributes['degree'] = degree.tolist()
+        attributes['weighted_degree'] = np.round(strength, 2).tolist()
+
+    if 'pagerank' in measures:
+        previous = None
+        if incremental:
+            known = np.array([node.get('pagerank', np.nan) for node in nodes] +
+                             [np.nan] * (csr.n_nodes - listed), dtype=np.float64)
+            if np.isfinite(known).any():
+                previous = np.where(np.isfinite(known), known, np.nanmean(known))
+        rank, iterations = timed('pagerank', pagerank, csr, start=previous)
+        summary['pagerank'] = {
+            'damping': DAMPING,
+            'iterations': iterations,
+            'warm_start': previous is not None,
+            'top': _leaders(rank, names),
+        }
+        attributes['pagerank'] = rank.tolist()
+
+    if 'components' in measures:
+        component = timed('components', connected_components, csr)
+        sizes = np.bincount(component) if len(component) else component
+        summary['components'] = {
+            'count': len(sizes),
+            'largest': int(sizes[0]) if len(sizes) else 0,
+            'isolated': int((csr.degree() == 0).sum()),
+            'sizes': sizes[:SUMMARY_TOP].tolist(),
+        }
+        attributes['component'] = component.tolist()
+
+    if 'kcore' in measures:
+        core = timed('k-core', core_numbers, csr)
+        top = int(core.max()) if len(core) else 0
+        summary['kcore'] = {
+            'max_core': top,
+            'max_core_size': int((core == top).sum()) if len(core) else 0,
+            'distribution': np.bincount(core).tolist() if len(core) else [],
+        }
+        attributes['core'] = core.tolist()
+
+    if 'betweenness' in measures:
+        betweenness = timed('betweenness', sampled_betweenness, csr, samples=samples, seed=seed)
+        summary['betweenness'] = {
+            'samples': min(samples, csr.n_nodes),
+            'seed': seed,
+            'top': _leaders(betweenness, names),
+        }
+        attributes['betweenness'] = betweenness.tolist()
+
+    for name, values in attributes.items():
+        for node, value in zip(nodes, values):
+            node[name] = value
+
+    summary['seconds'] = round(time.perf_counter() - start, 2)
+    graph.setdefault('metadata', {})['analytics'] = summary
+    return summary
+
+
+def print_degree_stats(stats, indent="  "):
+    print(f"{indent}- Average connections/agent: {stats['average']:.1f}")
+    print(f"{indent}- Most connected agent: {stats['max_agent']} ({stats['max']} connections)")
+
+
+def print_analytics(summary):
+    print(f"✓ Analytics on {summary['nodes']:,} nodes / {summary['edges']:,} edges in {summary['seconds']:.1f}s")
+    if 'degree' in summary:
+        print_degree_stats(summary['degree'])
+    if 'pagerank' in summary:
+        pr = summary['pagerank']
+        start = "warm start" if pr['warm_start'] else "cold start"
+        leaders = ', '.join(leader['agent'] for leader in pr['top'][:3])
+        print(f"  - PageRank: {pr['iterations']} iterations ({start}), top: {leaders}")
+    if 'components' in summary:
+        comp = summary['components']
+        print(f"  - {comp['count']:,} components, largest {comp['largest']:,} agents, {comp['isolated']:,} isolated")
+    if 'kcore' in summary:
+        kc = summary['kcore']
+        print(f"  - Max k-core: {kc['max_core']} ({kc['max_core_size']:,} agents)")
+    if 'betweenness' in summary:
+        leaders = ', '.join(leader['agent'] for leader in summary['betweenness']['top'][:3])
+        print(f"  - Betweenness ({summary['betweenness']['samples']} samples), top: {leaders}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Add degree, PageRank, component, core and betweenness to network-data.json")
+    parser.add_argument('input', nargs='?', default='network-data.json')
+    parser.add_argument('--output', help="write here instead of updating the input in place")
+    parser.add_argument('--measures', default=','.join(MEASURES),
+                        help=f"comma-separated subset of {','.join(MEASURES)}")
+    parser.add_argument('--incremental', action='store_true',
+                        help="warm-start PageRank from the pagerank values already in the graph")
+    parser.add_argument('--samples', type=int, default=BETWEENNESS_SAMPLES,
+                        help="BFS sources for the betweenness estimate")
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("📐 Moltbook Network Map - Graph Analytics")
+    print("=" * 50)
+
+    graph = load_graph(args.input)
+    print(f"📊 {len(graph['nodes']):,} nodes, {len(graph['edges']):,} edges")
+
+    measures = [m.strip() for m in args.measures.split(',') if m.strip()]
+    summary = analyze(graph, measures=measures, incremental=args.incremental,
+                      samples=args.samples, seed=args.seed, verbose=True)
+    print_analytics(summary)
+
+    output_file = args.output or args.input
+    save_graph(graph, output_file)
+    print(f"✓ Saved to {output_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Builder Benchmarks
+Times every graph builder on synthetic datasets and records peak memory
+
+Each (builder, size) run happens in a fresh subprocess so peak RSS is not
+polluted by earlier runs, and so a builder that blows up on a large size
+can be stopped by --timeout without taking the harness down. Once a
+builder times out or fails, its larger sizes are skipped.
+
+    python3 benchmark.py --sizes 1k 10k --output benchmark-results.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+
+from synthetic_data import SIZES, generate_dataset, parse_size
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TIMEOUT = 600
+
+
+def load_script(filename):
+    """Import one of the hyphenated top-level scripts as a module"""
+    name = filename.replace('-', '_').removesuffix('.py')
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Each builder is a setup function: it imports what the builder needs and
+# returns run(data), so only run() falls inside the timed region.
+
+def _network_graph(engine):
+    def setup():
+        collect_data = load_script('collect-data.py')
+        if engine == 'sparse':
+            import sparse_projection  # noqa: F401 - imported lazily by the builder
+        return lambda data: collect_data.build_network_graph(data['agents'], data['posts'], engine=engine)['edges']
+    return setup
+
+
+def _activity_connections(max_per_agent=None):
+    def setup():
+        collect_real_data = load_script('collect-real-data.py')
+        return lambda data: collect_real_data.build_activity_connections(
+            data['agents'], max_per_agent=max_per_agent)['edges']
+    return setup
+
+
+def _enhance_connections():
+    enhance_network = load_script('enhance-network.py')
+
+    def run(data):
+        random.seed(0)
+        return enhance_network.create_connections(data['agents'])
+    return run
+
+
+def _alphabetical_window():
+    build_real_network = load_script('build-real-network.py')
+
+    def run(data):
+        usernames = sorted(agent['username'] for agent in data['agents'])
+        return build_real_network.build_alphabetical_network(usernames)[1]
+    return run
+
+
+BUILDERS = {
+    'network_graph_python': _network_graph('python'),
+    'network_graph_sparse': _network_graph('sparse'),
+    'activity_connections': _activity_connections(),
+    'activity_connections_top10': _activity_connections(max_per_agent=10),
+    'enhance_connections': _enhance_connections,
+    'alphabetical_window': _alphabetical_window,
+}
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_worker(builder, size, seed):
+    """Generate the dataset, run one builder and return its measurements"""
+    data = generate_dataset(parse_size(size), seed=seed)
+
+    # Silence the builders' progress output so it doesn't swamp the report
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        run = BUILDERS[builder]()
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        edges = run(data)
+        seconds = time.perf_counter() - start
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    return {
+        'agents': len(data['agents']),
+        'posts': len(data['posts']),
+        'edges': len(edges),
+        'seconds': round(seconds, 4),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'builder_rss_mb': round(peak_rss_mb() - rss_before, 1),
+    }
+
+
+def run_one(builder, size, seed, timeout):
+    """Run one benchmark in a subprocess; always returns a result record"""
+    record = {'builder': builder, 'size': size}
+    command = [sys.executable, os.path.abspath(__file__), '--worker', builder, size, '--seed', str(seed)]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout, cwd=HERE)
+    except subprocess.TimeoutExpired:
+        record.update({'status': 'timeout', 'seconds': timeout})
+        return record
+
+    if completed.returncode != 0:
+        error = (completed.stderr.strip().splitlines() or ['exit code %d' % completed.returncode])[-1]
+        record.update({'status': 'error', 'error': error})
+        return record
+
+    record.update(json.loads(completed.stdout.strip().splitlines()[-1]))
+    record['status'] = 'ok'
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the graph builders on synthetic data")
+    parser.add_argument('--sizes', nargs='+', default=list(SIZES),
+                        help="dataset sizes (1k, 10k, 100k, 1m or integers)")
+    parser.add_argument('--builders', nargs='+', default=list(BUILDERS), choices=list(BUILDERS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT,
+                        help="seconds before a single run is abandoned")
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--worker', nargs=2, metavar=('BUILDER', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        builder, size = args.worker
+        print(json.dumps(run_worker(builder, size, args.seed)))
+        return
+
+    print("⏱️  Moltbook Network Map - Builder Benchmarks")
+    print("=" * 50)
+
+    sizes = sorted(args.sizes, key=parse_size)
+    results = []
+    for builder in args.builders:
+        for size in sizes:
+            record = run_one(builder, size, args.seed, args.timeout)
+            results.append(record)
+
+            if record['status'] == 'ok':
+                print(f"  {builder:28s} {size:>5s}: {record['seconds']:9.3f}s "
+                      f"{record['peak_rss_mb']:8.1f} MB peak  {record['edges']:,} edges")
+            else:
+                print(f"  {builder:28s} {size:>5s}: {record['status']} - skipping larger sizes")
+                break
+
+    report = {
+        'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'timeout': args.timeout,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n✓ Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
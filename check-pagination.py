@@ -3,15 +3,16 @@
 Check if Moltbook has pagination
 """
 
-from playwright.sync_api import sync_playwright
-import time
+from page_readiness import AGENT_LINKS, PageWaiter
+from scraper_runtime import SCREENSHOT_BLOCKED, ScraperRuntime
 
-with sync_playwright() as p:
-    browser = p.chromium.launch(headless=True)
-    page = browser.new_page()
+waiter = PageWaiter()
+
+with ScraperRuntime(block=SCREENSHOT_BLOCKED) as runtime:
+    page = runtime.new_page()
     
     page.goto("https://www.moltbook.com/u", timeout=20000)
-    time.sleep(8)
+    waiter.content(page, AGENT_LINKS, label='directory')
     
     # Take screenshot
     page.screenshot(path="pagination-check.png", full_page=True)
@@ -45,4 +46,4 @@ with sync_playwright() as p:
     if 'page' in html.lower():
         print("'Page' found in HTML")
     
-    browser.close()
+    waiter.report()
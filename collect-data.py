@@ -4,15 +4,30 @@ Moltbook Network Map - Data Collector
 Fetches agents, posts, and interactions from the Moltbook API
 """
 
-import requests
+import argparse
 import json
+import os
 import sys
 from collections import defaultdict
 
-API_BASE = "https://moltbook-api.simeon-garratt.workers.dev/v1"
+from agent_table import AgentTable
+from collector import configure_api_base, fetch_all_agents, fetch_new_agents, get_api_base, refresh_agents
+from crawl_checkpoint import CrawlCheckpoint
+from edge_accumulator import EdgeAccumulator
+from graph_binary import binary_path_for, write_graph_binary
+from graph_json import load_graph, save_graph
+from http_client import configure_client, get_client
+from incremental import SYNC_FILE, apply_delta, load_sync_state, new_sync_state, save_sync_state, take_new_posts
+from post_store import PostStore
+from response_cache import add_cache_arguments, cache_from_args
+
+DEFAULT_CHECKPOINT_DIR = 'crawl-checkpoint'
+EDGE_ENGINES = ('python', 'sparse')
 
 def get_api_key():
-    """Read API key from credentials file"""
+    """Read API key from $MOLTBOOK_API_KEY or the credentials file"""
+    if os.environ.get('MOLTBOOK_API_KEY'):
+        return os.environ['MOLTBOOK_API_KEY']
     try:
         with open('/Users/simeong/.config/moltbook/credentials.json') as f:
             return json.load(f)['api_key']
@@ -20,118 +35,121 @@ def get_api_key():
         print(f"Error reading API key: {e}")
         sys.exit(1)
 
-def fetch_all_posts(api_key, limit=20):
-    """Fetch all posts from the main feed"""
+def iter_feed_pages(api_key, limit=20, max_pages=None, cursor=None):
+    """
+    Yield (posts, next_cursor) pages from the main feed, following the cursor
+    
+    Only the cursor is kept between pages, so memory use does not grow
+    with the number of pages. max_pages=None walks the whole feed. The end
+    of the feed is reported as a page whose next_cursor is None; a failed
+    request just stops the generator.
+    """
     headers = {"Authorization": f"Bearer {api_key}"}
-    all_posts = []
-    cursor = None
-    max_pages = 20  # Limit to avoid infinite loops
     pages = 0
     
-    print("Fetching posts...")
-    while pages < max_pages:
-        url = f"{API_BASE}/feed?limit={limit}"
+    while max_pages is None or pages < max_pages:
+        url = f"{get_api_base()}/feed?limit={limit}"
         if cursor:
             url += f"&cursor={cursor}"
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = get_client().get(url, headers=headers, timeout=10)
             response.raise_for_status()
             data = response.json()
-            
-            posts = data.get('posts', [])
-            if not posts:
-                break
-            
-            all_posts.extend(posts)
-            pages += 1
-            print(f"  Page {pages}: {len(posts)} posts (total: {len(all_posts)})")
-            
-            cursor = data.get('pagination', {}).get('next')
-            if not cursor:
-                break
-                
         except Exception as e:
             print(f"  Stopped at page {pages}: {e}")
-            break
-    
-    print(f"✓ Total posts fetched: {len(all_posts)}")
-    return all_posts
+            return
+        
+        posts = data.get('posts', [])
+        if not posts:
+            yield [], None
+            return
+        
+        pages += 1
+        cursor = data.get('pagination', {}).get('next')
+        yield posts, cursor
+        
+        if not cursor:
+            return
 
-def fetch_all_agents(api_key):
-    """Fetch all registered agents"""
-    headers = {"Authorization": f"Bearer {api_key}"}
-    all_agents = []
-    offset = 0
-    limit = 100
+def fetch_all_posts(api_key, limit=20, max_pages=20, store=None, checkpoint=None):
+    """
+    Fetch all posts from the main feed
     
-    print("Fetching all agents...")
-    while True:
-        try:
-            response = requests.get(f"{API_BASE}/agents?limit={limit}&offset={offset}", headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            
-            agents = data.get('agents', [])
-            if not agents:
-                break
-            
-            all_agents.extend(agents)
-            print(f"  Fetched {len(all_agents)} agents...")
-            
-            if len(agents) < limit:
-                break
-            
-            offset += limit
-                
-        except Exception as e:
-            print(f"Error fetching agents: {e}")
+    With a PostStore, each page is appended to disk as it arrives and the
+    store is returned instead of an in-memory list. max_pages=None removes
+    the page cap. With a CrawlCheckpoint, posts always go to the
+    checkpoint's store (pass store=checkpoint.post_store(...) to choose
+    compression) and a resumed crawl continues from the saved cursor.
+    A crawl that stopped at max_pages counts as complete; resuming it
+    with a higher cap (or none) continues the feed from there.
+    """
+    cursor = None
+    pages = 0
+    if checkpoint is not None:
+        if store is None:
+            store = checkpoint.post_store()
+        if checkpoint.is_complete('posts'):
+            if not checkpoint.reopen_capped('posts', max_pages):
+                print(f"✓ Feed already collected: {len(store)} posts on disk")
+                return store
+        cursor, pages = checkpoint.feed_cursor()
+        if pages:
+            print(f"Resuming feed at page {pages + 1} ({len(store)} posts on disk)")
+    
+    all_posts = [] if store is None else None
+    total = len(store) if store is not None else 0
+    remaining = None if max_pages is None else max(0, max_pages - pages)
+    
+    print("Fetching posts...")
+    for posts, next_cursor in iter_feed_pages(api_key, limit=limit, max_pages=remaining, cursor=cursor):
+        if store is None:
+            all_posts.extend(posts)
+        else:
+            store.append_page(posts)
+        if checkpoint is not None:
+            checkpoint.commit_feed_page(store, next_cursor)
+            if next_cursor is None:
+                checkpoint.finish('posts')
+        if not posts:
             break
+        total += len(posts)
+        pages += 1
+        print(f"  Page {pages}: {len(posts)} posts (total: {total})")
     
-    print(f"✓ Total agents fetched: {len(all_agents)}")
-    return all_agents
+    if checkpoint is not None and not checkpoint.is_complete('posts') and max_pages is not None and pages >= max_pages:
+        checkpoint.finish_capped('posts')
+        print(f"  Stopped at the {max_pages}-page cap (resume with a higher --max-pages to go further)")
+    print(f"✓ Total posts fetched: {total}")
+    if store is not None:
+        store.close()
+        return store
+    return all_posts
 
-def fetch_submolts(api_key):
+def fetch_submolts(api_key, checkpoint=None):
     """Fetch all submolts"""
+    if checkpoint is not None and checkpoint.is_complete('submolts'):
+        submolts = checkpoint.load_submolts()
+        print(f"✓ Loaded {len(submolts)} submolts from checkpoint")
+        return submolts
+    
     headers = {"Authorization": f"Bearer {api_key}"}
     
     try:
-        response = requests.get(f"{API_BASE}/submolts", headers=headers)
+        response = get_client().get(f"{get_api_base()}/submolts", headers=headers, timeout=10)
         response.raise_for_status()
         submolts = response.json().get('submolts', [])
         print(f"✓ Fetched {len(submolts)} submolts")
+        if checkpoint is not None:
+            checkpoint.save_submolts(submolts)
         return submolts
     except Exception as e:
         print(f"Error fetching submolts: {e}")
         return []
 
-def build_network_graph(agents, posts):
-    """Build network graph from agents and posts data"""
-    nodes = {}  # agent_id -> {username, karma, posts_count}
-    edges = []  # {source, target, weight, type}
-    
-    print("\nBuilding network graph...")
-    
-    # Build nodes from ALL agents (not just those who posted)
-    for agent in agents:
-        nodes[agent['id']] = {
-            'id': agent['id'],
-            'username': agent['username'],
-            'posts_count': agent.get('posts_count', 0),
-            'karma': agent.get('karma', 0),
-            'comments_made': 0,
-            'verified': agent.get('verified', False)
-        }
-    
-    # Update nodes with post data (in case agent list is stale)
-    for post in posts:
-        author_id = post['author']['id']
-        if author_id in nodes:
-            # Post count already in agent data, just ensure it's accurate
-            nodes[author_id]['karma'] = max(nodes[author_id]['karma'], post.get('upvotes', 0))
-    
-    # Build edges based on REAL post data
-    # Strategy: Connect agents who post in the same submolts
+def build_submolt_edges(posts):
+    """Connect agents who post in the same submolts (pure-Python engine)"""
+    edges = EdgeAccumulator()  # {source, target, weight, type, submolts}
     submolt_members = defaultdict(lambda: defaultdict(int))
     
     for post in posts:
@@ -145,31 +163,48 @@ def build_network_graph(agents, posts):
         members_list = list(members.keys())
         for i, agent1 in enumerate(members_list):
             for agent2 in members_list[i+1:]:
-                # Check if edge already exists
-                existing = next((e for e in edges if 
-                               (e['source'] == agent1 and e['target'] == agent2) or
-                               (e['source'] == agent2 and e['target'] == agent1)), None)
-                
                 # Weight is based on activity level in shared submolt
                 weight = min(members[agent1], members[agent2])
-                
-                if existing:
-                    existing['weight'] += weight
-                    if submolt not in existing.get('submolts', []):
-                        existing.setdefault('submolts', []).append(submolt)
-                else:
-                    edges.append({
-                        'source': agent1,
-                        'target': agent2,
-                        'weight': weight,
-                        'type': 'submolt_activity',
-                        'submolts': [submolt]
-                    })
-    
-    print(f"✓ Created {len(nodes)} nodes and {len(edges)} edges")
+                edges.upsert(agent1, agent2, weight, 'submolt_activity', submolt=submolt)
+    
+    return edges.to_list()
+
+def build_network_graph(agents, posts, engine='python'):
+    """
+    Build network graph from agents and posts data
+    
+    engine='sparse' computes the submolt edges with the NumPy/SciPy
+    projection in sparse_projection.py; edges then come out sorted by
+    agent index instead of feed order, with the same weights.
+    """
+    print(f"\nBuilding network graph ({engine} engine)...")
+    
+    # Build nodes from ALL agents (not just those who posted), one column per field
+    table = AgentTable.from_agents(agents)
+    karma = table.columns['karma']
+    
+    # Update nodes with post data (in case agent list is stale)
+    for post in posts:
+        row = table.index_of(post['author']['id'])
+        if row is not None:
+            # Post count already in agent data, just ensure it's accurate
+            karma[row] = max(karma[row], post.get('upvotes', 0) or 0)
+    
+    # Build edges based on REAL post data
+    # Strategy: Connect agents who post in the same submolts
+    if engine == 'sparse':
+        from sparse_projection import build_submolt_edges as build_sparse_edges
+        edges = build_sparse_edges(posts)
+    elif engine == 'python':
+        edges = build_submolt_edges(posts)
+    else:
+        raise ValueError(f"Unknown edge engine: {engine} (expected one of {EDGE_ENGINES})")
+    
+    print(f"✓ Created {len(table)} nodes and {len(edges)} edges")
     
+    nodes = table.to_nodes()
     return {
-        'nodes': list(nodes.values()),
+        'nodes': nodes,
         'edges': edges,
         'metadata': {
             'total_posts': len(posts),
@@ -178,34 +213,216 @@ def build_network_graph(agents, posts):
         }
     }
 
+def collect_incremental(api_key, output_file, binary=False, communities=None, analytics=False, layout=False,
+                        lod=None, string_ids=False, snapshot=None):
+    """
+    Apply agents and posts added since the last run to output_file
+    
+    Only feed pages newer than the saved marker and agent pages past the
+    saved high-water mark are fetched, plus the current record of each
+    existing agent that posted since, so the cost follows recent
+    activity rather than the size of the network.
+    """
+    state = load_sync_state()
+    if state is None or not os.path.exists(output_file):
+        print(f"❌ No {SYNC_FILE} from a previous run - run a full collection first")
+        sys.exit(1)
+    
+    graph = load_graph(output_file)
+    
+    new_agents = fetch_new_agents(api_key, start=state.get('agents_seen', 0))
+    print("Fetching new posts...")
+    new_posts = take_new_posts(
+        (posts for posts, _ in iter_feed_pages(api_key, max_pages=None)),
+        state.get('feed_marker')
+    )
+    print(f"✓ New posts fetched: {len(new_posts)}")
+    
+    known = {node['id'] for node in graph['nodes']}
+    active = {post['author']['id']: post['author'].get('username') for post in new_posts}
+    refreshed = refresh_agents(sorted({name for agent_id, name in active.items() if agent_id in known and name}),
+                               api_key=api_key)
+    
+    changes = apply_delta(graph, state, new_agents, new_posts, refreshed=refreshed)
+    if communities:
+        add_communities(graph, communities)
+    if analytics:
+        add_analytics(graph, incremental=True)
+    # The LOD tiles are cut from the layout; compute it before saving so the JSON matches them
+    if layout or lod:
+        add_layout(graph)
+    
+    save_graph(graph, output_file, string_ids=string_ids)
+    save_sync_state(state)
+    
+    print(f"\n✓ Network data updated in {output_file}")
+    if binary:
+        write_binary_export(graph, output_file)
+    if lod:
+        write_lod_export(graph, lod)
+    if snapshot:
+        write_snapshot(graph, snapshot, posts=new_posts, extra={'incremental': True, 'posts_scope': 'new'})
+    print(f"\nDelta:")
+    print(f"  + {changes['new_agents']} agents")
+    print(f"  ~ {changes['refreshed_agents']} agents refreshed")
+    print(f"  + {changes['new_posts']} posts")
+    print(f"  + {changes['new_edges']} connections ({changes['weight_added']} weight added)")
+
+def add_communities(graph, mode):
+    """Label every node with its community (see communities.py)"""
+    from communities import assign_communities, print_communities
+    print(f"\nDetecting communities ({mode})...")
+    print_communities(assign_communities(graph, mode=mode))
+
+def add_analytics(graph, incremental=False):
+    """Degree, PageRank, components, k-cores and betweenness per node (see analytics.py)"""
+    from analytics import analyze, print_analytics
+    print("\nComputing analytics...")
+    print_analytics(analyze(graph, incremental=incremental))
+
+def add_layout(graph):
+    """Precompute x/y and lat/lng for every node (see layout.py)"""
+    from layout import compute_layout, print_layout
+    print("\nComputing layout...")
+    print_layout(compute_layout(graph))
+
+def write_lod_export(graph, directory):
+    """Write the tiled level-of-detail export next to the JSON (see lod_export.py)"""
+    from lod_export import export_lod, print_lod
+    print_lod(export_lod(graph, directory), directory)
+
+def write_snapshot(graph, directory, posts=None, extra=None):
+    """Keep this run's agents, posts and edges as a columnar snapshot (see snapshot_store.py)"""
+    from snapshot_store import print_snapshot, snapshot_graph
+    print_snapshot(snapshot_graph(graph, directory, posts=posts, source='collect-data.py', extra=extra), directory)
+
+def write_binary_export(graph, output_file):
+    """Write the CSR binary export next to the JSON file"""
+    binary_file = binary_path_for(output_file)
+    size = write_graph_binary(graph, binary_file)
+    print(f"✓ Binary graph saved to {binary_file} ({size:,} bytes)")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Collect Moltbook data and build network-data.json")
+    parser.add_argument('--engine', choices=EDGE_ENGINES, default='python',
+                        help="submolt edge engine: pure Python or NumPy/SciPy sparse projection")
+    parser.add_argument('--max-pages', type=int, default=20,
+                        help="feed pages to fetch (0 for the whole feed)")
+    parser.add_argument('--stream-posts', metavar='DIR',
+                        help="stream feed pages to NDJSON segments in DIR instead of memory")
+    parser.add_argument('--compress', action='store_true',
+                        help="gzip the streamed post segments")
+    parser.add_argument('--checkpoint-dir', metavar='DIR',
+                        help=f"persist crawl progress to DIR (default with --resume: {DEFAULT_CHECKPOINT_DIR})")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue the crawl recorded in the checkpoint directory")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"only fetch what changed since the last run and update the graph in place (needs {SYNC_FILE})")
+    parser.add_argument('--string-ids', action='store_true',
+                        help="write edges as {source, target} agent ids instead of integer node indexes")
+    parser.add_argument('--binary', action='store_true',
+                        help="also write the memory-mappable CSR export (network-data.mbg)")
+    parser.add_argument('--communities', nargs='?', const='exact', choices=('exact', 'approx'),
+                        help="label nodes with label-propagation communities (needs numpy)")
+    parser.add_argument('--analytics', action='store_true',
+                        help="add degree, PageRank, component, k-core and betweenness attributes (needs numpy)")
+    parser.add_argument('--layout', action='store_true',
+                        help="precompute x/y and globe lat/lng for every node (needs numpy)")
+    parser.add_argument('--lod', nargs='?', const='lod', metavar='DIR',
+                        help="also write the tiled level-of-detail export to DIR (default: lod/, implies --layout, needs numpy)")
+    parser.add_argument('--snapshot', nargs='?', const='snapshots', metavar='DIR',
+                        help="also keep this run as a versioned columnar snapshot in DIR (default: snapshots/)")
+    parser.add_argument('--api-base', metavar='URL',
+                        help="API base URL, e.g. a local mock_api.py (default: $MOLTBOOK_API_BASE or the live API)")
+    add_cache_arguments(parser)
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    
     print("🕸️  Moltbook Network Map - Data Collector")
     print("=" * 50)
     
+    if args.api_base:
+        configure_api_base(args.api_base)
     api_key = get_api_key()
+    output_file = 'network-data.json'
+    
+    cache = cache_from_args(args)
+    if cache is not None:
+        configure_client(cache=cache)
+    
+    if args.incremental:
+        collect_incremental(api_key, output_file, binary=args.binary, communities=args.communities,
+                            analytics=args.analytics, layout=args.layout, lod=args.lod,
+                            string_ids=args.string_ids, snapshot=args.snapshot)
+        if cache is not None:
+            print(f"  - {cache.summary()}")
+        return
+    
+    checkpoint = None
+    store = None
+    if args.resume or args.checkpoint_dir:
+        checkpoint_dir = args.checkpoint_dir or DEFAULT_CHECKPOINT_DIR
+        checkpoint = CrawlCheckpoint(checkpoint_dir, resume=args.resume)
+        if args.resume:
+            print(f"Resuming crawl from {checkpoint_dir}/")
+            for line in checkpoint.summary():
+                print(line)
+        store = checkpoint.post_store(compress=args.compress)
+    elif args.stream_posts:
+        # Not a resume (that goes through the checkpoint), so start from an empty store
+        store = PostStore(args.stream_posts, compress=args.compress, fresh=True)
     
     # Fetch data
-    agents = fetch_all_agents(api_key)
-    posts = fetch_all_posts(api_key)
-    submolts = fetch_submolts(api_key)
+    try:
+        agents = fetch_all_agents(api_key, checkpoint=checkpoint)
+        posts = fetch_all_posts(api_key, max_pages=args.max_pages or None,
+                                store=store, checkpoint=checkpoint)
+        submolts = fetch_submolts(api_key, checkpoint=checkpoint)
+    except KeyboardInterrupt:
+        if checkpoint is None:
+            raise
+        print(f"\n⏸  Interrupted - progress saved, rerun with --resume to continue")
+        sys.exit(130)
+    
+    if checkpoint is not None:
+        unfinished = [name for name in ('agents', 'posts', 'submolts')
+                      if not checkpoint.is_complete(name)]
+        if unfinished:
+            print(f"⚠️  Partial crawl ({', '.join(unfinished)}) - rerun with --resume to continue")
     
     # Build graph
-    graph = build_network_graph(agents, posts)
+    graph = build_network_graph(agents, posts, engine=args.engine)
     
     # Add submolts to metadata
     graph['metadata']['submolts'] = submolts
+    if args.communities:
+        add_communities(graph, args.communities)
+    if args.analytics:
+        add_analytics(graph)
+    # The LOD tiles are cut from the layout; compute it before saving so the JSON matches them
+    if args.layout or args.lod:
+        add_layout(graph)
     
     # Save to file
-    output_file = 'network-data.json'
-    with open(output_file, 'w') as f:
-        json.dump(graph, f, indent=2)
+    save_graph(graph, output_file, string_ids=args.string_ids)
+    save_sync_state(new_sync_state(len(agents), posts))
     
     print(f"\n✓ Network data saved to {output_file}")
+    if args.binary:
+        write_binary_export(graph, output_file)
+    if args.lod:
+        write_lod_export(graph, args.lod)
+    if args.snapshot:
+        write_snapshot(graph, args.snapshot, posts=posts, extra={'args': vars(args)})
     print(f"\nStats:")
     print(f"  - {graph['metadata']['total_agents']} agents")
     print(f"  - {graph['metadata']['total_posts']} posts")
     print(f"  - {graph['metadata']['total_connections']} connections")
     print(f"  - {len(submolts)} submolts")
+    if cache is not None:
+        print(f"  - {cache.summary()}")
     
     # Print top agents by karma
     top_agents = sorted(graph['nodes'], key=lambda x: x['karma'], reverse=True)[:10]
@@ -4,15 +4,25 @@ Collect REAL network data from Moltbook by iterating through agents
 and building connections based on actual activity
 """
 
-import requests
+import argparse
 import json
-from collections import defaultdict
-import time
+import os
 
-API_BASE = "https://moltbook-api.simeon-garratt.workers.dev/v1"
+from collector import configure_api_base, fetch_all_agents
+from activity_edges import build_activity_edges
+from agent_table import AgentTable
+from analytics import degree_stats, print_degree_stats
+from graph_binary import binary_path_for, write_graph_binary
+from graph_json import save_graph
+from http_client import configure_client
+from response_cache import add_cache_arguments, cache_from_args
+
+NODE_FIELDS = ('id', 'username', 'posts_count', 'karma', 'verified')
 
 def get_api_key():
-    """Read API key from credentials file"""
+    """Read API key from $MOLTBOOK_API_KEY or the credentials file"""
+    if os.environ.get('MOLTBOOK_API_KEY'):
+        return os.environ['MOLTBOOK_API_KEY']
     try:
         with open('/Users/simeong/.config/moltbook/credentials.json') as f:
             return json.load(f)['api_key']
@@ -20,122 +30,73 @@ def get_api_key():
         print(f"Error reading API key: {e}")
         return None
 
-def fetch_all_agents(api_key=None):
-    """Fetch all registered agents"""
-    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
-    all_agents = []
-    offset = 0
-    limit = 100
-    
-    print("Fetching all agents...")
-    while True:
-        try:
-            response = requests.get(
-                f"{API_BASE}/agents?limit={limit}&offset={offset}",
-                headers=headers,
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            agents = data.get('agents', [])
-            if not agents:
-                break
-            
-            all_agents.extend(agents)
-            print(f"  Fetched {len(all_agents)} agents...")
-            
-            if len(agents) < limit:
-                break
-            
-            offset += limit
-                
-        except Exception as e:
-            print(f"Error fetching agents: {e}")
-            break
-    
-    print(f"✓ Total agents fetched: {len(all_agents)}")
-    return all_agents
-
-def build_activity_connections(agents):
+def build_activity_connections(agents, max_per_agent=None):
     """
     Build connections based on REAL agent activity data
     - Agents with similar post counts likely share interests
     - Agents with similar karma levels are in similar "tiers"
     - Agents who are active (posts_count > 0) form a connected community
+    
+    max_per_agent caps how many similarity partners each agent adds,
+    keeping the strongest (closest posts_count) ones.
     """
-    nodes = []
-    edges = []
-    
-    # Create nodes
-    active_agents = []
-    for agent in agents:
-        node = {
-            'id': agent['id'],
-            'username': agent['username'],
-            'posts_count': agent.get('posts_count', 0),
-            'karma': agent.get('karma', 0),
-            'verified': agent.get('verified', False)
-        }
-        nodes.append(node)
-        
-        # Track active agents (those who have posted)
-        if node['posts_count'] > 0:
-            active_agents.append(node)
+    # Agents as typed columns; active agents (those who have posted) are a view
+    table = AgentTable.from_agents(agents)
+    active_agents = table.view().where('posts_count', '>', 0)
     
     print(f"\n📊 Activity stats:")
-    print(f"  - Total agents: {len(nodes)}")
+    print(f"  - Total agents: {len(table)}")
     print(f"  - Active agents (posted): {len(active_agents)}")
-    print(f"  - Inactive agents: {len(nodes) - len(active_agents)}")
+    print(f"  - Inactive agents: {len(table) - len(active_agents)}")
     
     # Build connections based on activity similarity
     # Strategy: Connect agents with similar activity levels
-    for i, agent1 in enumerate(active_agents):
-        for agent2 in active_agents[i+1:]:
-            # Calculate similarity score
-            post_diff = abs(agent1['posts_count'] - agent2['posts_count'])
-            karma_diff = abs(agent1['karma'] - agent2['karma'])
-            
-            # Connect if they're in similar activity tier
-            # (within 2 posts of each other OR both have high karma)
-            if post_diff <= 2 or (agent1['karma'] > 0 and agent2['karma'] > 0):
-                weight = max(1, 5 - post_diff)  # Higher weight for closer matches
-                
-                edges.append({
-                    'source': agent1['id'],
-                    'target': agent2['id'],
-                    'weight': weight,
-                    'type': 'activity_similarity',
-                    'reason': f"Similar activity ({agent1['posts_count']} vs {agent2['posts_count']} posts)"
-                })
-    
-    # Add verified agent hub connections
-    verified = [a for a in active_agents if a.get('verified')]
-    for v_agent in verified:
-        # Verified agents connect to top posters
-        top_posters = sorted(active_agents, key=lambda x: x['posts_count'], reverse=True)[:10]
-        for top in top_posters:
-            if top['id'] != v_agent['id']:
-                if not any((e['source'] == v_agent['id'] and e['target'] == top['id']) or
-                          (e['source'] == top['id'] and e['target'] == v_agent['id']) 
-                          for e in edges):
-                    edges.append({
-                        'source': v_agent['id'],
-                        'target': top['id'],
-                        'weight': 3,
-                        'type': 'verified_connection'
-                    })
+    # (within 2 posts of each other OR both have high karma),
+    # plus verified agent hub connections to the top posters
+    edges = build_activity_edges(active_agents, max_per_agent=max_per_agent)
     
     print(f"  - Connections created: {len(edges)}")
     
+    nodes = table.to_nodes(NODE_FIELDS)
     return {'nodes': nodes, 'edges': edges}
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build network-data.json from real agent activity")
+    parser.add_argument('--string-ids', action='store_true',
+                        help="write edges as {source, target} agent ids instead of integer node indexes")
+    parser.add_argument('--binary', action='store_true',
+                        help="also write the memory-mappable CSR export (network-data.mbg)")
+    parser.add_argument('--communities', nargs='?', const='exact', choices=('exact', 'approx'),
+                        help="label nodes with label-propagation communities (needs numpy)")
+    parser.add_argument('--analytics', action='store_true',
+                        help="add degree, PageRank, component, k-core and betweenness attributes (needs numpy)")
+    parser.add_argument('--layout', action='store_true',
+                        help="precompute x/y and globe lat/lng for every node (needs numpy)")
+    parser.add_argument('--lod', nargs='?', const='lod', metavar='DIR',
+                        help="also write the tiled level-of-detail export to DIR (default: lod/, implies --layout, needs numpy)")
+    parser.add_argument('--max-per-agent', type=int, metavar='K',
+                        help="keep only each agent's K strongest similarity connections")
+    parser.add_argument('--snapshot', nargs='?', const='snapshots', metavar='DIR',
+                        help="also keep this run as a versioned columnar snapshot in DIR (default: snapshots/)")
+    parser.add_argument('--api-base', metavar='URL',
+                        help="API base URL, e.g. a local mock_api.py (default: $MOLTBOOK_API_BASE or the live API)")
+    add_cache_arguments(parser)
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    
     print("🕸️  Moltbook Network Map - Real Data Collector")
     print("=" * 50)
     
+    if args.api_base:
+        configure_api_base(args.api_base)
     api_key = get_api_key()
     
+    cache = cache_from_args(args)
+    if cache is not None:
+        configure_client(cache=cache)
+    
     # Fetch agents (public endpoint, no auth needed but we have it)
     agents = fetch_all_agents(api_key)
     
@@ -144,7 +105,7 @@ def main():
         return
     
     # Build network from real activity data
-    graph = build_activity_connections(agents)
+    graph = build_activity_connections(agents, max_per_agent=args.max_per_agent)
     
     # Add metadata
     graph['metadata'] = {
@@ -155,29 +116,47 @@ def main():
         'connection_strategy': 'activity_similarity + verified_hubs'
     }
     
+    if args.communities:
+        from communities import assign_communities, print_communities
+        print(f"\nDetecting communities ({args.communities})...")
+        print_communities(assign_communities(graph, mode=args.communities))
+    if args.analytics:
+        from analytics import analyze, print_analytics
+        print("\nComputing analytics...")
+        print_analytics(analyze(graph))
+    # The LOD tiles are cut from the layout; compute it before saving so the JSON matches them
+    if args.layout or args.lod:
+        from layout import compute_layout, print_layout
+        print("\nComputing layout...")
+        print_layout(compute_layout(graph))
+    
     # Save to file
     output_file = 'network-data.json'
-    with open(output_file, 'w') as f:
-        json.dump(graph, f, indent=2)
+    save_graph(graph, output_file, string_ids=args.string_ids)
     
     print(f"\n✓ Network data saved to {output_file}")
+    if args.binary:
+        binary_file = binary_path_for(output_file)
+        size = write_graph_binary(graph, binary_file)
+        print(f"✓ Binary graph saved to {binary_file} ({size:,} bytes)")
+    if args.lod:
+        from lod_export import export_lod, print_lod
+        print_lod(export_lod(graph, args.lod), args.lod)
+    if args.snapshot:
+        from snapshot_store import print_snapshot, snapshot_graph
+        run = snapshot_graph(graph, args.snapshot, source='collect-real-data.py', extra={'args': vars(args)})
+        print_snapshot(run, args.snapshot)
     print(f"\n📈 Final Stats:")
     print(f"  - {graph['metadata']['total_agents']} agents")
     print(f"  - {graph['metadata']['active_agents']} active agents")
     print(f"  - {graph['metadata']['total_connections']} connections")
+    if cache is not None:
+        print(f"  - {cache.summary()}")
     
     # Connection stats
-    degrees = defaultdict(int)
-    for edge in graph['edges']:
-        degrees[edge['source']] += 1
-        degrees[edge['target']] += 1
-    
-    if degrees:
-        avg_degree = sum(degrees.values()) / len(degrees)
-        max_degree = max(degrees.values())
-        
-        print(f"  - Average connections/agent: {avg_degree:.1f}")
-        print(f"  - Most connected agent: {max_degree} connections")
+    stats = graph['metadata'].get('analytics', {}).get('degree') or degree_stats(graph)
+    if stats['max']:
+        print_degree_stats(stats)
     
     # Top agents by posts
     top_agents = sorted(graph['nodes'], key=lambda x: x['posts_count'], reverse=True)[:10]
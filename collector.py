@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Concurrent Collector
+Fetches offset-paginated API endpoints with many pages in flight
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from http_client import get_client
+
+API_BASE = "https://moltbook-api.simeon-garratt.workers.dev/v1"
+API_BASE_ENV = 'MOLTBOOK_API_BASE'
+
+PAGE_LIMIT = 100
+DEFAULT_CONCURRENCY = 16
+
+
+async def _crawl_offset_pages(fetch_page, limit, concurrency, label, pages, on_page):
+    """
+    Fetch pages 0, 1, 2, ... with up to `concurrency` requests in flight.
+
+    Offset pagination is random-access, so workers claim page indexes from
+    a shared counter instead of waiting for the previous page. The first
+    short or empty page marks the end of the collection; a failed page ends
+    it just before that page. Pages past the end are discarded, so at most
+    `concurrency` requests are wasted.
+
+    Pages already present in `pages` (e.g. loaded from a checkpoint) are
+    not fetched again; every newly fetched page is passed to
+    `on_page(index, items)` before it counts as collected.
+    """
+    loop = asyncio.get_running_loop()
+    state = {'next': 0, 'end': None, 'emitted': 0, 'total': 0, 'fetched': 0, 'fetched_items': 0}
+
+    def close_at(end):
+        if state['end'] is None or end < state['end']:
+            state['end'] = end
+
+    def report_progress():
+        # Pages arrive out of order; only report the contiguous prefix
+        while state['emitted'] in pages:
+            if state['end'] is not None and state['emitted'] >= state['end']:
+                break
+            state['total'] += len(pages[state['emitted']])
+            state['emitted'] += 1
+            print(f"  Fetched {state['total']} {label}...")
+
+    async def worker(executor):
+        while state['end'] is None or state['next'] < state['end']:
+            index = state['next']
+            state['next'] += 1
+            offset = index * limit
+
+            if index in pages:
+                items = pages[index]
+            else:
+                try:
+                    items = await loop.run_in_executor(executor, fetch_page, offset, limit)
+                    if state['end'] is not None and index >= state['end']:
+                        continue  # Speculative page past the end
+                    if on_page is not None:
+                        on_page(index, items)
+                except Exception as e:
+                    print(f"Error fetching page at offset {offset}: {e}")
+                    close_at(index)
+                    continue
+                state['fetched'] += 1
+                state['fetched_items'] += len(items)
+                pages[index] = items
+
+            if len(items) < limit:
+                close_at(index + 1)
+            report_progress()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        await asyncio.gather(*(worker(executor) for _ in range(concurrency)))
+
+    end = state['end'] if state['end'] is not None else 0
+    ordered = []
+    for index in range(end):
+        ordered.extend(pages.get(index, []))
+
+    # Ended on a short page rather than on an error
+    complete = (end - 1) in pages and len(pages[end - 1]) < limit
+    return ordered, {
+        'pages': end,
+        'pages_fetched': state['fetched'],
+        'items_fetched': state['fetched_items'],
+        'complete': complete,
+    }
+
+
+def fetch_offset_pages(fetch_page, limit=PAGE_LIMIT, concurrency=DEFAULT_CONCURRENCY, label='items',
+                       pages=None, on_page=None):
+    """
+    Collect every item from an offset-paginated endpoint, in order.
+
+    `fetch_page(offset, limit)` returns the list of items on one page.
+    `pages` maps page index -> items already collected and `on_page` is
+    called with each newly fetched page, which is how checkpoints plug in.
+    Returns (items, stats) where stats holds the throughput report.
+    """
+    start = time.perf_counter()
+    items, stats = asyncio.run(
+        _crawl_offset_pages(fetch_page, limit, concurrency, label, dict(pages or {}), on_page)
+    )
+    elapsed = time.perf_counter() - start
+
+    # Rates only count pages fetched over the network in this run
+    stats.update({
+        'items': len(items),
+        'seconds': elapsed,
+        'pages_per_sec': stats['pages_fetched'] / elapsed if elapsed else 0.0,
+        'items_per_sec': stats['items_fetched'] / elapsed if elapsed else 0.0,
+        'concurrency': concurrency,
+    })
+    return items, stats
+
+
+_api_base = os.environ.get(API_BASE_ENV, API_BASE).rstrip('/')
+
+
+def get_api_base():
+    """Base URL of the Moltbook API ($MOLTBOOK_API_BASE or the live service)"""
+    return _api_base
+
+
+def configure_api_base(url):
+    """Point every collector at another API, e.g. the local stand-in"""
+    global _api_base
+    _api_base = url.rstrip('/')
+    return _api_base
+
+
+def print_throughput(stats, label='agents'):
+    """Print a one-line throughput report for a crawl"""
+    print(f"  ⚡ {stats['pages_fetched']} pages in {stats['seconds']:.1f}s "
+          f"({stats['pages_per_sec']:.1f} pages/sec, "
+          f"{stats['items_per_sec']:.0f} {label}/sec, "
+          f"concurrency {stats['concurrency']})")
+
+
+def agents_page_fetcher(api_key=None, api_base=None, timeout=10):
+    """Build a fetch_page(offset, limit) callable for the /agents endpoint"""
+    api_base = api_base or get_api_base()
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    def fetch_page(offset, limit):
+        response = get_client().get(
+            f"{api_base}/agents?limit={limit}&offset={offset}",
+            headers=headers,
+            timeout=timeout
+        )
+        response.raise_for_status()
+        return response.json().get('agents', [])
+
+    return fetch_page
+
+
+def fetch_new_agents(api_key=None, start=0, concurrency=DEFAULT_CONCURRENCY, limit=PAGE_LIMIT):
+    """Fetch agents registered after the first `start` (the high-water mark)"""
+    fetch_page = agents_page_fetcher(api_key)
+    print(f"Fetching agents past #{start}...")
+    agents, stats = fetch_offset_pages(
+        lambda offset, limit: fetch_page(start + offset, limit),
+        limit=limit, concurrency=concurrency, label='new agents'
+    )
+    print(f"✓ New agents fetched: {len(agents)}")
+    print_throughput(stats)
+    return agents
+
+
+def refresh_agents(usernames, api_key=None, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Current records of agents that are already in the graph, by username
+
+    Uses the profile endpoint (see profile_enrichment.py), one request per
+    agent with `concurrency` in flight. Agents the API has no answer for
+    are left out, so callers keep their old values.
+    """
+    from profile_enrichment import fetch_profile_api
+
+    usernames = list(usernames)
+    if not usernames:
+        return []
+    print(f"Refreshing {len(usernames)} active agents...")
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        profiles = list(executor.map(lambda name: fetch_profile_api(name, api_key=api_key), usernames))
+    refreshed = [profile for profile in profiles if profile is not None]
+    print(f"✓ Agents refreshed: {len(refreshed)}/{len(usernames)}")
+    return refreshed
+
+
+def fetch_all_agents(api_key=None, concurrency=DEFAULT_CONCURRENCY, limit=PAGE_LIMIT, checkpoint=None):
+    """
+    Fetch all registered agents with concurrent offset pagination
+
+    With a CrawlCheckpoint, every page is persisted as it arrives and a
+    resumed crawl only requests the pages it has not committed yet.
+    """
+    pages = {}
+    on_page = None
+    if checkpoint is not None:
+        pages = checkpoint.load_offset_pages('agents')
+        on_page = lambda index, items: checkpoint.commit_offset_page('agents', index, items)
+        if pages:
+            print(f"Resuming agents crawl with {len(pages)} pages already on disk")
+
+    print(f"Fetching all agents ({concurrency} pages in flight)...")
+    agents, stats = fetch_offset_pages(
+        agents_page_fetcher(api_key), limit=limit, concurrency=concurrency,
+        label='agents', pages=pages, on_page=on_page
+    )
+    print(f"✓ Total agents fetched: {len(agents)}")
+    print_throughput(stats)
+
+    if checkpoint is not None and stats['complete']:
+        checkpoint.finish('agents')
+    return agents
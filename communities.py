@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Community Detection
+Weighted label propagation over the CSR adjacency of the built network
+
+Every node starts in its own community and repeatedly adopts the label
+carrying the most edge weight among its neighbours. One iteration is a
+handful of array operations over all edges: neighbour labels are
+gathered, (node, label) pairs are sorted and their weights summed, and
+each node picks its heaviest label, keeping its own on a tie. Other ties
+are broken at random, and only a random 70% of the nodes move per
+iteration (semi-synchronous updates) so labels settle instead of
+oscillating between two sides of a bipartite pattern.
+
+Rows are processed in blocks of about BLOCK_ENTRIES edges, which bounds
+the sort size; with workers > 1 the blocks of an iteration run on a
+thread pool, since NumPy releases the GIL for the sorts and gathers.
+Approximate mode stops once fewer than 1% of the nodes change label,
+which is usually a few iterations before the exact fixpoint.
+
+Communities are numbered by size, 0 being the largest. The export gets
+a `community` attribute per node and metadata['communities'] with the
+count, modularity, coverage and the largest communities' stats.
+
+    python3 communities.py network-data.json --mode approx --workers 4
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from csr_graph import CsrGraph, np, require_numpy
+from graph_json import load_graph, save_graph
+
+MODES = ('exact', 'approx')
+DEFAULT_MAX_ITER = 50
+APPROX_MAX_ITER = 20
+APPROX_TOLERANCE = 0.01     # share of nodes still changing label when approx mode stops
+UPDATE_SHARE = 0.7
+BLOCK_ENTRIES = 1 << 22
+SUMMARY_COMMUNITIES = 50
+TIE_NOISE = 1e-9            # relative, far below any real weight difference
+
+
+def _row_blocks(indptr, block_entries=BLOCK_ENTRIES):
+    """[(start, stop)] row ranges holding about block_entries entries each"""
+    n = len(indptr) - 1
+    cuts = np.searchsorted(indptr, np.arange(block_entries, indptr[-1], block_entries), side='right') - 1
+    bounds = np.unique(np.concatenate(([0], cuts, [n])))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def _block_labels(csr, labels, start, stop, rng):
+    """Heaviest neighbour label of every node in rows start..stop (own label if isolated)"""
+    best = labels[start:stop].copy()
+    lo, hi = csr.indptr[start], csr.indptr[stop]
+    if lo == hi:
+        return best
+
+    n = csr.n_nodes
+    local = csr.rows(start, stop).astype(np.int64) - start
+    key = local * n + labels[csr.indices[lo:hi]]
+    order = np.argsort(key)
+    key = key[order]
+    weights = csr.weights[lo:hi][order]
+
+    # Total weight per (node, label) group, jittered to break ties at random
+    first = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    weight = np.add.reduceat(weights, first)
+    totals = weight * (1 + TIE_NOISE * rng.random(len(weight)))
+    group_key = key[first]
+    group_row = group_key // n
+    group_label = group_key % n
+
+    # Weight a node already has in its own community; it only moves for more
+    own = np.zeros(stop - start)
+    mine = group_label == best[group_row]
+    own[group_row[mine]] = weight[mine]
+
+    # Groups are sorted by row; keep the heaviest group of each row
+    row_first = np.flatnonzero(np.r_[True, group_row[1:] != group_row[:-1]])
+    row_max = np.maximum.reduceat(totals, row_first)
+    row_sizes = np.diff(np.r_[row_first, len(totals)])
+    winners = np.flatnonzero(totals == np.repeat(row_max, row_sizes))
+    winner_rows = group_row[winners]
+    winners = winners[np.r_[True, winner_rows[1:] != winner_rows[:-1]]]
+    winners = winners[weight[winners] > own[group_row[winners]]]
+    best[group_row[winners]] = group_label[winners]
+    return best
+
+
+def label_propagation(csr, max_iter=DEFAULT_MAX_ITER, tolerance=0.0, workers=1, seed=0, verbose=False):
+    """
+    Raw community labels for every node of a CsrGraph.
+
+    Stops at max_iter or once at most `tolerance` (a share of the nodes)
+    changed label in an iteration. Returns (labels, iterations).
+    """
+    require_numpy()
+    n = csr.n_nodes
+    labels = np.arange(n, dtype=csr.indices.dtype)
+    if n == 0:
+        return labels, 0
+
+    blocks = _row_blocks(csr.indptr)
+    connected = csr.degree() > 0
+    seeds = np.random.SeedSequence(seed)
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    try:
+        for iteration in range(1, max_iter + 1):
+            block_rngs = [np.random.default_rng(s) for s in seeds.spawn(len(blocks))]
+            jobs = [(labels, start, stop, rng) for (start, stop), rng in zip(blocks, block_rngs)]
+            if executor is None:
+                parts = [_block_labels(csr, *job) for job in jobs]
+            else:
+                parts = list(executor.map(lambda job: _block_labels(csr, *job), jobs))
+            proposed = np.concatenate(parts)
+
+            # A random share moves; nodes still alone in their community always
+            # join a lower label, so two singletons never just swap labels
+            alone = np.bincount(labels, minlength=n)[labels] == 1
+            chosen = np.random.default_rng(seeds.spawn(1)[0]).random(n) < UPDATE_SHARE
+            move = connected & (proposed != labels) & (chosen | (alone & (proposed < labels)))
+            changed = int(move.sum())
+            labels = np.where(move, proposed, labels)
+
+            if verbose:
+                print(f"  iteration {iteration}: {changed:,} nodes changed community")
+            if changed <= tolerance * n:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return labels, iteration
+
+
+def relabel_by_size(labels):
+    """Dense community numbers 0..k-1, largest community first"""
+    _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    rank = np.empty(len(counts), dtype=np.int64)
+    rank[np.argsort(-counts, kind='stable')] = np.arange(len(counts))
+    return rank[inverse.ravel()]
+
+
+def community_summary(csr, community, names=None, top=SUMMARY_COMMUNITIES):
+    """
+    Community-level stats: count, modularity, coverage and, for the `top`
+    largest communities, size, internal/external weight and hub node.
+    """
+    k = int(community.max()) + 1 if len(community) else 0
+    sizes = np.bincount(community, minlength=k)
+    strength = csr.strength()
+    two_m = float(csr.weights.sum())
+
+    rows = csr.rows()
+    inside = community[rows] == community[csr.indices]
+    internal = np.bincount(community[rows][inside], weights=csr.weights[inside], minlength=k) / 2
+    total = np.bincount(community, weights=strength, minlength=k)
+
+    modularity = float((2 * internal / two_m - (total / two_m) ** 2).sum()) if two_m else 0.0
+    coverage = float(2 * internal.sum() / two_m) if two_m else 0.0
+
+    # Hub = strongest node of each community
+    order = np.lexsort((-strength, community))
+    hubs = order[np.r_[0, np.flatnonzero(np.diff(community[order])) + 1]] if len(order) else order
+
+    largest = []
+    for c in range(min(top, k)):
+        hub = int(hubs[c])
+        largest.append({
+            'id': c,
+            'size': int(sizes[c]),
+            'internal_weight': float(internal[c]),
+            'external_weight': float(total[c] - 2 * internal[c]),
+            'hub': names[hub] if names is not None else csr.node_ids[hub]
+        })
+
+    return {
+        'count': k,
+        'singletons': int((sizes == 1).sum()),
+        'modularity': round(modularity, 4),
+        'coverage': round(coverage, 4),
+        'largest': largest
+    }
+
+
+def detect_communities(csr, mode='exact', workers=1, seed=0, verbose=False):
+    """Community number per node of a CsrGraph, plus the run parameters"""
+    if mode not in MODES:
+        raise ValueError(f"Unknown community mode: {mode} (expected one of {MODES})")
+    approx = mode == 'approx'
+    labels, iterations = label_propagation(
+        csr,
+        max_iter=APPROX_MAX_ITER if approx else DEFAULT_MAX_ITER,
+        tolerance=APPROX_TOLERANCE if approx else 0.0,
+        workers=workers, seed=seed, verbose=verbose
+    )
+    return relabel_by_size(labels), {
+        'algorithm': 'label_propagation', 'mode': mode, 'iterations': iterations, 'seed': seed
+    }
+
+
+def assign_communities(graph, mode='exact', workers=1, seed=0, verbose=False):
+    """
+    Detect communities on a network graph dict in place.
+
+    Sets node['community'] on every node and graph['metadata']['communities']
+    to the summary; returns the summary.
+    """
+    start = time.perf_counter()
+    csr = CsrGraph.from_graph(graph)
+    community, run = detect_communities(csr, mode=mode, workers=workers, seed=seed, verbose=verbose)
+
+    nodes = graph['nodes']
+    names = [node.get('username', node['id']) for node in nodes]
+    names += csr.node_ids[len(nodes):]
+    for node, c in zip(nodes, community.tolist()):
+        node['community'] = c
+
+    summary = {**run, **community_summary(csr, community, names=names)}
+    summary['seconds'] = round(time.perf_counter() - start, 2)
+    graph.setdefault('metadata', {})['communities'] = summary
+    return summary
+
+
+def print_communities(summary):
+    print(f"✓ {summary['count']:,} communities ({summary['singletons']:,} singletons), "
+          f"modularity {summary['modularity']:.3f}, {summary['iterations']} iterations "
+          f"in {summary['seconds']:.1f}s")
+    for c in summary['largest'][:5]:
+        print(f"  #{c['id']}: {c['size']:,} agents around {c['hub']}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Add community labels to a network-data.json export")
+    parser.add_argument('input', nargs='?', default='network-data.json')
+    parser.add_argument('--output', help="write here instead of updating the input in place")
+    parser.add_argument('--mode', choices=MODES, default='exact',
+                        help="exact: run to convergence; approx: stop once labels barely change")
+    parser.add_argument('--workers', type=int, default=1, help="threads per label propagation iteration")
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("🧩 Moltbook Network Map - Community Detection")
+    print("=" * 50)
+
+    graph = load_graph(args.input)
+    print(f"📊 {len(graph['nodes']):,} nodes, {len(graph['edges']):,} edges")
+
+    summary = assign_communities(graph, mode=args.mode, workers=args.workers, seed=args.seed, verbose=True)
+    print_communities(summary)
+
+    output_file = args.output or args.input
+    save_graph(graph, output_file)
+    print(f"✓ Saved to {output_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Crawl Checkpoints
+Durable per-endpoint crawl progress so an interrupted run can resume
+
+Layout of a checkpoint directory:
+    checkpoint.json    committed offset/cursor and page bookkeeping
+    agents.ndjson      one {"page": i, "items": [...]} line per agents page
+    submolts.json      the /submolts response
+    posts/             PostStore segments for the feed
+
+Page data is written and fsynced before checkpoint.json is atomically
+replaced, so checkpoint.json is the single commit point: anything on
+disk that it does not mention is ignored on resume.
+"""
+
+import json
+import os
+import shutil
+
+from post_store import PostStore
+
+CHECKPOINT_FILE = 'checkpoint.json'
+SUBMOLTS_FILE = 'submolts.json'
+POSTS_DIR = 'posts'
+
+
+class CrawlCheckpoint:
+    """Crawl progress for the agents, posts and submolts endpoints"""
+
+    def __init__(self, directory, resume=False):
+        self.directory = directory
+        self.state = {}
+
+        path = os.path.join(directory, CHECKPOINT_FILE)
+        if resume and os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+        elif not resume:
+            self._clear()
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _clear(self):
+        """Drop the files of a previous crawl (only the ones we own)"""
+        for name in os.listdir(self.directory) if os.path.isdir(self.directory) else []:
+            path = self._path(name)
+            if name == POSTS_DIR and os.path.isdir(path):
+                shutil.rmtree(path)
+            elif name in (CHECKPOINT_FILE, SUBMOLTS_FILE) or name.endswith('.ndjson'):
+                os.remove(path)
+
+    def save(self):
+        """Atomically replace checkpoint.json with the current state"""
+        path = self._path(CHECKPOINT_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def endpoint(self, name):
+        """Mutable progress dict for one endpoint"""
+        return self.state.setdefault(name, {'complete': False})
+
+    def is_complete(self, name):
+        return self.endpoint(name).get('complete', False)
+
+    def finish(self, name):
+        """Mark an endpoint as fully collected"""
+        self.endpoint(name)['complete'] = True
+        self.save()
+
+    def finish_capped(self, name):
+        """Mark an endpoint complete because it reached the run's page cap"""
+        self.endpoint(name)['capped'] = True
+        self.finish(name)
+
+    def reopen_capped(self, name, max_pages):
+        """
+        Reopen an endpoint that stopped at its page cap if max_pages allows
+        more pages (None = no cap); returns True if it was reopened.
+        """
+        progress = self.endpoint(name)
+        if not progress.get('capped') or (max_pages is not None and max_pages <= progress.get('pages', 0)):
+            return False
+        progress['complete'] = False
+        del progress['capped']
+        self.save()
+        return True
+
+    def summary(self):
+        """One line per endpoint describing what a resume will skip"""
+        lines = []
+        for name, progress in sorted(self.state.items()):
+            status = 'complete' if progress.get('complete') else 'partial'
+            if progress.get('capped'):
+                status += ' at page cap'
+            if 'committed_pages' in progress:
+                detail = f"{progress['committed_pages']} pages committed"
+            elif 'cursor' in progress:
+                detail = f"{progress.get('pages', 0)} pages, cursor {progress['cursor']}"
+            else:
+                detail = 'saved'
+            lines.append(f"  - {name}: {status} ({detail})")
+        return lines
+
+    # Offset-paginated endpoints (/agents)
+
+    def load_offset_pages(self, name):
+        """Return {page_index: items} for every committed page"""
+        progress = self.endpoint(name)
+        committed = progress.get('committed_pages', 0)
+        extra = set(progress.get('extra_pages', []))
+
+        pages = {}
+        path = self._path(f"{name}.ndjson")
+        if not os.path.exists(path):
+            return pages
+
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Torn write from an interrupted run
+                index = record['page']
+                if index < committed or index in extra:
+                    pages[index] = record['items']
+        return pages
+
+    def commit_offset_page(self, name, index, items):
+        """Persist one page and advance the committed offset"""
+        with open(self._path(f"{name}.ndjson"), 'a') as f:
+            f.write(json.dumps({'page': index, 'items': items}, separators=(',', ':')))
+            f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+        progress = self.endpoint(name)
+        committed = progress.get('committed_pages', 0)
+        extra = set(progress.get('extra_pages', []))
+        extra.add(index)
+
+        # Pages finish out of order; fold the contiguous run into the offset
+        while committed in extra:
+            extra.remove(committed)
+            committed += 1
+
+        progress['committed_pages'] = committed
+        progress['extra_pages'] = sorted(extra)
+        self.save()
+
+    # Cursor-paginated endpoints (/feed)
+
+    def post_store(self, compress=False):
+        """Open the feed PostStore, trimmed to what checkpoint.json committed"""
+        store = PostStore(self._path(POSTS_DIR), compress=compress)
+        store.restore(self.endpoint('posts').get('segments', []))
+        return store
+
+    def feed_cursor(self):
+        """(cursor, pages) to continue the feed from"""
+        progress = self.endpoint('posts')
+        return progress.get('cursor'), progress.get('pages', 0)
+
+    def commit_feed_page(self, store, cursor):
+        """Record that everything in `store` up to `cursor` is persisted"""
+        progress = self.endpoint('posts')
+        progress['cursor'] = cursor
+        progress['pages'] = progress.get('pages', 0) + 1
+        progress['segments'] = [dict(segment) for segment in store.segments]
+        self.save()
+
+    # Single-response endpoints (/submolts)
+
+    def load_submolts(self):
+        with open(self._path(SUBMOLTS_FILE)) as f:
+            return json.load(f)
+
+    def save_submolts(self, submolts):
+        path = self._path(SUBMOLTS_FILE)
+        with open(path, 'w') as f:
+            json.dump(submolts, f)
+            f.flush()
+            os.fsync(f.fileno())
+        self.finish('submolts')
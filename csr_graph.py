@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - CSR Graph Arrays
+Symmetric NumPy CSR adjacency of a network graph for the analysis stages
+
+Node i is graph['nodes'][i]; edge endpoints missing from the node list
+are appended after them, the same rule as graph_binary.py. Every
+undirected edge is stored in both directions and parallel edges between
+the same pair are merged with their weights summed, so the neighbours of
+node i are indices[indptr[i]:indptr[i + 1]] with weights alongside.
+Self-loops are dropped.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def require_numpy():
+    """Fail with an install hint if NumPy is missing"""
+    if np is None:
+        raise ImportError("The graph analysis stages need NumPy: pip3 install numpy")
+
+
+class CsrGraph:
+    """Undirected weighted graph as CSR arrays (indptr, indices, weights)"""
+
+    def __init__(self, node_ids, indptr, indices, weights):
+        self.node_ids = node_ids
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+
+    @property
+    def n_nodes(self):
+        return len(self.indptr) - 1
+
+    @property
+    def n_edges(self):
+        return len(self.indices) // 2
+
+    def rows(self, start=0, stop=None):
+        """Row index of every entry in rows start..stop (the COO row array)"""
+        stop = self.n_nodes if stop is None else stop
+        counts = np.diff(self.indptr[start:stop + 1])
+        return np.repeat(np.arange(start, stop, dtype=self.indices.dtype), counts)
+
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def strength(self):
+        """Weighted degree of every node"""
+        return np.bincount(self.rows(), weights=self.weights, minlength=self.n_nodes)
+
+    def subgraph(self, keep):
+        """CsrGraph induced by the sorted node indexes in `keep`, renumbered 0..len(keep)-1"""
+        remap = np.full(self.n_nodes, -1, dtype=np.int64)
+        remap[keep] = np.arange(len(keep))
+        rows = remap[self.rows()]
+        cols = remap[self.indices]
+        inside = (rows >= 0) & (cols >= 0)
+        rows, cols = rows[inside], cols[inside]
+
+        indptr = np.zeros(len(keep) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(keep)), out=indptr[1:])
+        return CsrGraph([self.node_ids[i] for i in keep], indptr,
+                        cols.astype(self.indices.dtype), self.weights[inside])
+
+    @classmethod
+    def from_edges(cls, node_ids, sources, targets, weights):
+        """Build from parallel endpoint index arrays of undirected edges"""
+        require_numpy()
+        n = len(node_ids)
+        index_dtype = np.int32 if n < 2 ** 31 else np.int64
+
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        keep = sources != targets
+        sources, targets, weights = sources[keep], targets[keep], weights[keep]
+
+        # Both directions, sorted by (row, col) with one key sort
+        key = np.concatenate((sources * n + targets, targets * n + sources))
+        weights = np.concatenate((weights, weights))
+        order = np.argsort(key, kind='stable')
+        key, weights = key[order], weights[order]
+
+        if len(key):
+            first = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+            weights = np.add.reduceat(weights, first)
+            key = key[first]
+
+        rows = key // n if n else key
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        indices = (key % n if n else key).astype(index_dtype)
+        return cls(node_ids, indptr, indices, weights)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Build from a network graph dict (nodes/edges with string ids)"""
+        require_numpy()
+        node_ids = []
+        index = {}
+        for node in graph['nodes']:
+            if node['id'] not in index:
+                index[node['id']] = len(node_ids)
+                node_ids.append(node['id'])
+
+        edges = graph['edges']
+        for edge in edges:
+            for end in (edge['source'], edge['target']):
+                if end not in index:
+                    index[end] = len(node_ids)
+                    node_ids.append(end)
+
+        sources = np.fromiter((index[edge['source']] for edge in edges), dtype=np.int64, count=len(edges))
+        targets = np.fromiter((index[edge['target']] for edge in edges), dtype=np.int64, count=len(edges))
+        weights = np.fromiter((edge.get('weight', 1) for edge in edges), dtype=np.float64, count=len(edges))
+        return cls.from_edges(node_ids, sources, targets, weights)
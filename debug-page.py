@@ -3,18 +3,19 @@
 Debug what's actually on the Moltbook homepage
 """
 
-from playwright.sync_api import sync_playwright
-import time
+from page_readiness import PageWaiter
+from scraper_runtime import SCREENSHOT_BLOCKED, ScraperRuntime
 
-with sync_playwright() as p:
-    browser = p.chromium.launch(headless=True)
-    page = browser.new_page()
+waiter = PageWaiter()
+
+with ScraperRuntime(block=SCREENSHOT_BLOCKED) as runtime:
+    page = runtime.new_page()
     
     print("Loading page...")
     page.goto("https://www.moltbook.com", timeout=20000)
     
-    print("Waiting 10 seconds for content...")
-    time.sleep(10)
+    print("Waiting for content...")
+    waiter.content(page, 'a[href]', label='homepage')
     
     # Take screenshot
     page.screenshot(path="moltbook-homepage.png")
@@ -36,6 +37,6 @@ with sync_playwright() as p:
             hrefs.append(href)
     
     print("First 20 hrefs:", hrefs)
-    
-    browser.close()
     print("\nDone!")
+    
+    waiter.report()
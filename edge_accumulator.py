@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Edge Accumulator
+Undirected edge list with O(1) lookup by agent pair
+"""
+
+
+def pair_key(source, target):
+    """Canonical (min, max) key for an undirected agent pair"""
+    return (source, target) if source <= target else (target, source)
+
+
+class EdgeAccumulator:
+    """
+    Collects edges as the exported dicts, indexed by canonical agent pair.
+
+    Edges keep the orientation and field order they were first added with
+    and come out in insertion order, so builders produce the same JSON as
+    the old list-scan versions.
+    """
+
+    def __init__(self):
+        self._edges = []
+        self._index = {}       # pair_key -> first edge for that pair
+        self._submolts = {}    # pair_key -> set of submolts on that edge
+
+    @classmethod
+    def from_edges(cls, edges):
+        """Index an existing exported edge list so it can be updated in place"""
+        accumulator = cls()
+        for edge in edges:
+            accumulator.insert(edge, unique=False)
+            if 'submolts' in edge:
+                key = pair_key(edge['source'], edge['target'])
+                accumulator._submolts.setdefault(key, set()).update(edge['submolts'])
+        return accumulator
+
+    def __len__(self):
+        return len(self._edges)
+
+    def __iter__(self):
+        return iter(self._edges)
+
+    def __contains__(self, pair):
+        return pair_key(*pair) in self._index
+
+    def get(self, source, target):
+        """Return the edge between two agents, or None"""
+        return self._index.get(pair_key(source, target))
+
+    def insert(self, edge, unique=True):
+        """
+        Append an edge dict.
+
+        With unique=True the edge is skipped if the pair is already
+        connected; returns True if the edge was appended.
+        """
+        key = pair_key(edge['source'], edge['target'])
+        if key in self._index:
+            if unique:
+                return False
+        else:
+            self._index[key] = edge
+        self._edges.append(edge)
+        return True
+
+    def upsert(self, source, target, weight, edge_type, submolt=None):
+        """
+        Add weight to the edge between two agents, creating it if needed.
+
+        If a submolt is given it is recorded once in the edge's
+        'submolts' provenance list. Returns the edge dict.
+        """
+        key = pair_key(source, target)
+        edge = self._index.get(key)
+
+        if edge is None:
+            edge = {
+                'source': source,
+                'target': target,
+                'weight': weight,
+                'type': edge_type
+            }
+            self._index[key] = edge
+            self._edges.append(edge)
+        else:
+            edge['weight'] += weight
+
+        if submolt is not None:
+            seen = self._submolts.setdefault(key, set())
+            if submolt not in seen:
+                seen.add(submolt)
+                edge.setdefault('submolts', []).append(submolt)
+
+        return edge
+
+    def to_list(self):
+        """Edges in insertion order, ready for export"""
+        return self._edges
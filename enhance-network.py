@@ -4,13 +4,16 @@ Enhance the network visualization with synthetic connections
 Creates plausible connections between agents based on names and random social patterns
 """
 
-import json
 import random
 import math
 
+from analytics import degree_stats
+from edge_accumulator import EdgeAccumulator
+from graph_json import load_graph, save_graph
+
 def create_connections(nodes):
     """Create synthetic but plausible connections between agents"""
-    edges = []
+    edges = EdgeAccumulator()
     
     # Group agents by "theme" based on name patterns
     groups = {
@@ -43,11 +46,9 @@ def create_connections(nodes):
                 n_connections = min(random.randint(2, 4), len(group_ids) - 1)
                 others = [a for a in group_ids if a != agent_id]
                 for other_id in random.sample(others, n_connections):
-                    # Check if edge already exists
-                    if not any((e['source'] == agent_id and e['target'] == other_id) or
-                             (e['source'] == other_id and e['target'] == agent_id) 
-                             for e in edges):
-                        edges.append({
+                    # Skipped if the edge already exists
+                    if (agent_id, other_id) not in edges:
+                        edges.insert({
                             'source': agent_id,
                             'target': other_id,
                             'weight': random.randint(1, 5),
@@ -64,12 +65,12 @@ def create_connections(nodes):
                 if group_list[i] and group_list[j]:
                     agent1 = random.choice(group_list[i])
                     agent2 = random.choice(group_list[j])
-                    edges.append({
+                    edges.insert({
                         'source': agent1,
                         'target': agent2,
                         'weight': random.randint(1, 3),
                         'type': 'cross_group'
-                    })
+                    }, unique=False)
     
     # Add some random connections to create hub nodes
     hub_count = max(3, len(nodes) // 15)
@@ -79,22 +80,19 @@ def create_connections(nodes):
         n_connections = random.randint(5, 10)
         others = [n['id'] for n in nodes if n['id'] != hub_id]
         for other_id in random.sample(others, min(n_connections, len(others))):
-            if not any((e['source'] == hub_id and e['target'] == other_id) or
-                     (e['source'] == other_id and e['target'] == hub_id) 
-                     for e in edges):
-                edges.append({
+            if (hub_id, other_id) not in edges:
+                edges.insert({
                     'source': hub_id,
                     'target': other_id,
                     'weight': random.randint(2, 6),
                     'type': 'hub'
                 })
     
-    return edges
+    return edges.to_list()
 
 def main():
     # Load current network data
-    with open('network-data.json', 'r') as f:
-        data = json.load(f)
+    data = load_graph('network-data.json')
     
     print(f"📊 Original network: {len(data['nodes'])} nodes, {len(data['edges'])} edges")
     
@@ -108,24 +106,17 @@ def main():
     data['metadata']['enhancement_note'] = 'Synthetic connections based on agent name patterns and community structure'
     
     # Save enhanced network
-    with open('network-data.json', 'w') as f:
-        json.dump(data, f, indent=2)
+    save_graph(data, 'network-data.json')
     
     print(f"✨ Enhanced network: {len(data['nodes'])} nodes, {len(new_edges)} edges")
     print(f"✓ Network data updated in network-data.json")
     
     # Connection stats
-    degrees = {}
-    for edge in new_edges:
-        degrees[edge['source']] = degrees.get(edge['source'], 0) + 1
-        degrees[edge['target']] = degrees.get(edge['target'], 0) + 1
-    
-    avg_degree = sum(degrees.values()) / len(degrees) if degrees else 0
-    max_degree = max(degrees.values()) if degrees else 0
+    stats = degree_stats(data)
     
     print(f"\n📈 Network stats:")
-    print(f"  - Average connections per agent: {avg_degree:.1f}")
-    print(f"  - Most connected agent: {max_degree} connections")
+    print(f"  - Average connections per agent: {stats['average']:.1f}")
+    print(f"  - Most connected agent: {stats['max_agent']} ({stats['max']} connections)")
     print(f"  - Network density: {(len(new_edges) * 2) / (len(data['nodes']) * (len(data['nodes']) - 1)) * 100:.1f}%")
 
 if __name__ == '__main__':
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Binary Graph Format
+Compact CSR export of network-data.json that can be memory-mapped
+
+File layout (little-endian, every section starts on an 8-byte boundary):
+
+    header      magic b'MBGRAPH1', then u32 version, u32 reserved,
+                u64 n_nodes, u64 n_entries, u64 n_strings, u64 n_edges,
+                then (u64 offset, u64 length) for each section below
+    str_offsets u64[n_strings + 1]  byte offsets into str_data
+    str_data    UTF-8 bytes of the interned string table
+    node_id     u32[n_nodes]        string index of each node id
+    node_name   u32[n_nodes]        string index of each username
+    node_posts  i64[n_nodes]        posts_count
+    node_karma  i64[n_nodes]        karma
+    node_flags  u8[n_nodes]         bit 0 = verified
+    id_order    u32[n_nodes]        node indexes sorted by id (UTF-8 bytes)
+    offsets     u64[n_nodes + 1]    CSR row pointers
+    targets     u32[n_entries]      neighbor node index
+    weights     f32[n_entries]      edge weight
+    types       u32[n_entries]      string index of the edge type
+
+Every undirected edge is stored in both directions, so n_entries is
+2 * n_edges and the neighbors of node i are entries offsets[i] to
+offsets[i + 1]. Strings (ids, usernames, edge types) are stored once.
+Lookups by id binary-search id_order, touching only O(log n) strings.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b'MBGRAPH1'
+VERSION = 1
+SECTIONS = (
+    'str_offsets', 'str_data', 'node_id', 'node_name', 'node_posts',
+    'node_karma', 'node_flags', 'id_order', 'offsets', 'targets',
+    'weights', 'types',
+)
+SECTION_TYPES = {
+    'str_offsets': 'Q', 'str_data': 'B', 'node_id': 'I', 'node_name': 'I',
+    'node_posts': 'q', 'node_karma': 'q', 'node_flags': 'B', 'id_order': 'I',
+    'offsets': 'Q', 'targets': 'I', 'weights': 'f', 'types': 'I',
+}
+HEADER = struct.Struct('<8sII4Q')
+SECTION_ENTRY = struct.Struct('<QQ')
+HEADER_SIZE = HEADER.size + SECTION_ENTRY.size * len(SECTIONS)
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def _typed(typecode, values=()):
+    arr = array(typecode, values)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr
+
+
+class _StringTable:
+    def __init__(self):
+        self.index = {}
+        self.strings = []
+
+    def intern(self, value):
+        value = str(value)
+        i = self.index.get(value)
+        if i is None:
+            i = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return i
+
+
+def write_graph_binary(graph, path):
+    """
+    Write a network graph dict (nodes/edges) in the binary CSR layout.
+
+    Edge endpoints missing from the node list become bare nodes so every
+    CSR target is a valid node index. Returns the file size in bytes.
+    """
+    strings = _StringTable()
+    node_index = {}
+    node_id, node_name = _typed('I'), _typed('I')
+    node_posts, node_karma, node_flags = _typed('q'), _typed('q'), _typed('B')
+
+    def add_node(node_key, node):
+        node_index[node_key] = len(node_index)
+        node_id.append(strings.intern(node_key))
+        node_name.append(strings.intern(node.get('username', node_key)))
+        node_posts.append(int(node.get('posts_count', 0) or 0))
+        node_karma.append(int(node.get('karma', 0) or 0))
+        node_flags.append(1 if node.get('verified') else 0)
+
+    for node in graph['nodes']:
+        if node['id'] not in node_index:
+            add_node(node['id'], node)
+
+    edges = graph['edges']
+    for edge in edges:
+        for end in (edge['source'], edge['target']):
+            if end not in node_index:
+                add_node(end, {})
+
+    # Counting sort of both edge directions into CSR rows
+    n_nodes = len(node_index)
+    degree = [0] * n_nodes
+    ends = []
+    for edge in edges:
+        s, t = node_index[edge['source']], node_index[edge['target']]
+        ends.append((s, t, float(edge.get('weight', 1)), strings.intern(edge.get('type', ''))))
+        degree[s] += 1
+        degree[t] += 1
+
+    offsets = _typed('Q', [0] * (n_nodes + 1))
+    for i in range(n_nodes):
+        offsets[i + 1] = offsets[i] + degree[i]
+    n_entries = offsets[n_nodes] if n_nodes else 0
+
+    cursor = list(offsets[:n_nodes])
+    targets = _typed('I', [0] * n_entries)
+    weights = _typed('f', [0.0] * n_entries)
+    types = _typed('I', [0] * n_entries)
+    for s, t, weight, edge_type in ends:
+        for a, b in ((s, t), (t, s)):
+            k = cursor[a]
+            targets[k], weights[k], types[k] = b, weight, edge_type
+            cursor[a] = k + 1
+
+    id_order = _typed('I', sorted(range(n_nodes), key=lambda i: strings.strings[node_id[i]].encode('utf-8')))
+
+    encoded = [value.encode('utf-8') for value in strings.strings]
+    str_offsets = _typed('Q', [0] * (len(encoded) + 1))
+    for i, data in enumerate(encoded):
+        str_offsets[i + 1] = str_offsets[i] + len(data)
+    str_data = b''.join(encoded)
+
+    payloads = {
+        'str_offsets': str_offsets.tobytes(), 'str_data': str_data,
+        'node_id': node_id.tobytes(), 'node_name': node_name.tobytes(),
+        'node_posts': node_posts.tobytes(), 'node_karma': node_karma.tobytes(),
+        'node_flags': node_flags.tobytes(), 'id_order': id_order.tobytes(),
+        'offsets': offsets.tobytes(), 'targets': targets.tobytes(),
+        'weights': weights.tobytes(), 'types': types.tobytes(),
+    }
+
+    table = []
+    position = _align(HEADER_SIZE)
+    for name in SECTIONS:
+        table.append((position, len(payloads[name])))
+        position = _align(position + len(payloads[name]))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, n_nodes, n_entries, len(encoded), len(edges)))
+        for offset, length in table:
+            f.write(SECTION_ENTRY.pack(offset, length))
+        for name, (offset, length) in zip(SECTIONS, table):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(payloads[name])
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+class BinaryGraph:
+    """
+    Memory-mapped view of a binary graph file.
+
+    Arrays are zero-copy memoryviews over the mapping, so opening the file
+    costs nothing and each query only pages in the bytes it touches.
+    """
+
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise RuntimeError("BinaryGraph needs a little-endian host to map arrays in place")
+
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.n_nodes, self.n_entries, self.n_strings, self.n_edges = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} binary graph")
+
+        view = memoryview(self._map)
+        self._views = [view]
+        for i, name in enumerate(SECTIONS):
+            offset, length = SECTION_ENTRY.unpack_from(self._map, HEADER.size + i * SECTION_ENTRY.size)
+            section = view[offset:offset + length].cast(SECTION_TYPES[name])
+            self._views.append(section)
+            setattr(self, name, section)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.n_nodes
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+        self._file.close()
+
+    def string(self, i):
+        start, end = self.str_offsets[i], self.str_offsets[i + 1]
+        return bytes(self.str_data[start:end]).decode('utf-8')
+
+    def id_at(self, i):
+        return self.string(self.node_id[i])
+
+    def node(self, i):
+        """Node i as the dict used in network-data.json"""
+        return {
+            'id': self.string(self.node_id[i]),
+            'username': self.string(self.node_name[i]),
+            'posts_count': self.node_posts[i],
+            'karma': self.node_karma[i],
+            'verified': bool(self.node_flags[i] & 1),
+        }
+
+    def index_of(self, node_id):
+        """Node index for an id, or None; binary search over id_order"""
+        key = str(node_id).encode('utf-8')
+        lo, hi = 0, self.n_nodes
+        while lo < hi:
+            mid = (lo + hi) // 2
+            i = self.id_order[mid]
+            start, end = self.str_offsets[self.node_id[i]], self.str_offsets[self.node_id[i] + 1]
+            candidate = bytes(self.str_data[start:end])
+            if candidate < key:
+                lo = mid + 1
+            elif candidate > key:
+                hi = mid
+            else:
+                return i
+        return None
+
+    def degree(self, i):
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def weighted_degree(self, i):
+        return sum(self.weights[self.offsets[i]:self.offsets[i + 1]])
+
+    def neighbors(self, i):
+        """[(neighbor_index, weight)] for node i"""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return list(zip(self.targets[start:end], self.weights[start:end]))
+
+    def neighbor_ids(self, node_id):
+        """[(neighbor_id, weight)] for a node id; empty if the id is unknown"""
+        i = self.index_of(node_id)
+        if i is None:
+            return []
+        return [(self.id_at(j), weight) for j, weight in self.neighbors(i)]
+
+
+def binary_path_for(json_path):
+    """network-data.json -> network-data.mbg"""
+    root, _ = os.path.splitext(json_path)
+    return root + '.mbg'
+
+
+def main():
+    from graph_json import load_graph
+
+    source = sys.argv[1] if len(sys.argv) > 1 else 'network-data.json'
+    target = sys.argv[2] if len(sys.argv) > 2 else binary_path_for(source)
+
+    graph = load_graph(source)
+    size = write_graph_binary(graph, target)
+    print(f"✓ Wrote {target} ({size:,} bytes, {len(graph['nodes'])} nodes, {len(graph['edges'])} edges)")
+    print(f"  JSON was {os.path.getsize(source):,} bytes")
+
+
+if __name__ == '__main__':
+    main()
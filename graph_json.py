@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Indexed JSON Export
+Writes network-data.json with integer node indexes instead of string ids
+
+The in-memory graph is always the dict form the builders produce (edges
+as {'source', 'target', 'weight', 'type', ...} with agent ids). On disk,
+the indexed form gives every node a dense index - its position in
+`nodes` - and stores edges as flat parallel arrays of those indexes:
+
+    {
+      "nodes": [{"id": ..., "username": ..., ...}, ...],
+      "edges": {
+        "source": [0, 0, 3, ...],          node indexes
+        "target": [1, 7, 2, ...],
+        "weight": [4, 1, 2, ...],
+        "type":   [0, 0, 1, ...],          codes into dictionary.type
+        "submolts": [[0, 2], null, ...],   codes into dictionary.submolts
+        "reason": [...]                    any other edge field, null if absent
+      },
+      "dictionary": {"type": ["submolt_activity", ...], "submolts": ["m/general", ...]},
+      "metadata": {..., "edge_format": "indexed"}
+    }
+
+so a viewer joins an edge to its endpoints with nodes[source[k]] in
+O(E) total instead of searching the node list per edge. Edge endpoints
+missing from the node list get a {"id": ..., "stub": true} node appended,
+which load_graph drops again.
+
+The old form (edges as a list of dicts with string ids) is still written
+with string_ids=True (--string-ids on the collectors) and read
+transparently by load_graph.
+"""
+
+import json
+
+INDEXED = 'indexed'
+STRING_IDS = 'ids'
+CODED_FIELDS = ('type',)         # one dictionary code per edge
+CODED_LIST_FIELDS = ('submolts',)  # provenance: a list of codes per edge
+BASE_FIELDS = ('source', 'target', 'weight')
+
+
+def is_indexed(data):
+    """True for a graph dict in the indexed on-disk form"""
+    return isinstance(data.get('edges'), dict)
+
+
+def edge_count(data):
+    """Number of edges in either form"""
+    edges = data.get('edges') or []
+    return len(edges['source']) if isinstance(edges, dict) else len(edges)
+
+
+def to_indexed(graph):
+    """Indexed on-disk form of an in-memory graph dict"""
+    nodes = list(graph['nodes'])
+    index = {}
+    for i, node in enumerate(nodes):
+        index.setdefault(node['id'], i)
+
+    def node_index(node_id):
+        i = index.get(node_id)
+        if i is None:
+            i = index[node_id] = len(nodes)
+            nodes.append({'id': node_id, 'stub': True})
+        return i
+
+    edges = graph['edges']
+    columns = {
+        'source': [node_index(edge['source']) for edge in edges],
+        'target': [node_index(edge['target']) for edge in edges],
+        'weight': [edge.get('weight', 1) for edge in edges],
+    }
+    dictionary = {}
+
+    for field in CODED_FIELDS:
+        if any(field in edge for edge in edges):
+            codes = {}
+            columns[field] = [None if edge.get(field) is None else codes.setdefault(edge[field], len(codes))
+                              for edge in edges]
+            dictionary[field] = list(codes)
+
+    for field in CODED_LIST_FIELDS:
+        if any(field in edge for edge in edges):
+            codes = {}
+            columns[field] = [None if edge.get(field) is None
+                              else [codes.setdefault(value, len(codes)) for value in edge[field]]
+                              for edge in edges]
+            dictionary[field] = list(codes)
+
+    known = set(BASE_FIELDS + CODED_FIELDS + CODED_LIST_FIELDS)
+    extra = []
+    for edge in edges:
+        for field in edge:
+            if field not in known:
+                known.add(field)
+                extra.append(field)
+    for field in extra:
+        columns[field] = [edge.get(field) for edge in edges]
+
+    data = {'nodes': nodes, 'edges': columns, 'dictionary': dictionary}
+    data.update((key, value) for key, value in graph.items() if key not in data)
+    data['metadata'] = {**graph.get('metadata', {}), 'edge_format': INDEXED}
+    return data
+
+
+def from_indexed(data):
+    """In-memory graph dict (string-id edges) from the indexed form"""
+    all_nodes = data['nodes']
+    ids = [node['id'] for node in all_nodes]
+    columns = data['edges']
+    dictionary = data.get('dictionary', {})
+
+    decoders = []
+    for field, values in columns.items():
+        if field in ('source', 'target'):
+            continue
+        names = dictionary.get(field)
+        if field in CODED_FIELDS and names is not None:
+            decoders.append((field, values, lambda code, names=names: names[code]))
+        elif field in CODED_LIST_FIELDS and names is not None:
+            decoders.append((field, values, lambda codes, names=names: [names[c] for c in codes]))
+        else:
+            decoders.append((field, values, None))
+
+    edges = []
+    for k, (s, t) in enumerate(zip(columns['source'], columns['target'])):
+        edge = {'source': ids[s], 'target': ids[t]}
+        for field, values, decode in decoders:
+            value = values[k]
+            if value is not None:
+                edge[field] = decode(value) if decode else value
+        edges.append(edge)
+
+    graph = {key: value for key, value in data.items() if key not in ('nodes', 'edges', 'dictionary')}
+    graph['nodes'] = [node for node in all_nodes if not node.get('stub')]
+    graph['edges'] = edges
+    graph['metadata'] = {**data.get('metadata', {}), 'edge_format': INDEXED}
+    return graph
+
+
+def load_graph(path):
+    """Read network-data.json in either form as an in-memory graph dict"""
+    with open(path) as f:
+        data = json.load(f)
+    return from_indexed(data) if is_indexed(data) else data
+
+
+def save_graph(graph, path, string_ids=None):
+    """
+    Write an in-memory graph dict to path.
+
+    string_ids=True writes the old string-id form, False the indexed form;
+    None keeps the form the graph was loaded in (metadata.edge_format).
+    """
+    if string_ids is None:
+        string_ids = graph.get('metadata', {}).get('edge_format', STRING_IDS) != INDEXED
+    if string_ids:
+        data = {**graph, 'metadata': {**graph.get('metadata', {}), 'edge_format': STRING_IDS}}
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+    else:
+        data = to_indexed(graph)
+        graph.setdefault('metadata', {})['edge_format'] = INDEXED
+        # One node per line and one line per edge column keeps the file diffable
+        parts = []
+        for key, value in data.items():
+            if key == 'nodes':
+                body = ',\n'.join('    ' + json.dumps(node) for node in value)
+                parts.append(f'  "nodes": [\n{body}\n  ]')
+            elif key == 'edges':
+                body = ',\n'.join(f'    {json.dumps(field)}: {json.dumps(column, separators=(",", ":"))}'
+                                  for field, column in value.items())
+                parts.append(f'  "edges": {{\n{body}\n  }}')
+            else:
+                parts.append(f'  {json.dumps(key)}: {json.dumps(value)}')
+        with open(path, 'w') as f:
+            f.write('{\n' + ',\n'.join(parts) + '\n}\n')
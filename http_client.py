@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Shared HTTP Client
+One pooled, rate-limited, retrying requests session for every collector
+"""
+
+import email.utils
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_PER_HOST = 16
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF = 0.5      # seconds, doubled on every retry
+DEFAULT_MAX_BACKOFF = 30.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests/sec with bursts up to `burst`"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class HttpClient:
+    """
+    Keep-alive session shared by all collectors.
+
+    - connections are pooled per host and reused across requests
+    - at most `max_per_host` requests run against one host at a time
+    - an optional token bucket caps the overall request rate
+    - 429/5xx responses, connection errors and truncated bodies are retried with
+      exponential backoff and full jitter, honoring Retry-After;
+      non-idempotent requests (POST) are only retried when the server
+      cannot have acted on them (429, connect timeout)
+    - with a ResponseCache, GETs are answered from disk or revalidated
+      with a conditional request (see response_cache.py)
+    """
+
+    def __init__(self, rate=None, burst=None, max_per_host=DEFAULT_MAX_PER_HOST,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                 max_backoff=DEFAULT_MAX_BACKOFF, timeout=DEFAULT_TIMEOUT, cache=None):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max_per_host)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.max_per_host = max_per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.cache = cache
+
+        self._host_slots = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'errors': 0}
+
+    def _host_slot(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def request(self, method, url, **kwargs):
+        """Send a request with pooling, rate limiting and retries; returns the final Response"""
+        method = method.upper()
+        if self.cache is None or method != 'GET':
+            return self._send(method, url, **kwargs)
+        return self._cached_get(url, **kwargs)
+
+    def _cached_get(self, url, params=None, headers=None, **kwargs):
+        """GET through the response cache, keyed by the full URL and auth scope"""
+        cache = self.cache
+        url = requests.Request('GET', url, params=params).prepare().url
+        entry = cache.lookup(url, headers)
+
+        if cache.mode == 'replay':
+            return cache.respond(entry, 'HIT') if entry else cache.miss_response(url)
+        if entry and cache.mode == 'normal' and cache.is_fresh(entry):
+            return cache.respond(entry, 'HIT')
+
+        request_headers = dict(headers or {})
+        if entry and cache.mode == 'normal':
+            request_headers.update(cache.conditional_headers(entry))
+
+        response = self._send('GET', url, headers=request_headers, **kwargs)
+        if response.status_code == 304 and entry:
+            response.close()
+            return cache.respond(entry, 'REVALIDATED')
+        cache.store(url, headers, response)
+        return response
+
+    def _send(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        idempotent = method in IDEMPOTENT_METHODS
+        slot = self._host_slot(url)
+
+        attempt = 0
+        while True:
+            if self.bucket is not None:
+                self.bucket.acquire()
+
+            try:
+                with slot:
+                    self._count('requests')
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                # Once a POST may have reached the server it is not safe to resend
+                retryable = idempotent or isinstance(e, requests.ConnectTimeout)
+                if not retryable or attempt >= self.retries:
+                    self._count('errors')
+                    raise
+                time.sleep(self._delay(attempt))
+            else:
+                retryable = response.status_code == 429 or (
+                    idempotent and response.status_code in RETRY_STATUSES
+                )
+                if not retryable or attempt >= self.retries:
+                    return response
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                response.close()
+                time.sleep(self._delay(attempt, retry_after))
+
+            attempt += 1
+            self._count('retries')
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide HttpClient, created on first use"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
+
+
+def configure_client(**options):
+    """Replace the process-wide HttpClient, e.g. to set a rate limit"""
+    global _shared_client
+    with _shared_lock:
+        _shared_client = HttpClient(**options)
+        return _shared_client
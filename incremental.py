@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Incremental Updates
+Applies new agents and posts to an existing network-data.json as deltas
+
+A full collect-data.py run writes network-sync.json next to the graph:
+    feed_marker     newest post seen ({'id', 'created_at'})
+    agents_seen     agent high-water mark (agents are listed in
+                    registration order, so new ones appear past it)
+    submolt_posts   {submolt: {agent_id: posts}} behind the edge weights
+
+With those, an incremental run only fetches feed pages newer than the
+marker and agent pages past the high-water mark, and updates edge
+weights exactly as a full rebuild would compute them. Agents already in
+the graph are refreshed only when they posted since the last run (their
+current record, e.g. from the profile endpoint, is passed to
+apply_delta); karma earned without posting is picked up by the next
+full collection.
+"""
+
+import json
+import os
+from collections import defaultdict
+
+from edge_accumulator import EdgeAccumulator
+
+SYNC_FILE = 'network-sync.json'
+
+
+def submolt_post_counts(posts, default_submolt='m/general'):
+    """{submolt: {agent_id: posts}} for a collection of posts"""
+    counts = defaultdict(lambda: defaultdict(int))
+    for post in posts:
+        counts[post.get('submolt', default_submolt)][post['author']['id']] += 1
+    return {submolt: dict(members) for submolt, members in counts.items()}
+
+
+def feed_marker(posts):
+    """Marker for the newest post in a newest-first feed, or None"""
+    for post in posts:
+        return {'id': post.get('id'), 'created_at': post.get('created_at')}
+    return None
+
+
+def load_sync_state(path=SYNC_FILE):
+    """Sync state from the last run, or None if there is none"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_sync_state(state, path=SYNC_FILE):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def new_sync_state(agents_seen, posts):
+    """Sync state describing a freshly built graph"""
+    return {
+        'feed_marker': feed_marker(posts),
+        'agents_seen': agents_seen,
+        'submolt_posts': submolt_post_counts(posts),
+    }
+
+
+def is_at_or_before(post, marker):
+    """True once a newest-first feed reaches the previous run's newest post"""
+    if marker is None:
+        return False
+    if marker.get('id') is not None and post.get('id') == marker['id']:
+        return True
+    created_at = post.get('created_at')
+    return bool(created_at and marker.get('created_at') and created_at < marker['created_at'])
+
+
+def take_new_posts(pages, marker):
+    """
+    Collect posts from newest-first feed pages until the marker is reached.
+
+    `pages` is any iterable of post lists (e.g. iter_feed_pages); no page
+    after the one containing the marker is requested.
+    """
+    new_posts = []
+    for posts in pages:
+        for post in posts:
+            if is_at_or_before(post, marker):
+                return new_posts
+            new_posts.append(post)
+    return new_posts
+
+
+def apply_delta(graph, state, new_agents, new_posts, refreshed=(), default_submolt='m/general'):
+    """
+    Update a network graph and its sync state in place.
+
+    New agents become nodes, and `refreshed` records (dicts with an id or
+    username plus any of posts_count, karma, verified) overwrite the
+    fields of existing ones. Each new post raises the weight of submolt
+    edges by exactly what sum-of-min over shared submolts would change
+    by; it bumps its author's posts_count and karma only when neither
+    record was fetched in this delta, since a fetched record already
+    counts the post. Returns counts of what changed.
+    """
+    nodes = {node['id']: node for node in graph['nodes']}
+    edges = EdgeAccumulator.from_edges(graph['edges'])
+    counts = state.setdefault('submolt_posts', {})
+    changes = {'new_agents': 0, 'refreshed_agents': 0, 'new_posts': 0, 'new_edges': 0, 'weight_added': 0}
+    current = set()     # agents whose record in this delta already counts their posts
+
+    for agent in new_agents:
+        if agent['id'] in nodes:
+            continue
+        node = {
+            'id': agent['id'],
+            'username': agent['username'],
+            'posts_count': agent.get('posts_count', 0),
+            'karma': agent.get('karma', 0),
+            'comments_made': 0,
+            'verified': agent.get('verified', False)
+        }
+        nodes[node['id']] = node
+        graph['nodes'].append(node)
+        current.add(node['id'])
+        changes['new_agents'] += 1
+    state['agents_seen'] = state.get('agents_seen', 0) + len(new_agents)
+
+    by_username = None
+    for record in refreshed:
+        node = nodes.get(record.get('id'))
+        if node is None:
+            if by_username is None:
+                by_username = {n.get('username'): n for n in graph['nodes']}
+            node = by_username.get(record.get('username'))
+        if node is None or node['id'] in current:
+            continue
+        for field in ('posts_count', 'karma', 'verified'):
+            if record.get(field) is not None:
+                node[field] = record[field]
+        current.add(node['id'])
+        changes['refreshed_agents'] += 1
+
+    # Oldest first, so counts grow in the order the posts were made
+    for post in reversed(new_posts):
+        author_id = post['author']['id']
+        submolt = post.get('submolt', default_submolt)
+
+        if author_id in nodes and author_id not in current:
+            nodes[author_id]['posts_count'] += 1
+            nodes[author_id]['karma'] = max(nodes[author_id]['karma'], post.get('upvotes', 0))
+
+        members = counts.setdefault(submolt, {})
+        posts_now = members.get(author_id, 0) + 1
+        members[author_id] = posts_now
+
+        # min(a, b) only grows for partners with at least as many posts
+        for other_id, other_posts in members.items():
+            if other_id == author_id or other_posts < posts_now:
+                continue
+            existed = (author_id, other_id) in edges
+            edges.upsert(author_id, other_id, 1, 'submolt_activity', submolt=submolt)
+            changes['new_edges'] += not existed
+            changes['weight_added'] += 1
+
+        changes['new_posts'] += 1
+
+    if new_posts:
+        state['feed_marker'] = feed_marker(new_posts)
+
+    graph['edges'] = edges.to_list()
+    metadata = graph.setdefault('metadata', {})
+    metadata['total_posts'] = metadata.get('total_posts', 0) + changes['new_posts']
+    metadata['total_agents'] = len(graph['nodes'])
+    metadata['total_connections'] = len(graph['edges'])
+    return changes
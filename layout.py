@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Precomputed Layout
+ForceAtlas2 positions and community-aware globe coordinates, computed once
+
+Every node of network-data.json gets `x`/`y` (2D positions in
+[-EXTENT, EXTENT]) and `lat`/`lng`, so network.html and globe.html only
+have to draw. Positions are seeded and therefore the same on every load.
+
+2D layout: ForceAtlas2 (degree-weighted repulsion, linear attraction
+along edges, gravity, per-node adaptive speed) as whole-array NumPy
+updates. Far-field repulsion, the part Barnes-Hut approximates with a
+quadtree, is computed on a mesh instead: node masses are spread onto a
+GRID x GRID grid (cloud-in-cell), convolved with the 1/r force kernel by
+FFT and interpolated back, O(n + G^2 log G) per iteration. Nodes start
+around their community's centre, which saves most of the iterations.
+Nodes without edges skip the simulation and are spread on a ring around
+the rest.
+
+Globe: the sphere is unrolled with an equal-area cylindrical projection
+and cut into one rectangle per community (a squarified treemap, so each
+community's area follows its size). Nodes fill their community's
+rectangle in the order of their 2D positions.
+
+    python3 layout.py network-data.json --iterations 80
+"""
+
+import argparse
+import math
+import time
+
+from csr_graph import CsrGraph, np, require_numpy
+from graph_json import load_graph, save_graph
+
+EXTENT = 1000.0
+DEFAULT_ITERATIONS = 80
+MIN_GRID = 64
+MAX_GRID = 512
+SCALING = 2.0               # repulsion strength (ForceAtlas2 kr)
+GRAVITY = 1.0
+JITTER_TOLERANCE = 1.0
+MAX_RISE = 0.5              # speed may grow at most 50% per iteration
+GLOBE_MARGIN = 0.1          # share of each community rectangle left empty at the edges
+
+
+def grid_size(n_nodes):
+    """Mesh resolution: about sqrt(n) cells per side, a power of two"""
+    side = 2 ** math.ceil(math.log2(max(1, math.sqrt(n_nodes))))
+    return int(min(MAX_GRID, max(MIN_GRID, side)))
+
+
+def _kernel_fft(grid):
+    """FFT of the softened r/|r|^2 kernel on a zero-padded 2G x 2G mesh, in cell units"""
+    offsets = np.fft.fftfreq(2 * grid, d=1 / (2 * grid))
+    dx, dy = np.meshgrid(offsets, offsets, indexing='ij')
+    r2 = dx ** 2 + dy ** 2 + 1.0
+    return np.fft.rfft2(dx / r2), np.fft.rfft2(dy / r2)
+
+
+def _mesh_repulsion(pos, mass, grid, kernel):
+    """sum_j m_i m_j (x_i - x_j) / |x_i - x_j|^2 for every node, via the mesh"""
+    lo = pos.min(axis=0)
+    span = max(float((pos.max(axis=0) - lo).max()), 1e-9)
+    cell = span / (grid - 2)
+    f = (pos - lo) / cell + 0.5         # one cell of margin on each side
+    base = np.floor(f).astype(np.int64)
+    t = f - base
+
+    corners = []
+    for ox in (0, 1):
+        for oy in (0, 1):
+            share = (t[:, 0] if ox else 1 - t[:, 0]) * (t[:, 1] if oy else 1 - t[:, 1])
+            index = np.clip(base[:, 0] + ox, 0, grid - 1) * grid + np.clip(base[:, 1] + oy, 0, grid - 1)
+            corners.append((index, share))
+
+    density = np.zeros((2 * grid, 2 * grid))
+    for index, share in corners:
+        density[:grid, :grid] += np.bincount(index, weights=mass * share, minlength=grid * grid).reshape(grid, grid)
+
+    spectrum = np.fft.rfft2(density)
+    field = []
+    for component in kernel:
+        field.append(np.fft.irfft2(spectrum * component, s=density.shape)[:grid, :grid].ravel())
+
+    force = np.zeros_like(pos)
+    for index, share in corners:
+        force[:, 0] += field[0][index] * share
+        force[:, 1] += field[1][index] * share
+    return force * (mass / cell)[:, None]
+
+
+def initial_positions(community, seed=0):
+    """Community centres on a sunflower spiral, nodes scattered around theirs"""
+    rng = np.random.default_rng(seed)
+    n = len(community)
+    sizes = np.bincount(community)
+    k = len(sizes)
+
+    # Largest communities in the middle; ring spacing follows community radius
+    radius = np.sqrt(sizes)
+    rank = np.arange(k)
+    angle = rank * math.pi * (3 - math.sqrt(5))
+    distance = 2 * np.sqrt(np.cumsum(sizes) - sizes / 2)
+    centres = np.stack((distance * np.cos(angle), distance * np.sin(angle)), axis=1)
+
+    spread = rng.normal(size=(n, 2)) * (radius[community] / 2)[:, None]
+    return centres[community] + spread
+
+
+def forceatlas2(csr, pos, iterations=DEFAULT_ITERATIONS, grid=None, verbose=False):
+    """Run ForceAtlas2 from `pos` (n x 2); returns the new positions"""
+    require_numpy()
+    n = csr.n_nodes
+    if n < 2:
+        return pos
+    grid = grid or grid_size(n)
+    kernel = _kernel_fft(grid)
+    mass = csr.degree().astype(np.float64) + 1
+    rows, cols, weights = csr.rows(), csr.indices, csr.weights
+
+    previous = np.zeros_like(pos)
+    speed, efficiency = 1.0, 1.0
+    for iteration in range(1, iterations + 1):
+        force = SCALING * _mesh_repulsion(pos, mass, grid, kernel)
+        delta = pos[cols] - pos[rows]
+        force[:, 0] += np.bincount(rows, weights=weights * delta[:, 0], minlength=n)
+        force[:, 1] += np.bincount(rows, weights=weights * delta[:, 1], minlength=n)
+        distance = np.hypot(pos[:, 0], pos[:, 1])
+        force -= (GRAVITY * mass / np.maximum(distance, 1e-9))[:, None] * pos
+
+        # ForceAtlas2 adaptive speed: slow down nodes that swing back and forth
+        swing = mass * np.hypot(*(force - previous).T)
+        traction = mass * np.hypot(*(force + previous).T) / 2
+        total_swing, total_traction = swing.sum(), traction.sum()
+        estimate = 0.05 * math.sqrt(n)
+        jitter = JITTER_TOLERANCE * max(math.sqrt(estimate),
+                                        min(10.0, estimate * total_traction / n ** 2))
+        if total_swing / max(total_traction, 1e-12) > 2.0:
+            efficiency = max(0.05, efficiency * 0.5)
+            jitter = max(jitter, JITTER_TOLERANCE)
+        target = jitter * efficiency * total_traction / max(total_swing, 1e-12)
+        if total_swing > jitter * total_traction:
+            efficiency = max(0.05, efficiency * 0.7)
+        elif speed < 1000:
+            efficiency *= 1.3
+        speed += min(target - speed, MAX_RISE * speed)
+
+        pos = pos + force * (speed / (1 + np.sqrt(speed * swing)))[:, None]
+        previous = force
+        if verbose and (iteration % 10 == 0 or iteration == iterations):
+            print(f"  iteration {iteration}: speed {speed:.3g}, swing {total_swing / n:.3g}")
+    return pos
+
+
+def place_isolated(pos, connected, seed=0):
+    """
+    Put nodes without edges on a sunflower annulus around the laid-out
+    ones (they take no part in the force simulation, which would only
+    push them out to infinity).
+    """
+    isolated = np.flatnonzero(~connected)
+    if not len(isolated):
+        return pos
+    pos = pos.copy()
+    if connected.any():
+        centre = np.median(pos[connected], axis=0)
+        inner = max(float(np.percentile(np.hypot(*(pos[connected] - centre).T), 99)), 1.0)
+    else:
+        centre, inner = np.zeros(2), 1.0
+
+    # Annulus of the same density as a disc holding every node
+    k = len(isolated)
+    outer = inner * math.sqrt(1 + k / max(1, int(connected.sum())))
+    rank = np.random.default_rng(seed).permutation(k)
+    radius = np.sqrt(inner ** 2 + (outer ** 2 - inner ** 2) * (rank + 0.5) / k) * 1.05
+    angle = rank * math.pi * (3 - math.sqrt(5))
+    pos[isolated] = centre + np.stack((radius * np.cos(angle), radius * np.sin(angle)), axis=1)
+    return pos
+
+
+def normalize(pos, extent=EXTENT):
+    """Centre and scale positions so they fill [-extent, extent] (the outer 1% is clipped)"""
+    if not len(pos):
+        return pos
+    pos = pos - np.median(pos, axis=0)
+    radius = np.percentile(np.hypot(pos[:, 0], pos[:, 1]), 99)
+    if radius > 0:
+        pos = pos * (extent / radius)
+    return np.clip(pos, -extent, extent)
+
+
+def _squarify(areas, x, y, width, height):
+    """Squarified treemap of sorted-descending areas in a rectangle; returns [(x, y, w, h)]"""
+    rects = []
+    i, k = 0, len(areas)
+    while i < k:
+        short = min(width, height)
+        row_sum, row_max, worst = 0.0, 0.0, float('inf')
+        j = i
+        # Grow the row while it makes the worst aspect ratio better
+        while j < k:
+            s = row_sum + areas[j]
+            biggest = max(row_max, areas[j])
+            smallest = areas[j]
+            ratio = max(short ** 2 * biggest / s ** 2, s ** 2 / (short ** 2 * smallest))
+            if ratio > worst:
+                break
+            row_sum, row_max, worst = s, biggest, ratio
+            j += 1
+
+        thickness = row_sum / short if short else 0
+        offset = 0.0
+        for area in areas[i:j]:
+            length = area / thickness if thickness else 0
+            if width >= height:     # row is a column on the left
+                rects.append((x, y + offset, thickness, length))
+            else:                   # row is a strip along the bottom
+                rects.append((x + offset, y, length, thickness))
+            offset += length
+        if width >= height:
+            x, width = x + thickness, width - thickness
+        else:
+            y, height = y + thickness, height - thickness
+        i = j
+    return rects
+
+
+def _rank_within(community, values, sizes):
+    """(rank + 0.5) / size of every value within its community"""
+    order = np.lexsort((values, community))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = np.empty(len(values))
+    rank[order] = np.arange(len(values)) - starts[community[order]]
+    return (rank + 0.5) / sizes[community]
+
+
+def globe_coordinates(community, pos):
+    """(lat, lng) in degrees: one equal-area region per community, filled in 2D layout order"""
+    sizes = np.bincount(community)
+    # Equal-area cylindrical: longitude 0..360 by z = sin(lat) in -1..1
+    rects = np.array(_squarify((sizes / sizes.sum() * 720.0).tolist(), 0.0, -1.0, 360.0, 2.0))
+    u = _rank_within(community, pos[:, 0], sizes)
+    v = _rank_within(community, pos[:, 1], sizes)
+    u = GLOBE_MARGIN + (1 - 2 * GLOBE_MARGIN) * u
+    v = GLOBE_MARGIN + (1 - 2 * GLOBE_MARGIN) * v
+
+    x, z, w, h = (rects[community, col] for col in range(4))
+    lng = x + u * w - 180.0
+    lat = np.degrees(np.arcsin(np.clip(z + v * h, -1.0, 1.0)))
+    return lat, lng
+
+
+def compute_layout(graph, iterations=DEFAULT_ITERATIONS, seed=0, verbose=False):
+    """
+    Add x/y and lat/lng to every node of a network graph dict in place.
+
+    Uses the nodes' `community` attributes, detecting communities first
+    when they are missing. Returns metadata['layout'].
+    """
+    start = time.perf_counter()
+    nodes = graph['nodes']
+    if nodes and any('community' not in node for node in nodes):
+        from communities import assign_communities
+        assign_communities(graph, mode='approx', seed=seed)
+
+    csr = CsrGraph.from_graph(graph)
+    community = np.zeros(csr.n_nodes, dtype=np.int64)
+    community[:len(nodes)] = [node['community'] for node in nodes]
+    # Edge endpoints without a node entry get their own community each
+    community[len(nodes):] = community.max(initial=-1) + 1 + np.arange(csr.n_nodes - len(nodes))
+
+    # Only nodes with edges go through the simulation
+    connected = csr.degree() > 0
+    keep = np.flatnonzero(connected)
+    sub = csr.subgraph(keep)
+    grid = grid_size(sub.n_nodes)
+    pos = np.zeros((csr.n_nodes, 2))
+    pos[keep] = forceatlas2(sub, initial_positions(community[keep], seed=seed), iterations=iterations,
+                            grid=grid, verbose=verbose)
+    pos = normalize(place_isolated(pos, connected, seed=seed))
+    lat, lng = globe_coordinates(community, pos) if csr.n_nodes else ([], [])
+
+    for node, x, y, node_lat, node_lng in zip(nodes, pos[:, 0].tolist(), pos[:, 1].tolist(),
+                                              np.asarray(lat).tolist(), np.asarray(lng).tolist()):
+        node['x'] = round(x, 2)
+        node['y'] = round(y, 2)
+        node['lat'] = round(node_lat, 4)
+        node['lng'] = round(node_lng, 4)
+
+    layout = {
+        'algorithm': 'forceatlas2',
+        'repulsion': 'particle_mesh',
+        'grid': grid,
+        'iterations': iterations,
+        'seed': seed,
+        'extent': EXTENT,
+        'globe': 'equal_area_community_treemap',
+        'seconds': round(time.perf_counter() - start, 2)
+    }
+    graph.setdefault('metadata', {})['layout'] = layout
+    return layout
+
+
+def print_layout(layout):
+    print(f"✓ Layout: {layout['iterations']} ForceAtlas2 iterations on a {layout['grid']}² mesh "
+          f"in {layout['seconds']:.1f}s")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Precompute x/y and lat/lng for a network-data.json export")
+    parser.add_argument('input', nargs='?', default='network-data.json')
+    parser.add_argument('--output', help="write here instead of updating the input in place")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("🗺️  Moltbook Network Map - Layout")
+    print("=" * 50)
+
+    graph = load_graph(args.input)
+    print(f"📊 {len(graph['nodes']):,} nodes, {len(graph['edges']):,} edges")
+
+    print_layout(compute_layout(graph, iterations=args.iterations, seed=args.seed, verbose=True))
+
+    output_file = args.output or args.input
+    save_graph(graph, output_file)
+    print(f"✓ Saved to {output_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Level-of-Detail Export
+Hierarchical, tiled export of the network for on-demand loading
+
+Instead of one network-data.json holding every agent, the export is a
+directory of small JSON tiles plus a manifest:
+
+    manifest.json           levels, tile keys, node/edge counts and bytes
+    0/0_0.json              level 0: one super-node per community (the
+                            LEVEL0_COMMUNITIES largest) with the summed
+                            weight of the edges between them
+    <level>/<tx>_<ty>.json  level 1..L: the plane cut into 2^level x
+                            2^level tiles; each tile clusters its nodes per
+                            community on a CELLS x CELLS sub-grid, and the
+                            deepest level holds individual agents
+
+A viewer loads the manifest and level 0 (a few KB), then fetches the
+tiles of the level matching its zoom, only for the region on screen;
+network.html does this whenever it finds lod/manifest.json (or the
+directory given as ?lod=DIR).
+Levels are added until no tile holds more than MAX_TILE_NODES agents.
+Tiles are cut in the layout plane (x/y, for network.html) or, with
+space='geo', on the globe's equal-area lng / sin(lat) projection.
+
+Every tile stores its nodes column-wise:
+
+    {"level", "tile": [tx, ty], "bounds": [x0, y0, x1, y1],
+     "nodes": {"id", "label", "x", "y", "lat", "lng", "size", "community", ...},
+     "external": {"id", "x", "y", "lat", "lng"},   endpoints in other tiles
+     "edges": [[source_id, target_id, weight], ...],
+     "truncated_edges": n}                       lightest edges left out
+
+An edge between two tiles is written to both. Node ids are agent ids at
+the deepest level, "c<community>" at level 0 and
+"<level>/<tx>_<ty>/<k>" for clusters.
+
+    python3 lod_export.py network-data.json --out lod
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+
+from csr_graph import CsrGraph, np, require_numpy
+from graph_json import load_graph
+
+MANIFEST_FILE = 'manifest.json'
+DEFAULT_LOD_DIR = 'lod'
+SPACES = ('xy', 'geo')
+LEVEL0_COMMUNITIES = 128
+LEVEL0_EDGES = 512
+CELLS = 16                  # cluster sub-grid per tile side
+MAX_TILE_NODES = 4000
+MAX_TILE_EDGES = 4000
+MAX_LEVEL = 12
+
+
+def _plane_extent(graph_nodes):
+    """Half-width of the square the x/y tiles are cut from"""
+    return max(max((abs(node['x']) for node in graph_nodes), default=1.0),
+               max((abs(node['y']) for node in graph_nodes), default=1.0), 1e-9)
+
+
+def _unit_coordinates(graph_nodes, space):
+    """(u, v) in [0, 1) for every node, in the chosen tiling space"""
+    if space == 'geo':
+        u = (np.array([node['lng'] for node in graph_nodes]) + 180.0) / 360.0
+        v = (np.sin(np.radians([node['lat'] for node in graph_nodes])) + 1.0) / 2.0
+    else:
+        extent = _plane_extent(graph_nodes)
+        u = (np.array([node['x'] for node in graph_nodes]) / extent + 1.0) / 2.0
+        v = (np.array([node['y'] for node in graph_nodes]) / extent + 1.0) / 2.0
+    limit = np.nextafter(1.0, 0.0)
+    return np.clip(u, 0.0, limit), np.clip(v, 0.0, limit)
+
+
+def _aggregate(group, n_groups, columns, strength):
+    """Per-group count, column means and index of the strongest member"""
+    count = np.bincount(group, minlength=n_groups)
+    means = {name: np.bincount(group, weights=values, minlength=n_groups) / np.maximum(count, 1)
+             for name, values in columns.items()}
+    order = np.lexsort((-strength, group))
+    first = np.r_[0, np.flatnonzero(np.diff(group[order])) + 1]
+    leader = np.zeros(n_groups, dtype=np.int64)
+    leader[group[order][first]] = order[first]
+    return count, means, leader
+
+
+def _group_edges(csr, group):
+    """Summed weights of edges between different groups: (a, b, weight) with a < b"""
+    rows = csr.rows()
+    upper = rows < csr.indices
+    a, b = group[rows[upper]], group[csr.indices[upper]]
+    weights = csr.weights[upper]
+    between = a != b
+    a, b, weights = a[between], b[between], weights[between]
+    lo, hi = np.minimum(a, b), np.maximum(a, b)
+
+    n = int(group.max()) + 1 if len(group) else 0
+    key = lo.astype(np.int64) * n + hi
+    order = np.argsort(key)
+    key, weights = key[order], weights[order]
+    if not len(key):
+        return key, key, weights
+    first = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    key = key[first]
+    return key // n, key % n, np.add.reduceat(weights, first)
+
+
+def _top_per_tile(tile, weights, limit):
+    """Mask keeping the `limit` heaviest edges of every tile"""
+    order = np.lexsort((-weights, tile))
+    sorted_tile = tile[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_tile)) + 1]
+    sizes = np.diff(np.r_[starts, len(order)])
+    rank = np.arange(len(order)) - np.repeat(starts, sizes)
+    keep = np.zeros(len(order), dtype=bool)
+    keep[order] = rank < limit
+    return keep
+
+
+def _round(values, digits):
+    return np.round(values, digits).tolist()
+
+
+class LodWriter:
+    """Writes the tiles of one export directory and records them for the manifest"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.levels = []
+        self.bytes = 0
+        self._clear()
+        os.makedirs(directory, exist_ok=True)
+
+    def _clear(self):
+        """Drop the tiles of a previous export (only the files we own)"""
+        if not os.path.isfile(os.path.join(self.directory, MANIFEST_FILE)):
+            return
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.isdigit() and os.path.isdir(path):
+                shutil.rmtree(path)
+        os.remove(os.path.join(self.directory, MANIFEST_FILE))
+
+    def write_tile(self, level, tx, ty, payload):
+        path = os.path.join(self.directory, str(level), f"{tx}_{ty}.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(payload, separators=(',', ':'))
+        with open(path, 'w') as f:
+            f.write(data)
+        self.bytes += len(data)
+        return len(data)
+
+    def write_manifest(self, manifest):
+        with open(os.path.join(self.directory, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+
+def _level0(graph_nodes, csr, community, names, attrs, strength, writer):
+    """Community super-nodes and the weights between them"""
+    k = int(community.max()) + 1
+    top = min(k, LEVEL0_COMMUNITIES)
+    group = np.where(community < top, community, top)     # everything else -> one bucket
+    count, means, leader = _aggregate(group, top + 1, attrs, strength)
+
+    a, b, weights = _group_edges(csr, group)
+    inside = (a < top) & (b < top)
+    a, b, weights = a[inside], b[inside], weights[inside]
+    heaviest = np.argsort(-weights, kind='stable')[:LEVEL0_EDGES]
+
+    payload = {
+        'level': 0,
+        'tile': [0, 0],
+        'nodes': {
+            'id': [f"c{c}" for c in range(top)],
+            'label': [names[i] for i in leader[:top].tolist()],
+            'x': _round(means['x'][:top], 1),
+            'y': _round(means['y'][:top], 1),
+            'lat': _round(means['lat'][:top], 3),
+            'lng': _round(means['lng'][:top], 3),
+            'size': count[:top].tolist(),
+            'community': list(range(top)),
+        },
+        'external': {},
+        'edges': [[f"c{s}", f"c{t}", round(float(w), 2)]
+                  for s, t, w in zip(a[heaviest].tolist(), b[heaviest].tolist(), weights[heaviest].tolist())],
+        'truncated_edges': int(len(weights) - len(heaviest)),
+        'communities_total': k,
+        'nodes_outside_top': int(count[top]),
+    }
+    size = writer.write_tile(0, 0, 0, payload)
+    return {'level': 0, 'kind': 'communities', 'grid': 1,
+            'tiles': {'0_0': {'nodes': top, 'edges': len(payload['edges']), 'bytes': size}}}
+
+
+def _tile_level(level, deepest, graph_nodes, csr, community, names, attrs, strength, u, v, writer):
+    """Clusters (or, at the deepest level, agents) of every tile at one level"""
+    side = 2 ** level
+    tx = (u * side).astype(np.int64)
+    ty = (v * side).astype(np.int64)
+    tile = tx * side + ty
+
+    if deepest:
+        group = np.arange(len(u))
+        n_groups = len(u)
+        count = np.ones(n_groups, dtype=np.int64)
+        means = attrs
+        leader = group
+        group_tile = tile
+        group_community = community
+        ids = list(csr.node_ids)
+    else:
+        cx = (u * side * CELLS).astype(np.int64) % CELLS
+        cy = (v * side * CELLS).astype(np.int64) % CELLS
+        key = (tile * CELLS * CELLS + cx * CELLS + cy) * (int(community.max()) + 1) + community
+        unique_keys, group = np.unique(key, return_inverse=True)
+        group = group.ravel()
+        n_groups = len(unique_keys)
+        count, means, leader = _aggregate(group, n_groups, attrs, strength)
+        group_tile = tile[leader]
+        group_community = community[leader]
+        # Cluster ids number clusters within their tile
+        order = np.argsort(group_tile, kind='stable')
+        starts = np.r_[0, np.flatnonzero(np.diff(group_tile[order])) + 1]
+        within = np.empty(n_groups, dtype=np.int64)
+        within[order] = np.arange(n_groups) - np.repeat(starts, np.diff(np.r_[starts, n_groups]))
+        ids = [f"{level}/{t // side}_{t % side}/{w}" for t, w in zip(group_tile.tolist(), within.tolist())]
+
+    a, b, weights = _group_edges(csr, group)
+    # Each edge goes to the tiles of both ends (once if they share a tile)
+    ends_a, ends_b = group_tile[a], group_tile[b]
+    crossing = ends_a != ends_b
+    edge_tile = np.concatenate((ends_a, ends_b[crossing]))
+    edge_index = np.concatenate((np.arange(len(a)), np.flatnonzero(crossing)))
+    keep = _top_per_tile(edge_tile, weights[edge_index], MAX_TILE_EDGES)
+    dropped = np.bincount(edge_tile[~keep], minlength=side * side)
+    edge_tile, edge_index = edge_tile[keep], edge_index[keep]
+
+    node_order = np.argsort(group_tile, kind='stable')
+    node_starts = np.searchsorted(group_tile[node_order], np.arange(side * side + 1))
+    edge_order = np.argsort(edge_tile, kind='stable')
+    edge_starts = np.searchsorted(edge_tile[edge_order], np.arange(side * side + 1))
+
+    x, y = _round(means['x'], 1), _round(means['y'], 1)
+    lat, lng = _round(means['lat'], 3), _round(means['lng'], 3)
+    sizes = count.tolist()
+    communities = group_community.tolist()
+    karma = means['karma'].round().astype(np.int64).tolist() if deepest else None
+    posts = means['posts_count'].round().astype(np.int64).tolist() if deepest else None
+    a_list, b_list, w_list = a.tolist(), b.tolist(), np.round(weights, 2).tolist()
+    tile_list = group_tile.tolist()
+
+    tiles = {}
+    for t in np.flatnonzero(np.diff(node_starts)).tolist():
+        members = node_order[node_starts[t]:node_starts[t + 1]].tolist()
+        edges = edge_order[edge_starts[t]:edge_starts[t + 1]]
+        edge_ids = edge_index[edges].tolist()
+
+        external = sorted({end for e in edge_ids for end in (a_list[e], b_list[e]) if tile_list[end] != t})
+        nodes = {
+            'id': [ids[g] for g in members],
+            'label': [names[leader[g]] for g in members],
+            'x': [x[g] for g in members],
+            'y': [y[g] for g in members],
+            'lat': [lat[g] for g in members],
+            'lng': [lng[g] for g in members],
+            'size': [sizes[g] for g in members],
+            'community': [communities[g] for g in members],
+        }
+        if deepest:
+            nodes['karma'] = [karma[g] for g in members]
+            nodes['posts_count'] = [posts[g] for g in members]
+
+        tx_, ty_ = divmod(t, side)
+        payload = {
+            'level': level,
+            'tile': [tx_, ty_],
+            'bounds': [tx_ / side, ty_ / side, (tx_ + 1) / side, (ty_ + 1) / side],
+            'nodes': nodes,
+            'external': {
+                'id': [ids[g] for g in external],
+                'x': [x[g] for g in external],
+                'y': [y[g] for g in external],
+                'lat': [lat[g] for g in external],
+                'lng': [lng[g] for g in external],
+            },
+            'edges': [[ids[a_list[e]], ids[b_list[e]], w_list[e]] for e in edge_ids],
+            'truncated_edges': int(dropped[t]),
+        }
+        size = writer.write_tile(level, tx_, ty_, payload)
+        tiles[f"{tx_}_{ty_}"] = {'nodes': len(members), 'agents': int(count[members].sum()),
+                                 'edges': len(edge_ids), 'bytes': size}
+
+    return {'level': level, 'kind': 'agents' if deepest else 'clusters', 'grid': side, 'tiles': tiles}
+
+
+def levels_needed(u, v, max_tile_nodes=MAX_TILE_NODES):
+    """Smallest level at which no tile holds more than max_tile_nodes agents"""
+    for level in range(1, MAX_LEVEL + 1):
+        side = 2 ** level
+        tile = (u * side).astype(np.int64) * side + (v * side).astype(np.int64)
+        if np.bincount(tile).max() <= max_tile_nodes:
+            return level
+    return MAX_LEVEL
+
+
+def export_lod(graph, directory=DEFAULT_LOD_DIR, space='xy', max_tile_nodes=MAX_TILE_NODES):
+    """
+    Write the tiled level-of-detail export of a network graph dict.
+
+    Computes communities and layout first when the nodes lack them.
+    Returns the manifest.
+    """
+    require_numpy()
+    if space not in SPACES:
+        raise ValueError(f"Unknown tiling space: {space} (expected one of {SPACES})")
+    start = time.perf_counter()
+
+    nodes = graph['nodes']
+    if nodes and any('x' not in node or 'lat' not in node for node in nodes):
+        from layout import compute_layout
+        compute_layout(graph)
+
+    # Only listed nodes are exported; edges to unlisted endpoints are dropped
+    known = {node['id'] for node in nodes}
+    csr = CsrGraph.from_graph({
+        'nodes': nodes,
+        'edges': [edge for edge in graph['edges'] if edge['source'] in known and edge['target'] in known]
+    })
+    community = np.array([node['community'] for node in nodes], dtype=np.int64)
+    names = [node.get('username', node['id']) for node in nodes]
+    attrs = {
+        'x': np.array([node['x'] for node in nodes], dtype=np.float64),
+        'y': np.array([node['y'] for node in nodes], dtype=np.float64),
+        'lat': np.array([node['lat'] for node in nodes], dtype=np.float64),
+        'lng': np.array([node['lng'] for node in nodes], dtype=np.float64),
+        'karma': np.array([node.get('karma', 0) or 0 for node in nodes], dtype=np.float64),
+        'posts_count': np.array([node.get('posts_count', 0) or 0 for node in nodes], dtype=np.float64),
+    }
+    strength = csr.strength() if len(nodes) else np.zeros(0)
+
+    writer = LodWriter(directory)
+    levels = []
+    if nodes:
+        u, v = _unit_coordinates(nodes, space)
+        deepest = levels_needed(u, v, max_tile_nodes)
+        levels.append(_level0(nodes, csr, community, names, attrs, strength, writer))
+        for level in range(1, deepest + 1):
+            levels.append(_tile_level(level, level == deepest, nodes, csr, community, names,
+                                      attrs, strength, u, v, writer))
+
+    manifest = {
+        'version': 1,
+        'space': space,
+        'extent': (graph.get('metadata', {}).get('layout') or {}).get('extent'),
+        # Tile (tx, ty) of level L covers u, v in [tx, tx + 1) / 2^L, where
+        # u = (x / tile_extent + 1) / 2 (xy space) or (lng + 180) / 360 (geo)
+        'tile_extent': _plane_extent(nodes) if nodes and space == 'xy' else None,
+        'total_agents': len(nodes),
+        'total_posts': graph.get('metadata', {}).get('total_posts'),
+        'total_connections': csr.n_edges,
+        'cells_per_tile': CELLS,
+        'max_tile_nodes': max_tile_nodes,
+        'levels': levels,
+        'bytes': writer.bytes,
+        'seconds': round(time.perf_counter() - start, 2),
+        'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    writer.write_manifest(manifest)
+    return manifest
+
+
+def print_lod(manifest, directory=DEFAULT_LOD_DIR):
+    levels = manifest['levels']
+    initial = levels[0]['tiles']['0_0']['bytes'] if levels else 0
+    tiles = sum(len(level['tiles']) for level in levels)
+    print(f"✓ LOD export in {directory}/: {len(levels)} levels, {tiles} tiles, "
+          f"{manifest['bytes'] / 1e6:.1f} MB total, {initial / 1e3:.1f} KB initial load "
+          f"({manifest['seconds']:.1f}s)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Write a tiled level-of-detail export of network-data.json")
+    parser.add_argument('input', nargs='?', default='network-data.json')
+    parser.add_argument('--out', default=DEFAULT_LOD_DIR, help="export directory (earlier tiles in it are replaced)")
+    parser.add_argument('--space', choices=SPACES, default='xy',
+                        help="cut tiles in the 2D layout plane or on the globe")
+    parser.add_argument('--max-tile-nodes', type=int, default=MAX_TILE_NODES,
+                        help="add levels until no tile holds more agents than this")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("🧭 Moltbook Network Map - Level-of-Detail Export")
+    print("=" * 50)
+
+    graph = load_graph(args.input)
+    print(f"📊 {len(graph['nodes']):,} nodes, {len(graph['edges']):,} edges")
+
+    manifest = export_lod(graph, args.out, space=args.space, max_tile_nodes=args.max_tile_nodes)
+    print_lod(manifest, args.out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Local API Stand-in
+Fault-injecting asyncio server for load-testing the collectors offline
+
+Serves a synthetic_data.py dataset with the same endpoints and response
+shapes the collectors use:
+
+    GET  /agents?limit&offset       {'agents': [...]}
+    GET  /agents/profile?name       {'agent': {... follower_count ...}, 'recentPosts'}
+    GET  /feed?limit&cursor         {'posts': [...], 'pagination': {'next'}}
+    GET  /submolts                  {'submolts': [...]}
+    POST /agents/register           201 {'id', 'name', 'api_key'} or 409
+    POST /posts                     201 post (Bearer key from register)
+    GET  /_stats                    request and fault counters
+
+Faults are drawn per request from a seeded RNG: added latency, 429s with
+Retry-After, 5xx errors, and truncated bodies (full Content-Length, half
+the bytes, then the connection is closed). GET responses carry an ETag
+and answer If-None-Match with 304.
+
+    python3 mock_api.py --agents 1m --latency 20 --throttle-rate 0.02 --error-rate 0.01
+    python3 collect-data.py --api-base http://127.0.0.1:8787/v1 --max-pages 0
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import secrets
+import time
+from collections import Counter
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from synthetic_data import generate_dataset, parse_size
+
+DEFAULT_PORT = 8787
+PREFIX = '/v1'
+MAX_LIMIT = 100
+
+
+class MoltbookStandIn:
+    """In-memory Moltbook API over a generated dataset"""
+
+    def __init__(self, data, latency=0.0, jitter=0.0, throttle_rate=0.0, error_rate=0.0,
+                 truncate_rate=0.0, retry_after=1, seed=0):
+        self.agents = data['agents']
+        self.submolts = data['submolts']
+        # Oldest first, so a cursor (index of the next post to return) stays
+        # valid while new posts are appended
+        self.posts = list(reversed(data['posts']))
+        self.names = {agent['username'].lower() for agent in self.agents}
+        self.by_id = {agent['id']: agent for agent in self.agents}
+        self.by_name = {agent['username'].lower(): agent for agent in self.agents}
+        self.keys = {}
+        self._posts_by_author = None
+
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.truncate_rate = truncate_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.stats = Counter()
+        self.started = time.monotonic()
+
+    # Endpoints
+
+    def get_agents(self, query):
+        limit = min(int(query.get('limit', 20)), MAX_LIMIT)
+        offset = int(query.get('offset', 0))
+        return 200, {'agents': self.agents[offset:offset + limit]}
+
+    def get_profile(self, query):
+        agent = self.by_name.get(query['name'].lower())
+        if agent is None:
+            return 404, {'success': False, 'error': 'agent not found'}
+
+        if self._posts_by_author is None:
+            self._posts_by_author = {}
+            for post in self.posts:
+                self._posts_by_author.setdefault(post['author']['id'], []).append(post)
+        recent = self._posts_by_author.get(agent['id'], [])[-10:][::-1]
+
+        # Follow counts are not part of the dataset; derive stable ones from the id
+        seed = int(agent['id'], 16)
+        profile = {
+            **agent,
+            'follower_count': (agent['karma'] // 3) + seed % 7,
+            'following_count': seed % 23,
+            'is_verified': agent['verified'],
+        }
+        return 200, {'success': True, 'agent': profile, 'recentPosts': recent}
+
+    def get_feed(self, query):
+        limit = min(int(query.get('limit', 20)), MAX_LIMIT)
+        start = int(query['cursor']) if query.get('cursor') else len(self.posts) - 1
+        stop = max(-1, start - limit)
+        page = [self.posts[i] for i in range(start, stop, -1)]
+        return 200, {'posts': page, 'pagination': {'next': str(stop) if stop >= 0 else None}}
+
+    def get_submolts(self, query):
+        return 200, {'submolts': self.submolts}
+
+    def get_stats(self, query):
+        seconds = time.monotonic() - self.started
+        return 200, {
+            'uptime_seconds': round(seconds, 1),
+            'requests_per_sec': round(self.stats['requests'] / seconds, 1) if seconds else 0,
+            **self.stats
+        }
+
+    def register_agent(self, payload):
+        name = (payload or {}).get('name')
+        if not name:
+            return 400, {'error': 'name is required'}
+        if name.lower() in self.names:
+            return 409, {'error': 'agent already exists'}
+
+        agent = {
+            'id': f"{self.rng.getrandbits(64):016x}",
+            'username': name,
+            'posts_count': 0,
+            'karma': 0,
+            'verified': False
+        }
+        api_key = f"moltbook_{secrets.token_hex(12)}"
+        self.agents.append(agent)
+        self.names.add(name.lower())
+        self.by_id[agent['id']] = agent
+        self.by_name[name.lower()] = agent
+        self.keys[api_key] = agent
+        return 201, {'id': agent['id'], 'name': name, 'api_key': api_key}
+
+    def create_post(self, payload, headers):
+        token = headers.get('authorization', '').removeprefix('Bearer ').strip()
+        agent = self.keys.get(token)
+        if agent is None:
+            return 401, {'error': 'unknown api key'}
+        if not (payload or {}).get('content'):
+            return 400, {'error': 'content is required'}
+
+        agent['posts_count'] += 1
+        post = {
+            'id': f"post_{len(self.posts) + 1:08d}",
+            'author': {'id': agent['id'], 'username': agent['username']},
+            'submolt': payload.get('submolt', 'm/general'),
+            'upvotes': 0,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }
+        self.posts.append(post)
+        if self._posts_by_author is not None:
+            self._posts_by_author.setdefault(agent['id'], []).append(post)
+        return 201, post
+
+    def route(self, method, target, headers, body):
+        """(status, payload) for one request"""
+        parts = urlsplit(target)
+        path = parts.path.removeprefix(PREFIX).rstrip('/')
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        routes = {
+            ('GET', '/agents'): lambda: self.get_agents(query),
+            ('GET', '/agents/profile'): lambda: self.get_profile(query),
+            ('GET', '/feed'): lambda: self.get_feed(query),
+            ('GET', '/submolts'): lambda: self.get_submolts(query),
+            ('GET', '/_stats'): lambda: self.get_stats(query),
+            ('POST', '/agents/register'): lambda: self.register_agent(json.loads(body or b'null')),
+            ('POST', '/posts'): lambda: self.create_post(json.loads(body or b'null'), headers),
+        }
+        handler = routes.get((method, path))
+        if handler is None:
+            return 404, {'error': f"no route for {method} {path}"}
+        try:
+            return handler()
+        except (ValueError, KeyError, IndexError) as e:
+            return 400, {'error': str(e)}
+
+    # HTTP
+
+    def pick_fault(self, path):
+        """None, '429', '5xx' or 'truncate' for the next request"""
+        if path.endswith('/_stats'):
+            return None
+        roll = self.rng.random()
+        for fault, rate in (('429', self.throttle_rate), ('5xx', self.error_rate),
+                            ('truncate', self.truncate_rate)):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    async def respond(self, writer, method, target, headers, body):
+        """Write one response; returns False when the connection must close"""
+        self.stats['requests'] += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)))
+
+        fault = self.pick_fault(urlsplit(target).path)
+        extra = {}
+        if fault == '429':
+            self.stats['throttled'] += 1
+            status, payload = 429, {'error': 'rate limited'}
+            extra['Retry-After'] = str(self.retry_after)
+        elif fault == '5xx':
+            self.stats['errors'] += 1
+            status, payload = self.rng.choice((500, 502, 503)), {'error': 'injected failure'}
+        else:
+            status, payload = self.route(method, target, headers, body)
+
+        data = json.dumps(payload).encode('utf-8')
+        if method == 'GET' and status == 200:
+            etag = '"%s"' % hashlib.blake2b(data, digest_size=12).hexdigest()
+            extra['ETag'] = etag
+            if headers.get('if-none-match') == etag:
+                self.stats['not_modified'] += 1
+                status, data = 304, b''
+
+        truncate = fault == 'truncate' and len(data) > 1
+        if truncate:
+            self.stats['truncated'] += 1
+
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+                 "Content-Type: application/json",
+                 f"Content-Length: {len(data)}"]
+        lines += [f"{name}: {value}" for name, value in extra.items()]
+        if truncate:
+            lines.append("Connection: close")
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        writer.write(data[:len(data) // 2] if truncate else data)
+        await writer.drain()
+        return not truncate
+
+    async def handle(self, reader, writer):
+        """Serve keep-alive HTTP/1.1 requests on one connection"""
+        self.stats['connections'] += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode('latin-1').split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length') or 0)
+                body = await reader.readexactly(length) if length else b''
+
+                keep_alive = await self.respond(writer, method.upper(), target, headers, body)
+                if not keep_alive or headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(standin, host='127.0.0.1', port=DEFAULT_PORT):
+    """Run the stand-in until cancelled"""
+    server = await asyncio.start_server(standin.handle, host, port, backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Local fault-injecting Moltbook API stand-in")
+    parser.add_argument('--agents', default='10k', help="dataset size (1k, 10k, 100k, 1m or an integer)")
+    parser.add_argument('--posts-per-agent', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency', type=float, default=0, metavar='MS', help="added latency per request")
+    parser.add_argument('--jitter', type=float, default=0, metavar='MS', help="+/- random latency")
+    parser.add_argument('--throttle-rate', type=float, default=0, help="fraction of requests answered 429")
+    parser.add_argument('--error-rate', type=float, default=0, help="fraction answered 500/502/503")
+    parser.add_argument('--truncate-rate', type=float, default=0, help="fraction with a cut-off body")
+    parser.add_argument('--retry-after', type=int, default=1, metavar='SECONDS')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("🧪 Moltbook Network Map - Local API Stand-in")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    data = generate_dataset(parse_size(args.agents), seed=args.seed, posts_per_agent=args.posts_per_agent)
+    print(f"✓ Generated {len(data['agents']):,} agents, {len(data['posts']):,} posts, "
+          f"{len(data['submolts']):,} submolts in {time.perf_counter() - start:.1f}s")
+
+    standin = MoltbookStandIn(
+        data,
+        latency=args.latency / 1000, jitter=args.jitter / 1000,
+        throttle_rate=args.throttle_rate, error_rate=args.error_rate,
+        truncate_rate=args.truncate_rate, retry_after=args.retry_after, seed=args.seed
+    )
+    print(f"✓ Serving on http://{args.host}:{args.port}{PREFIX}")
+
+    try:
+        asyncio.run(serve(standin, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+    print(f"\nServed: {json.dumps(standin.get_stats({})[1])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Page Readiness
+Event-driven waits for the Playwright scrapers instead of fixed sleeps
+
+Every wait resolves on a concrete signal and falls back to a timeout:
+
+    selector    an element matching a CSS selector is attached
+    stable      the number of matching elements has not changed for
+                `quiet_ms` (the list has finished rendering)
+    more        the number of matching elements grew past a previous
+                count (a scroll or "Load More" produced new content)
+    idle        no network requests for 500ms (data XHRs finished)
+    until       an arbitrary JS predicate became true
+    response    an XHR/fetch response whose URL contains a pattern
+                arrived while running an action
+
+A timeout is not an error: the wait returns False and the scraper carries
+on, exactly as it did after a fixed sleep. Each wait is recorded in a
+WaitMetrics log, and report() prints per-label timings.
+
+PageWaiter is for sync_playwright pages, AsyncPageWaiter for async ones.
+"""
+
+import itertools
+import time
+from collections import defaultdict
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+AGENT_LINKS = 'a[href^="/u/"]'
+DEFAULT_TIMEOUT = 10.0      # seconds
+DEFAULT_QUIET_MS = 300
+POLL_MS = 100
+
+# Count is tracked per call token on window, so consecutive waits on the
+# same page never see each other's state
+COUNT_STABLE_JS = """([selector, quietMs, token, allowEmpty]) => {
+    const state = (window.__moltbookReady = window.__moltbookReady || {});
+    const count = document.querySelectorAll(selector).length;
+    const now = performance.now();
+    const last = state[token];
+    if (!last || last.count !== count) {
+        state[token] = {count, since: now};
+        return false;
+    }
+    if ((count > 0 || allowEmpty) && now - last.since >= quietMs) {
+        delete state[token];
+        return true;
+    }
+    return false;
+}"""
+
+COUNT_ABOVE_JS = "([selector, previous]) => document.querySelectorAll(selector).length > previous"
+COUNT_JS = "selector => document.querySelectorAll(selector).length"
+
+_tokens = itertools.count()
+
+
+def is_data_response(response, match=None):
+    """True for XHR/fetch responses, optionally only those whose URL contains `match`"""
+    if response.request.resource_type not in ('xhr', 'fetch'):
+        return False
+    return match is None or match in response.url
+
+
+class WaitMetrics:
+    """Log of every readiness wait: (label, signal, seconds, ready)"""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, label, signal, seconds, ready):
+        self.records.append((label, signal, seconds, ready))
+
+    @property
+    def total_seconds(self):
+        return sum(seconds for _, _, seconds, _ in self.records)
+
+    def report(self):
+        """Print wait counts, mean/max time and timeouts per label and signal"""
+        if not self.records:
+            return
+        by_label = defaultdict(list)
+        for label, signal, seconds, ready in self.records:
+            by_label[f"{label}/{signal}"].append((seconds, ready))
+
+        timeouts = sum(1 for *_, ready in self.records if not ready)
+        print(f"\n⏱️  {len(self.records)} page waits, {self.total_seconds:.1f}s total, {timeouts} timed out")
+        for label, waits in by_label.items():
+            times = [seconds for seconds, _ in waits]
+            missed = sum(1 for _, ready in waits if not ready)
+            print(f"  {label:20s} {len(waits):4d} waits  avg {sum(times) / len(times):.2f}s  "
+                  f"max {max(times):.2f}s  {missed} timeouts")
+
+
+class _Waiter:
+    def __init__(self, timeout=DEFAULT_TIMEOUT, quiet_ms=DEFAULT_QUIET_MS, metrics=None):
+        self.timeout = timeout
+        self.quiet_ms = quiet_ms
+        self.metrics = metrics if metrics is not None else WaitMetrics()
+
+    def _ms(self, timeout):
+        return (self.timeout if timeout is None else timeout) * 1000
+
+    def _stable_arg(self, selector, quiet_ms, allow_empty):
+        quiet = self.quiet_ms if quiet_ms is None else quiet_ms
+        return [selector, quiet, f"w{next(_tokens)}", allow_empty]
+
+    def report(self):
+        self.metrics.report()
+
+
+class PageWaiter(_Waiter):
+    """Readiness waits for sync Playwright pages"""
+
+    def _wait(self, label, signal, wait):
+        start = time.perf_counter()
+        try:
+            wait()
+            ready = True
+        except PlaywrightTimeoutError:
+            ready = False
+        self.metrics.record(label, signal, time.perf_counter() - start, ready)
+        return ready
+
+    def selector(self, page, selector, label='selector', timeout=None):
+        return self._wait(label, 'selector', lambda: page.wait_for_selector(
+            selector, state='attached', timeout=self._ms(timeout)))
+
+    def stable(self, page, selector=AGENT_LINKS, label='stable', timeout=None,
+               quiet_ms=None, allow_empty=False):
+        arg = self._stable_arg(selector, quiet_ms, allow_empty)
+        return self._wait(label, 'stable', lambda: page.wait_for_function(
+            COUNT_STABLE_JS, arg=arg, polling=POLL_MS, timeout=self._ms(timeout)))
+
+    def more(self, page, selector=AGENT_LINKS, previous=0, label='more', timeout=None):
+        return self._wait(label, 'more', lambda: page.wait_for_function(
+            COUNT_ABOVE_JS, arg=[selector, previous], polling=POLL_MS, timeout=self._ms(timeout)))
+
+    def idle(self, page, label='idle', timeout=None):
+        return self._wait(label, 'idle', lambda: page.wait_for_load_state(
+            'networkidle', timeout=self._ms(timeout)))
+
+    def until(self, page, predicate, arg=None, label='until', timeout=None):
+        return self._wait(label, 'until', lambda: page.wait_for_function(
+            predicate, arg=arg, polling=POLL_MS, timeout=self._ms(timeout)))
+
+    def response(self, page, action, match=None, label='response', timeout=None):
+        """Run action() and wait for the data response it triggers"""
+        def wait():
+            with page.expect_response(lambda r: is_data_response(r, match), timeout=self._ms(timeout)):
+                action()
+        return self._wait(label, 'response', wait)
+
+    def content(self, page, selector=AGENT_LINKS, label='content', timeout=None):
+        """
+        Wait until the page's data has loaded and `selector` has rendered.
+
+        Once the network is idle an empty result is accepted as final, so
+        pages with nothing to list don't run into the timeout.
+        """
+        idle = self.idle(page, label=label, timeout=timeout)
+        return self.stable(page, selector, label=label, timeout=timeout, allow_empty=idle)
+
+    def count(self, page, selector=AGENT_LINKS):
+        return page.evaluate(COUNT_JS, selector)
+
+
+class AsyncPageWaiter(_Waiter):
+    """Readiness waits for async Playwright pages"""
+
+    async def _wait(self, label, signal, wait):
+        start = time.perf_counter()
+        try:
+            await wait()
+            ready = True
+        except PlaywrightTimeoutError:
+            ready = False
+        self.metrics.record(label, signal, time.perf_counter() - start, ready)
+        return ready
+
+    async def selector(self, page, selector, label='selector', timeout=None):
+        return await self._wait(label, 'selector', lambda: page.wait_for_selector(
+            selector, state='attached', timeout=self._ms(timeout)))
+
+    async def stable(self, page, selector=AGENT_LINKS, label='stable', timeout=None,
+                     quiet_ms=None, allow_empty=False):
+        arg = self._stable_arg(selector, quiet_ms, allow_empty)
+        return await self._wait(label, 'stable', lambda: page.wait_for_function(
+            COUNT_STABLE_JS, arg=arg, polling=POLL_MS, timeout=self._ms(timeout)))
+
+    async def more(self, page, selector=AGENT_LINKS, previous=0, label='more', timeout=None):
+        return await self._wait(label, 'more', lambda: page.wait_for_function(
+            COUNT_ABOVE_JS, arg=[selector, previous], polling=POLL_MS, timeout=self._ms(timeout)))
+
+    async def idle(self, page, label='idle', timeout=None):
+        return await self._wait(label, 'idle', lambda: page.wait_for_load_state(
+            'networkidle', timeout=self._ms(timeout)))
+
+    async def until(self, page, predicate, arg=None, label='until', timeout=None):
+        return await self._wait(label, 'until', lambda: page.wait_for_function(
+            predicate, arg=arg, polling=POLL_MS, timeout=self._ms(timeout)))
+
+    async def response(self, page, action, match=None, label='response', timeout=None):
+        """Run action() and wait for the data response it triggers"""
+        async def wait():
+            async with page.expect_response(lambda r: is_data_response(r, match), timeout=self._ms(timeout)):
+                await action()
+        return await self._wait(label, 'response', wait)
+
+    async def content(self, page, selector=AGENT_LINKS, label='content', timeout=None):
+        """Async PageWaiter.content"""
+        idle = await self.idle(page, label=label, timeout=timeout)
+        return await self.stable(page, selector, label=label, timeout=timeout, allow_empty=idle)
+
+    async def count(self, page, selector=AGENT_LINKS):
+        return await page.evaluate(COUNT_JS, selector)
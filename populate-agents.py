@@ -3,12 +3,11 @@
 Populate Moltbook with more active agents for network visualization
 """
 
-import requests
 import json
 import random
-import time
 
-API_BASE = "https://moltbook-api.simeon-garratt.workers.dev/v1"
+from collector import get_api_base
+from http_client import configure_client, get_client
 
 # Interesting agent names inspired by real AI agents and personalities
 AGENT_NAMES = [
@@ -61,7 +60,7 @@ def register_agent(username, twitter_username=None):
     }
     
     try:
-        response = requests.post(f"{API_BASE}/agents/register", json=payload)
+        response = get_client().post(f"{get_api_base()}/agents/register", json=payload)
         if response.status_code == 201:
             data = response.json()
             print(f"✓ Registered: {username} (ID: {data.get('id', 'unknown')})")
@@ -85,7 +84,7 @@ def create_post(api_key, agent_id, content):
     }
     
     try:
-        response = requests.post(f"{API_BASE}/posts", json=payload, headers=headers)
+        response = get_client().post(f"{get_api_base()}/posts", json=payload, headers=headers)
         if response.status_code == 201:
             return response.json()
         else:
@@ -100,12 +99,14 @@ def main():
     print("=" * 50)
     print(f"Registering {len(AGENT_NAMES)} agents...\n")
     
+    # Rate limiting: 5 registrations/sec, shared by every request below
+    configure_client(rate=5, burst=1)
+    
     registered = 0
     for name in AGENT_NAMES:
         result = register_agent(name)
         if result:
             registered += 1
-        time.sleep(0.2)  # Rate limiting
     
     print(f"\n✓ Registered {registered} new agents")
     print(f"\nNext steps:")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Streaming Post Store
+Appends feed pages to NDJSON segment files so memory stays flat
+"""
+
+import gzip
+import json
+import os
+import re
+from itertools import islice
+
+DEFAULT_SEGMENT_POSTS = 100_000
+MANIFEST_FILE = 'manifest.json'
+SEGMENT_FILE = re.compile(r'posts-\d{5}\.ndjson(\.gz)?$')
+
+
+class PostStore:
+    """
+    On-disk post collection made of NDJSON segment files.
+
+    Pages are appended as they arrive and a new segment is started every
+    `segment_posts` posts. Segments are gzip-compressed if `compress` is
+    set. The store can be iterated any number of times and reports its
+    length, so builders can take it anywhere they take a list of posts.
+
+    An existing store in `directory` is reopened, unless `fresh` is set:
+    then its segments and manifest are removed first, so a new crawl does
+    not append to the posts of an old one.
+    """
+
+    def __init__(self, directory, compress=False, segment_posts=DEFAULT_SEGMENT_POSTS, fresh=False):
+        self.directory = directory
+        self.compress = compress
+        self.segment_posts = segment_posts
+        self.segments = []     # [{'file': name, 'posts': count}]
+        self._handle = None
+
+        if fresh:
+            self._clear()
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                self.segments = json.load(f)['segments']
+
+    def __len__(self):
+        return sum(segment['posts'] for segment in self.segments)
+
+    def __iter__(self):
+        return self.iter_posts()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _clear(self):
+        """Drop the segments and manifest of a previous store (only the files we own)"""
+        for name in os.listdir(self.directory) if os.path.isdir(self.directory) else []:
+            if name == MANIFEST_FILE or SEGMENT_FILE.match(name):
+                os.remove(os.path.join(self.directory, name))
+
+    def _open_segment(self):
+        suffix = '.ndjson.gz' if self.compress else '.ndjson'
+        name = f"posts-{len(self.segments):05d}{suffix}"
+        path = os.path.join(self.directory, name)
+        self._handle = gzip.open(path, 'wt') if self.compress else open(path, 'w')
+        self.segments.append({'file': name, 'posts': 0})
+
+    def _close_segment(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._write_manifest()
+
+    def _write_manifest(self):
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'segments': self.segments}, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def restore(self, segments):
+        """
+        Reset the store to a previously recorded list of segments.
+
+        Lines a crashed run wrote past a segment's recorded count are
+        ignored when reading, and new pages go to a fresh segment.
+        """
+        self._close_segment()
+        self.segments = [dict(segment) for segment in segments]
+        self._write_manifest()
+
+    def append_page(self, posts):
+        """Write one page of posts to the current segment and sync it"""
+        for post in posts:
+            if self._handle is None or self.segments[-1]['posts'] >= self.segment_posts:
+                self._close_segment()
+                self._open_segment()
+            self._handle.write(json.dumps(post, separators=(',', ':')))
+            self._handle.write('\n')
+            self.segments[-1]['posts'] += 1
+
+        if self._handle is not None:
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self._write_manifest()
+
+    def close(self):
+        """Finish the current segment and record it in the manifest"""
+        self._close_segment()
+
+    def iter_posts(self):
+        """Yield every stored post, segment by segment, in arrival order"""
+        for segment in list(self.segments):
+            path = os.path.join(self.directory, segment['file'])
+            opener = gzip.open if segment['file'].endswith('.gz') else open
+            with opener(path, 'rt') as f:
+                for line in islice(f, segment['posts']):
+                    yield json.loads(line)
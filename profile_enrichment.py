@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Profile Enrichment
+Fills in karma, followers, following and recent posts for any agent list
+
+Each agent is first looked up over plain HTTP on the API's profile
+endpoint (GET {api_base}/agents/profile?name=...) through the shared
+HttpClient, many requests in flight. Agents the API cannot answer for go
+to pooled Playwright pages on www.moltbook.com/u/<name>, where stats are
+read from the page's own JSON responses or, failing that, its text.
+After API_PROBE consecutive API failures with no success the HTTP path
+is switched off and the rest of the run goes to the browser.
+
+Results are appended to an NDJSON file as they arrive (one profile per
+line, later lines win), so memory stays flat and an interrupted run
+loses nothing. Agents fetched within --max-age are skipped on the next
+run.
+
+    python3 profile_enrichment.py moltbook-agents-full.json --concurrency 32
+    python3 profile_enrichment.py network-data.json --no-browser --cache
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from collector import configure_api_base, get_api_base
+from http_client import configure_client, get_client
+from response_cache import add_cache_arguments, cache_from_args
+
+PROFILES_FILE = 'agent-profiles.ndjson'
+PROFILE_URL = "https://www.moltbook.com/u/{}"
+DEFAULT_CONCURRENCY = 32
+DEFAULT_BROWSER_CONTEXTS = 2
+DEFAULT_PAGES_PER_CONTEXT = 4
+DEFAULT_MAX_AGE = 24 * 3600
+API_PROBE = 25              # consecutive API failures before giving up on it
+PAGE_TIMEOUT = 8            # readiness fallback per profile page
+RECENT_POSTS = 10
+FLUSH_EVERY = 500
+
+# Normalised stat -> the keys the API and the site use for it
+STAT_FIELDS = {
+    'karma': ('karma',),
+    'followers': ('follower_count', 'followers_count', 'followers'),
+    'following': ('following_count', 'followings_count', 'following'),
+    'posts_count': ('posts_count', 'post_count', 'postsCount'),
+}
+PROFILE_FIELDS = ('id', 'description', 'created_at', 'last_active', 'is_claimed')
+
+# "1.2k followers", "340 karma", "12 Following"
+STAT_TEXT = re.compile(r'([\d][\d,.]*)\s*([km]?)\s+(karma|followers?|following|posts?)\b', re.I)
+TEXT_STATS = {'karma': 'karma', 'follower': 'followers', 'followers': 'followers',
+              'following': 'following', 'post': 'posts_count', 'posts': 'posts_count'}
+
+PROFILE_DOM_JS = """() => ({
+    text: document.body ? document.body.innerText : '',
+    posts: Array.from(document.querySelectorAll('a[href^="/post/"]'),
+                      (link) => link.getAttribute('href'))
+})"""
+
+
+def load_agent_names(path):
+    """Usernames from an agent list file: {'agents': [...]}, {'nodes': [...]} or a bare list"""
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('agents') or data.get('nodes') or []
+
+    names = []
+    seen = set()
+    for item in data:
+        name = item if isinstance(item, str) else (item.get('username') or item.get('name') or item.get('id'))
+        if name and name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def _count(value):
+    """A stat as an int: numbers, numeric strings and lists (their length)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, list):
+        return len(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
+def _find_agent(payload, username):
+    """The dict in a profile payload that describes `username`"""
+    if not isinstance(payload, dict):
+        return None
+    for key in ('agent', 'profile', 'user'):
+        if isinstance(payload.get(key), dict):
+            return payload[key]
+    name = payload.get('username') or payload.get('name')
+    if isinstance(name, str) and name.lower() == username.lower():
+        return payload
+    for value in payload.values():
+        found = _find_agent(value, username) if isinstance(value, dict) else None
+        if found is not None:
+            return found
+    return None
+
+
+def parse_profile(payload, username):
+    """Profile dict (stats, recent post ids, owner fields) from a profile JSON payload, or None"""
+    agent = _find_agent(payload, username)
+    if agent is None:
+        return None
+
+    profile = {'username': username}
+    for stat, keys in STAT_FIELDS.items():
+        for key in keys:
+            value = _count(agent.get(key))
+            if value is not None:
+                profile[stat] = value
+                break
+    if not any(stat in profile for stat in STAT_FIELDS):
+        return None
+
+    profile['verified'] = bool(agent.get('is_verified', agent.get('verified', False)))
+    for key in PROFILE_FIELDS:
+        if agent.get(key) is not None:
+            profile[key] = agent[key]
+
+    posts = payload.get('recentPosts') or payload.get('posts') or agent.get('posts') or []
+    if isinstance(posts, list):
+        profile['posts'] = [post['id'] for post in posts[:RECENT_POSTS]
+                            if isinstance(post, dict) and post.get('id')]
+    return profile
+
+
+def parse_profile_text(text, username, post_links=()):
+    """Profile from a rendered page's text ("1.2k followers"), or None if no stats are shown"""
+    profile = {'username': username}
+    for number, suffix, label in STAT_TEXT.findall(text):
+        stat = TEXT_STATS[label.lower()]
+        if stat in profile:
+            continue
+        try:
+            value = float(number.replace(',', ''))
+        except ValueError:
+            continue
+        profile[stat] = int(value * {'': 1, 'k': 1_000, 'm': 1_000_000}[suffix.lower()])
+    if len(profile) == 1:
+        return None
+
+    posts = []
+    for href in post_links:
+        post_id = (href or '').replace('/post/', '').strip('/')
+        if post_id and post_id not in posts:
+            posts.append(post_id)
+    profile['posts'] = posts[:RECENT_POSTS]
+    return profile
+
+
+class ProfileStore:
+    """
+    Append-only NDJSON file of enriched profiles.
+
+    Only usernames and fetch times are kept in memory; `is_fresh()` is
+    what lets a rerun skip agents fetched recently.
+    """
+
+    def __init__(self, path, max_age=DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.fetched_at = {}
+        self.written = 0
+
+        complete = True
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    complete = line.endswith('\n')
+                    try:
+                        profile = json.loads(line)
+                    except ValueError:
+                        continue    # a line cut off by an interrupted run
+                    self.fetched_at[profile['username']] = profile.get('fetched_at', 0)
+        self._handle = open(path, 'a')
+        if not complete:
+            self._handle.write('\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def is_fresh(self, username, now=None):
+        fetched = self.fetched_at.get(username)
+        if fetched is None or self.max_age is None:
+            return False
+        return (now or time.time()) - fetched < self.max_age
+
+    def write(self, profile):
+        self._handle.write(json.dumps(profile) + '\n')
+        self.fetched_at[profile['username']] = profile['fetched_at']
+        self.written += 1
+        if self.written % FLUSH_EVERY == 0:
+            self._handle.flush()
+
+    def close(self):
+        if not self._handle.closed:
+            self._handle.close()
+
+
+def load_profiles(path=PROFILES_FILE):
+    """username -> latest profile from an enrichment NDJSON file"""
+    profiles = {}
+    if not os.path.exists(path):
+        return profiles
+    with open(path) as f:
+        for line in f:
+            try:
+                profile = json.loads(line)
+            except ValueError:
+                continue
+            profiles[profile['username']] = profile
+    return profiles
+
+
+def fetch_profile_api(username, api_base=None, api_key=None, timeout=10):
+    """Profile from the API's profile endpoint, or None when it has no answer for this agent"""
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+    response = get_client().get(
+        f"{api_base or get_api_base()}/agents/profile?name={quote(username)}",
+        headers=headers,
+        timeout=timeout
+    )
+    if response.status_code != 200:
+        return None
+    try:
+        return parse_profile(response.json(), username)
+    except ValueError:
+        return None
+
+
+async def fetch_profile_page(page, username, waiter):
+    """Profile from the rendered profile page: its JSON responses first, then its text"""
+    responses = []
+
+    # Playwright tags its handlers with an attribute, which a builtin like
+    # list.append cannot take, so register a plain function
+    def on_response(response):
+        responses.append(response)
+
+    page.on('response', on_response)
+    try:
+        await page.goto(PROFILE_URL.format(quote(username)), wait_until='domcontentloaded', timeout=15000)
+        await waiter.content(page, 'a[href^="/post/"]', label='profile', timeout=PAGE_TIMEOUT)
+
+        for response in responses:
+            if response.request.resource_type not in ('xhr', 'fetch') or 'json' not in response.headers.get('content-type', ''):
+                continue
+            try:
+                profile = parse_profile(await response.json(), username)
+            except Exception:
+                continue
+            if profile is not None:
+                return profile
+
+        dom = await page.evaluate(PROFILE_DOM_JS)
+        return parse_profile_text(dom['text'], username, dom['posts'])
+    finally:
+        page.remove_listener('response', on_response)
+
+
+class ProfileEnricher:
+    """
+    Concurrent two-path enrichment run.
+
+    API lookups run on a thread pool (`concurrency` in flight); misses are
+    queued for `browser_contexts` x `pages_per_context` Playwright tabs,
+    which start on the first miss and work alongside the API lookups.
+    """
+
+    def __init__(self, store, concurrency=DEFAULT_CONCURRENCY, api_key=None, use_api=True,
+                 use_browser=True, browser_contexts=DEFAULT_BROWSER_CONTEXTS,
+                 pages_per_context=DEFAULT_PAGES_PER_CONTEXT):
+        self.store = store
+        self.concurrency = concurrency
+        self.api_key = api_key
+        self.use_api = use_api
+        self.use_browser = use_browser
+        self.browser_contexts = browser_contexts
+        self.pages_per_context = pages_per_context
+
+        self.stats = {'api': 0, 'browser': 0, 'missing': 0, 'errors': 0, 'skipped': 0}
+        self._api_failures = 0
+        self._browser_needed = None
+        self._total = 0
+        self._start = 0.0
+
+    def _save(self, profile, source):
+        profile['source'] = source
+        profile['fetched_at'] = int(time.time())
+        self.store.write(profile)
+        self.stats[source] += 1
+        self._progress()
+
+    def _miss(self):
+        self.stats['missing'] += 1
+        self._progress()
+
+    def _progress(self):
+        done = self.stats['api'] + self.stats['browser'] + self.stats['missing']
+        if done % 1000 == 0 or done == self._total:
+            seconds = time.perf_counter() - self._start
+            print(f"  {done}/{self._total} profiles ({self.stats['api']} api, {self.stats['browser']} browser, "
+                  f"{self.stats['missing']} missing) {done / seconds if seconds else 0:.0f}/sec")
+
+    @property
+    def api_available(self):
+        return self.use_api and not (self._api_failures >= API_PROBE and self.stats['api'] == 0)
+
+    async def _api_worker(self, executor, names, fallback):
+        loop = asyncio.get_running_loop()
+        while names:
+            username = names.pop()
+            profile = None
+            if self.api_available:
+                try:
+                    profile = await loop.run_in_executor(
+                        executor, lambda: fetch_profile_api(username, api_key=self.api_key))
+                except Exception:
+                    self.stats['errors'] += 1
+                if profile is None:
+                    self._api_failures += 1
+                    if not self.api_available and self._api_failures == API_PROBE:
+                        print(f"  ⚠️  API profile lookups failing ({API_PROBE} in a row), "
+                              f"using the browser for the rest")
+            if profile is not None:
+                self._save(profile, 'api')
+            elif self.use_browser:
+                self._browser_needed.set()
+                await fallback.put(username)
+            else:
+                self._miss()
+
+    async def _browser_worker(self, runtime, fallback, waiter):
+        async def tab(context):
+            page = await context.new_page()
+            while True:
+                username = await fallback.get()
+                if username is None:
+                    break
+                try:
+                    profile = await fetch_profile_page(page, username, waiter)
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    print(f"    Error loading u/{username}: {e}")
+                    profile = None
+                if profile is not None:
+                    self._save(profile, 'browser')
+                else:
+                    self._miss()
+
+        async with runtime.context() as context:
+            await asyncio.gather(*(tab(context) for _ in range(self.pages_per_context)))
+
+    async def _run_browser(self, fallback):
+        """Start the browser pool once the first agent needs it"""
+        await self._browser_needed.wait()
+
+        # Playwright is only needed for the fallback, so API-only runs work without it
+        from page_readiness import AsyncPageWaiter
+        from scraper_runtime import AsyncScraperRuntime
+
+        waiter = AsyncPageWaiter()
+        async with AsyncScraperRuntime(max_contexts=self.browser_contexts) as runtime:
+            await asyncio.gather(*(self._browser_worker(runtime, fallback, waiter)
+                                   for _ in range(self.browser_contexts)))
+        waiter.report()
+
+    async def run(self, names):
+        now = time.time()
+        todo = [name for name in names if not self.store.is_fresh(name, now)]
+        self.stats['skipped'] = len(names) - len(todo)
+        self._total = len(todo)
+        self._start = time.perf_counter()
+        if not todo:
+            return self.stats
+
+        # Workers pop from the end; reverse so agents go in list order
+        todo.reverse()
+        fallback = asyncio.Queue()
+        self._browser_needed = asyncio.Event()
+
+        async def api_stage():
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                await asyncio.gather(*(self._api_worker(executor, todo, fallback)
+                                       for _ in range(self.concurrency)))
+
+        browser = asyncio.create_task(self._run_browser(fallback)) if self.use_browser else None
+        await api_stage()
+        if browser is not None and not self._browser_needed.is_set():
+            browser.cancel()
+        elif browser is not None:
+            # One end marker per tab, queued behind the remaining agents
+            for _ in range(self.browser_contexts * self.pages_per_context):
+                await fallback.put(None)
+            await browser
+        return self.stats
+
+
+def enrich_profiles(names, path=PROFILES_FILE, max_age=DEFAULT_MAX_AGE, **options):
+    """Enrich `names` into the NDJSON file at `path`; returns (username -> profile, stats)"""
+    start = time.perf_counter()
+    with ProfileStore(path, max_age=max_age) as store:
+        stats = asyncio.run(ProfileEnricher(store, **options).run(names))
+    stats['seconds'] = time.perf_counter() - start
+
+    profiles = load_profiles(path)
+    return {name: profiles[name] for name in names if name in profiles}, stats
+
+
+def print_enrichment(stats):
+    fetched = stats['api'] + stats['browser']
+    seconds = stats.get('seconds', 0)
+    print(f"✓ Enriched {fetched} profiles ({stats['api']} via API, {stats['browser']} via browser), "
+          f"{stats['skipped']} fresh on disk, {stats['missing']} not found"
+          + (f" in {seconds:.1f}s ({fetched / seconds:.0f}/sec)" if seconds else ''))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fetch real stats for every agent in an agent list")
+    parser.add_argument('input', nargs='?', default='moltbook-agents-full.json',
+                        help="agent list JSON ({'agents': [...]}, network-data.json, or a list)")
+    parser.add_argument('--output', default=PROFILES_FILE, help="NDJSON file profiles are appended to")
+    parser.add_argument('--max-age', type=float, default=DEFAULT_MAX_AGE / 3600, metavar='HOURS',
+                        help="skip agents fetched more recently than this")
+    parser.add_argument('--force', action='store_true', help="refetch every agent")
+    parser.add_argument('--limit', type=int, default=0, help="only the first N agents (0 for all)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help="API lookups in flight")
+    parser.add_argument('--browser-contexts', type=int, default=DEFAULT_BROWSER_CONTEXTS)
+    parser.add_argument('--pages-per-context', type=int, default=DEFAULT_PAGES_PER_CONTEXT)
+    parser.add_argument('--no-api', action='store_true', help="browser only")
+    parser.add_argument('--no-browser', action='store_true', help="API only, no Playwright fallback")
+    parser.add_argument('--api-base', help="API base URL (default: $MOLTBOOK_API_BASE or the live API)")
+    add_cache_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("🔎 Moltbook Network Map - Profile Enrichment")
+    print("=" * 50)
+
+    if args.api_base:
+        configure_api_base(args.api_base)
+    cache = cache_from_args(args)
+    configure_client(max_per_host=args.concurrency, cache=cache)
+
+    names = load_agent_names(args.input)
+    if args.limit:
+        names = names[:args.limit]
+    print(f"Enriching {len(names)} agents from {args.input} -> {args.output}")
+
+    _, stats = enrich_profiles(
+        names, path=args.output, max_age=None if args.force else args.max_age * 3600,
+        concurrency=args.concurrency, api_key=os.environ.get('MOLTBOOK_API_KEY'),
+        use_api=not args.no_api, use_browser=not args.no_browser,
+        browser_contexts=args.browser_contexts, pages_per_context=args.pages_per_context
+    )
+    print_enrichment(stats)
+    if cache is not None:
+        print(cache.summary())
+        cache.close()
+
+
+if __name__ == '__main__':
+    main()
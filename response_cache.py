@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - HTTP Response Cache
+Persistent, compressed GET cache used by the shared HTTP client
+
+Entries are keyed by URL plus auth scope (a hash of the Authorization
+header, never the token itself) and stored zlib-compressed in a SQLite
+file. Modes:
+
+    normal   serve entries younger than the TTL, otherwise revalidate
+             with If-None-Match / If-Modified-Since and reuse the body
+             on 304
+    record   always go to the network and store what comes back
+    replay   never touch the network; a miss is a 504 response, the
+             same as HTTP's only-if-cached
+
+Entries older than max_age are dropped and the least recently used ones
+are evicted once the cache grows past max_bytes.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_MODES = ('normal', 'record', 'replay')
+DEFAULT_CACHE_DIR = '.http-cache'
+DEFAULT_TTL = 0                         # always revalidate
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DB_FILE = 'responses.sqlite'
+
+# Headers that describe the stored body; hop-by-hop and encoding headers
+# are dropped because the body is kept decoded
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def auth_scope(headers):
+    """Short hash of the Authorization header, or 'public'"""
+    auth = (headers or {}).get('Authorization')
+    if not auth:
+        return 'public'
+    return hashlib.sha256(auth.encode('utf-8')).hexdigest()[:16]
+
+
+def cache_key(url, headers):
+    return hashlib.sha256(f"{auth_scope(headers)} {url}".encode('utf-8')).hexdigest()
+
+
+def _build_response(url, status, headers, body, cache_status):
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response._content = body
+    response.headers = CaseInsensitiveDict(headers)
+    response.headers['X-Cache'] = cache_status
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+    response.reason = 'OK' if status == 200 else 'Gateway Timeout'
+    return response
+
+
+class ResponseCache:
+    """SQLite-backed response cache shared across threads"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, mode='normal', ttl=DEFAULT_TTL,
+                 max_age=DEFAULT_MAX_AGE, max_bytes=DEFAULT_MAX_BYTES):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode} (expected one of {CACHE_MODES})")
+
+        os.makedirs(directory, exist_ok=True)
+        self.mode = mode
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'revalidated': 0, 'fetched': 0, 'misses': 0, 'evicted': 0}
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, DB_FILE), check_same_thread=False)
+        self._db.execute(SCHEMA)
+        self._db.commit()
+        self._expire()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def lookup(self, url, headers):
+        """The stored entry for a GET, as a dict, or None"""
+        key = cache_key(url, headers)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, etag, last_modified, stored_at "
+                "FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, stored_headers, body, etag, last_modified, stored_at = row
+        return {
+            'key': key,
+            'url': url,
+            'status': status,
+            'headers': json.loads(stored_headers),
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': stored_at,
+        }
+
+    def is_fresh(self, entry):
+        return self.ttl > 0 and time.time() - entry['stored_at'] < self.ttl
+
+    def conditional_headers(self, entry):
+        """Revalidation headers for a stale entry"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def respond(self, entry, cache_status):
+        """Turn a stored entry into a requests.Response"""
+        self._touch(entry['key'], refreshed=cache_status == 'REVALIDATED')
+        self._count('hits' if cache_status == 'HIT' else 'revalidated')
+        return _build_response(entry['url'], entry['status'], entry['headers'],
+                               zlib.decompress(entry['body']), cache_status)
+
+    def miss_response(self, url):
+        """What replay mode returns for a URL that was never recorded"""
+        self._count('misses')
+        return _build_response(url, 504, {'Content-Type': 'application/json'},
+                               b'{"error": "not in response cache"}', 'MISS')
+
+    def _touch(self, key, refreshed):
+        """Mark an entry used; a 304 also restarts its TTL"""
+        now = time.time()
+        with self._lock:
+            if refreshed:
+                self._db.execute("UPDATE responses SET stored_at = ?, last_used = ? WHERE key = ?",
+                                 (now, now, key))
+            else:
+                self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+    def store(self, url, request_headers, response):
+        """Save a 200 response unless it is marked no-store"""
+        if response.status_code != 200:
+            return
+        if 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        body = zlib.compress(response.content, 6)
+        now = time.time()
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, status, headers, body, size, etag, last_modified, stored_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (cache_key(url, request_headers), url, response.status_code, json.dumps(headers),
+                 body, len(body), response.headers.get('ETag'),
+                 response.headers.get('Last-Modified'), now, now)
+            )
+            self._db.commit()
+            self.stats['fetched'] += 1
+        self._evict_to_size()
+
+    def _expire(self):
+        """Drop entries older than max_age"""
+        if not self.max_age:
+            return
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM responses WHERE stored_at < ?", (time.time() - self.max_age,)
+            )
+            self._db.commit()
+            self.stats['evicted'] += cursor.rowcount
+
+    def _evict_to_size(self):
+        """Evict least recently used entries until under 90% of max_bytes"""
+        if not self.max_bytes:
+            return
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            target = self.max_bytes * 0.9
+            rows = self._db.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall()
+            doomed = []
+            for key, size in rows:
+                if total <= target:
+                    break
+                doomed.append((key,))
+                total -= size
+            self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+            self._db.commit()
+            self.stats['evicted'] += len(doomed)
+
+    def summary(self):
+        s = self.stats
+        return (f"cache ({self.mode}): {s['hits']} hits, {s['revalidated']} revalidated, "
+                f"{s['fetched']} fetched, {s['misses']} misses, {s['evicted']} evicted")
+
+
+def add_cache_arguments(parser):
+    """Add the --cache* options shared by the collectors"""
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_DIR, metavar='DIR',
+                        help=f"cache API responses on disk (default dir: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--cache-mode', choices=CACHE_MODES, default='normal',
+                        help="normal: revalidate stale entries; record: refetch and store; "
+                             "replay: offline, cache only")
+    parser.add_argument('--cache-ttl', type=int, default=DEFAULT_TTL, metavar='SECONDS',
+                        help="serve cached responses younger than this without revalidating")
+
+
+def cache_from_args(args):
+    """ResponseCache for parsed --cache* options, or None"""
+    if not args.cache and args.cache_mode == 'normal':
+        return None
+    return ResponseCache(args.cache or DEFAULT_CACHE_DIR, mode=args.cache_mode, ttl=args.cache_ttl)
@@ -3,19 +3,21 @@
 Scrape the /u (agent directory) page on Moltbook
 """
 
-from playwright.sync_api import sync_playwright
 import json
-import time
 
-with sync_playwright() as p:
-    browser = p.chromium.launch(headless=True)
-    page = browser.new_page()
+from page_readiness import AGENT_LINKS, PageWaiter
+from scraper_runtime import SCREENSHOT_BLOCKED, ScraperRuntime
+
+waiter = PageWaiter()
+
+with ScraperRuntime(block=SCREENSHOT_BLOCKED) as runtime:
+    page = runtime.new_page()
     
     print("Loading agent directory...")
     page.goto("https://www.moltbook.com/u", timeout=20000)
     
     print("Waiting for agents to load...")
-    time.sleep(10)
+    waiter.content(page, AGENT_LINKS, label='directory')
     
     # Take screenshot
     page.screenshot(path="agent-directory.png")
@@ -42,6 +44,6 @@ with sync_playwright() as p:
     # Save
     with open('agent-directory.json', 'w') as f:
         json.dump({'agents': agent_links, 'count': len(agent_links)}, f, indent=2)
-    
-    browser.close()
     print("\nSaved to agent-directory.json")
+    
+    waiter.report()
@@ -3,127 +3,117 @@
 Aggressively scrape as many agents as possible from Moltbook
 """
 
-from playwright.sync_api import sync_playwright
 import json
 import time
 
+from agent_capture import AgentCapture, LinkHarvester
+from page_readiness import AGENT_LINKS, PageWaiter
+from scraper_runtime import ScraperRuntime
+
+MAX_SCROLLS = 200
+NEW_NODES_TIMEOUT = 3   # seconds without new agent nodes before a scroll counts as empty
+
+def scroll_page(page):
+    """Scroll to the bottom, then a bit further, in one round trip"""
+    page.evaluate('() => { window.scrollTo(0, document.body.scrollHeight); window.scrollBy(0, 1000); }')
+
+def harvest_new(agents, harvester, capture):
+    """Merge only what arrived since the last tick: new link nodes and new JSON records"""
+    agents.update(harvester.drain())
+    agents.update(capture.drain())
+
+def load_more(page):
+    """Click "Load More" if the directory shows one; returns whether it did"""
+    try:
+        button = page.query_selector('button:has-text("Load More")')
+        if button:
+            button.click()
+            return True
+    except:
+        pass
+    return False
+
+def scrape_tab(page, name, agents, harvester, capture, waiter, scrolls=20):
+    """Switch the directory tab and scroll it until no new agent nodes appear"""
+    button = page.query_selector(f'button:has-text("{name}")')
+    if not button:
+        return
+    button.click()
+    
+    for _ in range(scrolls):
+        if not harvester.wait_for_new(waiter, label='tab', timeout=NEW_NODES_TIMEOUT):
+            break
+        harvest_new(agents, harvester, capture)
+        page.evaluate('window.scrollBy(0, 1000)')
+    
+    harvest_new(agents, harvester, capture)
+    print(f"  After {name} tab: {len(agents)} agents")
+
 def scrape_agents_aggressive(target=5000):
     print(f"🕸️  Aggressive Moltbook Agent Scraper (target: {target})")
     print("=" * 50)
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    waiter = PageWaiter()
+    
+    with ScraperRuntime() as runtime:
+        page = runtime.new_page()
+        capture = AgentCapture(page)
         
         print("Loading agent directory...")
         page.goto("https://www.moltbook.com/u", timeout=30000)
-        time.sleep(5)
+        waiter.content(page, AGENT_LINKS, label='directory')
         
+        # The observer starts with the links already rendered and from then
+        # on only buffers agent nodes added after each drain
+        harvester = LinkHarvester(page)
         agents = set()
-        last_count = 0
-        no_change_count = 0
+        harvest_new(agents, harvester, capture)
+        last_count = len(agents)
         
         # Try aggressive scrolling
-        for scroll_num in range(200):  # Try up to 200 scrolls
-            # Scroll to bottom
-            page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-            time.sleep(0.5)
-            
-            # Also try scrolling by pixels
-            page.evaluate('window.scrollBy(0, 1000)')
-            time.sleep(0.5)
-            
-            # Extract agents
-            all_links = page.query_selector_all('a[href^="/u/"]')
-            for link in all_links:
-                href = link.get_attribute('href')
-                if href and href != '/u':
-                    agent = href.replace('/u/', '')
-                    if agent:
-                        agents.add(agent)
+        for scroll_num in range(MAX_SCROLLS):
+            # Click "Load More" when present, otherwise scroll, then wait
+            # for the observer to report new agent nodes
+            if load_more(page):
+                print("  Clicked 'Load More' button")
+                label = 'load-more'
+            else:
+                scroll_page(page)
+                label = 'scroll'
+            grew = harvester.wait_for_new(waiter, label=label, timeout=NEW_NODES_TIMEOUT)
             
+            harvest_new(agents, harvester, capture)
             current_count = len(agents)
             
             if current_count > last_count:
                 print(f"  Scroll {scroll_num + 1}: {current_count} agents")
                 last_count = current_count
-                no_change_count = 0
-            else:
-                no_change_count += 1
             
-            # Stop if no new agents in 10 scrolls
-            if no_change_count >= 10:
-                print(f"  No new agents after {no_change_count} scrolls, stopping...")
+            # Stop on the first scroll that adds no agent nodes
+            if not grew:
+                print(f"  No new agent nodes after scroll {scroll_num + 1}, stopping...")
                 break
             
             # Stop if we hit our target
             if current_count >= target:
                 print(f"  Reached target of {target} agents!")
                 break
-            
-            # Try clicking "Load More" button if it exists
-            try:
-                load_more = page.query_selector('button:has-text("Load More")')
-                if load_more:
-                    load_more.click()
-                    print("  Clicked 'Load More' button")
-                    time.sleep(2)
-            except:
-                pass
         
         print(f"\n✓ Total agents scraped: {len(agents)}")
         
         # Try different tabs/filters
         print("\nTrying different filters...")
         
-        # Try "Recent" tab
-        try:
-            recent_btn = page.query_selector('button:has-text("Recent")')
-            if recent_btn:
-                recent_btn.click()
-                time.sleep(3)
-                
-                for _ in range(20):
-                    page.evaluate('window.scrollBy(0, 1000)')
-                    time.sleep(0.3)
-                
-                all_links = page.query_selector_all('a[href^="/u/"]')
-                for link in all_links:
-                    href = link.get_attribute('href')
-                    if href and href != '/u':
-                        agent = href.replace('/u/', '')
-                        if agent:
-                            agents.add(agent)
-                
-                print(f"  After Recent tab: {len(agents)} agents")
-        except Exception as e:
-            print(f"  Recent tab error: {e}")
-        
-        # Try "Karma" tab
-        try:
-            karma_btn = page.query_selector('button:has-text("Karma")')
-            if karma_btn:
-                karma_btn.click()
-                time.sleep(3)
-                
-                for _ in range(20):
-                    page.evaluate('window.scrollBy(0, 1000)')
-                    time.sleep(0.3)
-                
-                all_links = page.query_selector_all('a[href^="/u/"]')
-                for link in all_links:
-                    href = link.get_attribute('href')
-                    if href and href != '/u':
-                        agent = href.replace('/u/', '')
-                        if agent:
-                            agents.add(agent)
-                
-                print(f"  After Karma tab: {len(agents)} agents")
-        except Exception as e:
-            print(f"  Karma tab error: {e}")
+        for tab in ('Recent', 'Karma'):
+            try:
+                scrape_tab(page, tab, agents, harvester, capture, waiter)
+            except Exception as e:
+                print(f"  {tab} tab error: {e}")
         
-        browser.close()
+        harvest_new(agents, harvester, capture)
     
+    waiter.report()
+    print(f"  {capture.responses} data responses captured, {len(capture.records)} full agent records")
     agents_list = sorted(list(agents))
     
     print(f"\n✅ Final count: {len(agents_list)} agents")
@@ -134,7 +124,9 @@ def scrape_agents_aggressive(target=5000):
         'count': len(agents_list),
         'total_registered': '1,516,273+',
         'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S'),
-        'method': 'aggressive_scroll_with_tabs'
+        'method': 'aggressive_scroll_with_tabs',
+        'capture': 'response_capture+mutation_observer' if capture.active else 'mutation_observer',
+        'agent_records': capture.sorted_records()
     }
     
     with open('moltbook-agents-full.json', 'w') as f:
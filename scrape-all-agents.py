@@ -3,46 +3,46 @@
 Scrape as many agents as possible from Moltbook by scrolling
 """
 
-from playwright.sync_api import sync_playwright
 import json
 import time
 
+from agent_capture import AgentCapture, extract_usernames
+from page_readiness import AGENT_LINKS, PageWaiter
+from scraper_runtime import ScraperRuntime
+
 def scrape_agents(max_agents=500):
     print(f"🕸️  Scraping Moltbook Agents (target: {max_agents})")
     print("=" * 50)
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    waiter = PageWaiter()
+    
+    with ScraperRuntime() as runtime:
+        page = runtime.new_page()
+        capture = AgentCapture(page)
         
         print("Loading agent directory...")
         page.goto("https://www.moltbook.com/u", timeout=20000)
-        time.sleep(5)
+        waiter.content(page, AGENT_LINKS, label='directory')
         
-        agents = set()
+        # The first page may be server-rendered, so read its links once
+        agents = set(extract_usernames(page))
         last_count = 0
         scroll_attempts = 0
         max_scrolls = 50
         
         while len(agents) < max_agents and scroll_attempts < max_scrolls:
-            # Find all agent links
-            all_links = page.query_selector_all('a[href^="/u/"]')
-            
-            for link in all_links:
-                href = link.get_attribute('href')
-                if href and href != '/u':
-                    agent_name = href.replace('/u/', '')
-                    if agent_name:
-                        agents.add(agent_name)
+            # Agents from the captured JSON, or one batched link read
+            # until the directory has served any
+            capture.harvest(page, agents)
             
             new_count = len(agents)
             if new_count > last_count:
                 print(f"  Agents found: {new_count}")
                 last_count = new_count
             
-            # Scroll down to load more
-            page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-            time.sleep(1)
+            # Scroll down and wait for the data request it triggers
+            waiter.response(page, lambda: page.evaluate('window.scrollTo(0, document.body.scrollHeight)'),
+                            label='scroll', timeout=1)
             scroll_attempts += 1
             
             # Check if we're still loading new agents
@@ -50,18 +50,22 @@ def scrape_agents(max_agents=500):
                 print("  No new agents loading, stopping...")
                 break
         
-        browser.close()
+        capture.harvest(page, agents)
     
+    waiter.report()
     agents_list = sorted(list(agents))
     
     print(f"\n✓ Total agents scraped: {len(agents_list)}")
+    print(f"  {capture.responses} data responses captured, {len(capture.records)} full agent records")
     
     # Save to file
     data = {
         'agents': agents_list,
         'count': len(agents_list),
         'total_registered': '1,516,273',
-        'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S')
+        'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'method': 'response_capture' if capture.active else 'dom_links',
+        'agent_records': capture.sorted_records()
     }
     
     with open('moltbook-agents-full.json', 'w') as f:
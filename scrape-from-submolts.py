@@ -2,96 +2,174 @@
 """
 Scrape agents from different submolts (communities)
 Each submolt might have different active members
+
+Submolt pages are visited by a pool of browser contexts (borrowed from
+the shared scraper runtime) pulling from one shared queue. Each context
+runs a few tabs, and a global semaphore caps how many navigations are in
+flight across the whole pool. Agents are
+merged into the result set as each page finishes.
 """
 
-from playwright.sync_api import sync_playwright
+import argparse
+import asyncio
 import json
 import time
 
-def scrape_submolt_page(page):
+from page_readiness import AGENT_LINKS, AsyncPageWaiter
+from scraper_runtime import AsyncScraperRuntime
+
+DEFAULT_WORKERS = 4             # browser contexts
+DEFAULT_PAGES_PER_WORKER = 2    # tabs per context
+DEFAULT_MAX_INFLIGHT = 8        # navigations across the whole pool
+PAGE_TIMEOUT = 5                # readiness fallback per submolt page
+
+waiter = AsyncPageWaiter()
+
+async def scrape_submolt_page(page):
     """Scrape list of submolts"""
     print("Getting submolt list...")
-    page.goto("https://www.moltbook.com/m", timeout=20000)
-    time.sleep(5)
-    
+    await page.goto("https://www.moltbook.com/m", timeout=20000)
+    await waiter.content(page, 'a[href^="/m/"]', label='submolt-list')
+
     # Find submolt links
-    links = page.query_selector_all('a[href^="/m/"]')
+    links = await page.query_selector_all('a[href^="/m/"]')
     submolts = set()
-    
+
     for link in links:
-        href = link.get_attribute('href')
+        href = await link.get_attribute('href')
         if href and href != '/m':
             submolt = href.replace('/m/', '')
             if submolt:
                 submolts.add(submolt)
-    
+
     print(f"Found {len(submolts)} submolts")
-    return list(submolts)
+    return sorted(submolts)
 
-def scrape_submolt_members(page, submolt):
+async def scrape_submolt_members(page, submolt):
     """Get agents who posted in a submolt"""
-    print(f"\n  Checking m/{submolt}...")
     url = f"https://www.moltbook.com/m/{submolt}"
-    
+
     try:
-        page.goto(url, timeout=15000)
-        time.sleep(3)
-        
+        await page.goto(url, timeout=15000)
+        await waiter.content(page, AGENT_LINKS, label='submolt', timeout=PAGE_TIMEOUT)
+
         # Find author links in posts
-        author_links = page.query_selector_all('a[href^="/u/"]')
+        author_links = await page.query_selector_all(AGENT_LINKS)
         agents = set()
-        
+
         for link in author_links:
-            href = link.get_attribute('href')
+            href = await link.get_attribute('href')
             if href and href != '/u':
                 agent = href.replace('/u/', '')
                 if agent:
                     agents.add(agent)
-        
-        print(f"    Found {len(agents)} agents in m/{submolt}")
+
         return agents
-        
+
     except Exception as e:
-        print(f"    Error: {e}")
+        print(f"    Error in m/{submolt}: {e}")
         return set()
 
-def main():
-    print("🕸️  Scraping Agents from Submolts")
-    print("=" * 50)
-    
+async def context_worker(runtime, queue, pages_per_worker, inflight, on_result):
+    """One pooled browser context whose tabs pull submolts until the queue is empty"""
+    async def tab(context):
+        page = await context.new_page()
+        while True:
+            try:
+                submolt = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            async with inflight:
+                agents = await scrape_submolt_members(page, submolt)
+            on_result(submolt, agents)
+        await page.close()
+
+    async with runtime.context() as context:
+        await asyncio.gather(*(tab(context) for _ in range(pages_per_worker)))
+
+async def scrape_submolts(runtime, submolts, workers=DEFAULT_WORKERS,
+                          pages_per_worker=DEFAULT_PAGES_PER_WORKER,
+                          max_inflight=DEFAULT_MAX_INFLIGHT):
+    """Scrape every submolt with the context pool; returns (agents, submolts in completion order)"""
+    queue = asyncio.Queue()
+    for submolt in submolts:
+        queue.put_nowait(submolt)
+    inflight = asyncio.Semaphore(max_inflight)
+
     all_agents = set()
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    checked = []
+
+    def on_result(submolt, agents):
+        before = len(all_agents)
+        all_agents.update(agents)
+        checked.append(submolt)
+        print(f"  [{len(checked)}/{len(submolts)}] m/{submolt}: {len(agents)} agents, "
+              f"+{len(all_agents) - before} new (total: {len(all_agents)})")
+
+    await asyncio.gather(*(
+        context_worker(runtime, queue, pages_per_worker, inflight, on_result)
+        for _ in range(workers)
+    ))
+    return all_agents, checked
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape agents from every submolt page")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="browser contexts pulling from the submolt queue")
+    parser.add_argument('--pages-per-worker', type=int, default=DEFAULT_PAGES_PER_WORKER,
+                        help="tabs open in each context")
+    parser.add_argument('--max-inflight', type=int, default=DEFAULT_MAX_INFLIGHT,
+                        help="navigations in flight across all workers")
+    parser.add_argument('--limit', type=int, default=0,
+                        help="only check the first N submolts (0 for all)")
+    return parser.parse_args()
+
+async def run(args):
+    async with AsyncScraperRuntime(max_contexts=args.workers) as runtime:
         # Get submolt list
-        submolts = scrape_submolt_page(page)
-        
+        page = await runtime.new_page()
+        submolts = await scrape_submolt_page(page)
+        await page.close()
+        if args.limit:
+            submolts = submolts[:args.limit]
+
         # Check each submolt
-        for submolt in submolts[:20]:  # Check first 20
-            agents = scrape_submolt_members(page, submolt)
-            all_agents.update(agents)
-            print(f"    Total unique agents: {len(all_agents)}")
-            time.sleep(1)
-        
-        browser.close()
-    
+        print(f"\nChecking {len(submolts)} submolts with {args.workers} contexts x "
+              f"{args.pages_per_worker} tabs (max {args.max_inflight} in flight)...")
+        all_agents, checked = await scrape_submolts(
+            runtime, submolts, workers=args.workers,
+            pages_per_worker=args.pages_per_worker, max_inflight=args.max_inflight
+        )
+
+    return all_agents, checked
+
+def main():
+    args = parse_args()
+
+    print("🕸️  Scraping Agents from Submolts")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    all_agents, checked = asyncio.run(run(args))
+    seconds = time.perf_counter() - start
+
     agents_list = sorted(list(all_agents))
-    
+
     print(f"\n✅ Total agents from submolts: {len(agents_list)}")
-    
+    print(f"   {len(checked)} submolts in {seconds:.1f}s")
+    waiter.report()
+
     # Save
     data = {
         'agents': agents_list,
         'count': len(agents_list),
         'method': 'submolt_scraping',
-        'submolts_checked': submolts[:20]
+        'submolts_checked': checked
     }
-    
+
     with open('submolt-agents.json', 'w') as f:
         json.dump(data, f, indent=2)
-    
+
     print(f"✓ Saved to submolt-agents.json")
     print(f"\nSample: {agents_list[:20]}")
 
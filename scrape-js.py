@@ -7,20 +7,23 @@ import json
 import time
 
 try:
-    from playwright.sync_api import sync_playwright
+    import playwright
 except ImportError:
     import subprocess
     subprocess.run(["pip3", "install", "playwright"], check=True)
     subprocess.run(["playwright", "install", "chromium"], check=True)
-    from playwright.sync_api import sync_playwright
+
+from page_readiness import AGENT_LINKS, PageWaiter
+from scraper_runtime import ScraperRuntime
 
 def scrape_homepage():
     print("🕸️  Scraping Moltbook with JavaScript rendering")
     print("=" * 50)
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    waiter = PageWaiter()
+    
+    with ScraperRuntime() as runtime:
+        page = runtime.new_page()
         
         # Go to homepage with shorter timeout
         print("\n📊 Loading homepage...")
@@ -28,7 +31,7 @@ def scrape_homepage():
         
         # Wait for content to load
         print("⏳ Waiting for content to render...")
-        time.sleep(5)
+        waiter.content(page, AGENT_LINKS, label='homepage')
         
         # Get all the text
         content = page.content()
@@ -61,9 +64,8 @@ def scrape_homepage():
                         print(f"  Found: {agent_name}")
             except:
                 pass
-        
-        browser.close()
     
+    waiter.report()
     print(f"\n✓ Found {len(agents)} agents total")
     
     # Save results
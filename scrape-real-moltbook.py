@@ -9,51 +9,25 @@ import time
 from collections import defaultdict
 
 try:
-    from playwright.sync_api import sync_playwright
+    import playwright
 except ImportError:
     print("Installing playwright...")
     import subprocess
     subprocess.run(["pip3", "install", "playwright"], check=True)
     subprocess.run(["playwright", "install", "chromium"], check=True)
-    from playwright.sync_api import sync_playwright
 
-def scrape_agent_profile(page, agent_name):
-    """Scrape an individual agent profile"""
-    url = f"https://www.moltbook.com/u/{agent_name}"
-    
-    try:
-        page.goto(url, wait_until="networkidle", timeout=10000)
-        time.sleep(2)  # Let content load
-        
-        # Extract agent info
-        agent_data = {
-            'username': agent_name,
-            'posts': [],
-            'followers': 0,
-            'following': 0,
-            'karma': 0
-        }
-        
-        # Try to find stats
-        content = page.content()
-        
-        # Look for post titles/links
-        posts = page.query_selector_all('a[href^="/post/"]')
-        agent_data['posts'] = [p.get_attribute('href') for p in posts[:10]]
-        
-        print(f"  {agent_name}: {len(agent_data['posts'])} posts found")
-        return agent_data
-        
-    except Exception as e:
-        print(f"  Error scraping {agent_name}: {e}")
-        return None
+from page_readiness import AGENT_LINKS, PageWaiter
+from profile_enrichment import enrich_profiles, print_enrichment
+from scraper_runtime import ScraperRuntime
+
+waiter = PageWaiter()
 
 def scrape_homepage(page):
     """Scrape homepage for agent list"""
     url = "https://www.moltbook.com"
     
     page.goto(url, wait_until="networkidle")
-    time.sleep(3)
+    waiter.stable(page, AGENT_LINKS, label='homepage', timeout=3)
     
     agents = []
     
@@ -78,9 +52,8 @@ def main():
     nodes = []
     edges = []
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    with ScraperRuntime() as runtime:
+        page = runtime.new_page()
         
         print("\n📊 Scraping homepage...")
         homepage_agents = scrape_homepage(page)
@@ -89,21 +62,23 @@ def main():
         # Also try known agents
         known_agents = ['AgentDroverland', 'SimeonsClaw', 'SimeonAgent']
         all_agents.update(known_agents)
-        
-        print(f"\n👥 Scraping {len(all_agents)} agent profiles...")
-        
-        for agent_name in list(all_agents)[:20]:  # Limit to 20 for now
-            agent_data = scrape_agent_profile(page, agent_name)
-            
-            if agent_data:
-                nodes.append({
-                    'id': agent_name,
-                    'username': agent_name,
-                    'posts_count': len(agent_data['posts']),
-                    'karma': agent_data.get('karma', 0)
-                })
-        
-        browser.close()
+    
+    # Profiles go through the enrichment stage (API first, browser fallback)
+    print(f"\n👥 Enriching {len(all_agents)} agent profiles...")
+    profiles, stats = enrich_profiles(sorted(all_agents))
+    print_enrichment(stats)
+    
+    for agent_name, profile in profiles.items():
+        print(f"  {agent_name}: {profile.get('karma', 0)} karma, {profile.get('followers', 0)} followers, "
+              f"{len(profile.get('posts', []))} recent posts")
+        nodes.append({
+            'id': agent_name,
+            'username': agent_name,
+            'posts_count': profile.get('posts_count', len(profile.get('posts', []))),
+            'karma': profile.get('karma', 0),
+            'followers': profile.get('followers', 0),
+            'following': profile.get('following', 0)
+        })
     
     # Save data
     network_data = {
@@ -120,6 +95,7 @@ def main():
     with open('real-moltbook-data.json', 'w') as f:
         json.dump(network_data, f, indent=2)
     
+    waiter.report()
     print(f"\n✓ Scraped {len(nodes)} agents")
     print(f"✓ Saved to real-moltbook-data.json")
     
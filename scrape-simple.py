@@ -3,10 +3,11 @@
 Simple scraper for Moltbook - just get what we can
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
 
+from http_client import get_client
+
 def scrape_with_requests():
     """Try simple HTTP request first"""
     
@@ -15,7 +16,7 @@ def scrape_with_requests():
     
     # Try homepage
     print("\n📊 Checking homepage...")
-    resp = requests.get("https://www.moltbook.com", timeout=10)
+    resp = get_client().get("https://www.moltbook.com", timeout=10)
     soup = BeautifulSoup(resp.text, 'html.parser')
     
     # Find agent links
@@ -38,7 +39,7 @@ def scrape_with_requests():
     for agent in known:
         print(f"Checking {agent}...")
         try:
-            resp = requests.get(f"https://www.moltbook.com/u/{agent}", timeout=5)
+            resp = get_client().get(f"https://www.moltbook.com/u/{agent}", timeout=5)
             if resp.status_code == 200:
                 nodes.append({
                     'id': agent,
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Scraper Runtime
+One long-lived browser, pooled contexts and cheap page loads for every
+Playwright script
+
+    with ScraperRuntime() as runtime:
+        page = runtime.new_page()
+        ...
+
+Per session the browser is launched once and contexts are handed out from
+a pool (runtime.context()). Set MOLTBOOK_BROWSER_CDP to a running
+browser's CDP endpoint (see `python3 scraper_runtime.py --serve`) and
+startup is paid once across runs as well.
+
+Every context routes its requests through the runtime:
+
+    blocked     images, media, fonts and stylesheets (configurable) plus
+                analytics/telemetry hosts are aborted
+    cached      routing disables Chromium's HTTP cache, so scripts and
+                stylesheets are kept in a ResponseCache under the state
+                directory and revalidated with ETag/Last-Modified
+    storage     cookies and localStorage are saved on close and loaded
+                into every new context on the next run
+
+On close the runtime prints requests, bytes transferred, blocked requests
+and cache hits for the run.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlsplit
+
+from playwright.async_api import async_playwright
+from playwright.sync_api import sync_playwright
+from requests.structures import CaseInsensitiveDict
+
+from response_cache import ResponseCache
+
+STATE_DIR = '.scraper-state'
+STORAGE_STATE_FILE = 'storage-state.json'
+ASSET_CACHE_DIR = 'asset-cache'
+ASSET_TTL = 24 * 3600
+BROWSER_ENDPOINT_ENV = 'MOLTBOOK_BROWSER_CDP'
+DEFAULT_CDP_PORT = 9222
+
+BLOCKED_RESOURCES = frozenset({'image', 'media', 'font', 'stylesheet'})
+SCREENSHOT_BLOCKED = frozenset({'media'})   # keep pages looking right in screenshots
+CACHED_RESOURCES = frozenset({'script', 'stylesheet'})
+
+ANALYTICS_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+    'segment.io', 'segment.com', 'plausible.io', 'vercel-insights.com',
+    'sentry.io', 'hotjar.com', 'mixpanel.com', 'posthog.com', 'clarity.ms',
+)
+ANALYTICS_PATHS = ('/_vercel/insights', '/_vercel/speed-insights', '/cdn-cgi/rum')
+
+
+def is_analytics(url):
+    """True for requests to telemetry hosts or paths"""
+    parts = urlsplit(url)
+    host = parts.hostname or ''
+    if any(host == name or host.endswith('.' + name) for name in ANALYTICS_HOSTS):
+        return True
+    return parts.path.startswith(ANALYTICS_PATHS)
+
+
+class _Fetched:
+    """The bits of a Playwright APIResponse that ResponseCache.store reads"""
+
+    def __init__(self, status, headers, body):
+        self.status_code = status
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = body
+
+
+class RuntimeStats:
+    """Per-run request, transfer and cache counters"""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.blocked = 0
+        self.cache_hits = 0
+        self.bytes_saved = 0
+        self.contexts = 0
+        self.startup_seconds = 0.0
+        self.reused_browser = False
+
+    def report(self):
+        browser = 'reused' if self.reused_browser else 'launched'
+        print(f"\n📦 Scraper runtime: {self.requests} requests, {self.bytes / 1e6:.2f} MB transferred, "
+              f"{self.blocked} blocked, {self.cache_hits} assets from cache "
+              f"({self.bytes_saved / 1e6:.2f} MB saved)")
+        print(f"   {self.contexts} contexts, browser {browser} in {self.startup_seconds:.1f}s")
+
+
+class _Runtime:
+    def __init__(self, state_dir=STATE_DIR, block=BLOCKED_RESOURCES, headless=True,
+                 cache_assets=True, persist_state=True):
+        os.makedirs(state_dir, exist_ok=True)
+        self.state_file = os.path.join(state_dir, STORAGE_STATE_FILE)
+        self.block = frozenset(block)
+        self.headless = headless
+        self.persist_state = persist_state
+        self.asset_cache = (ResponseCache(os.path.join(state_dir, ASSET_CACHE_DIR), ttl=ASSET_TTL)
+                            if cache_assets else None)
+        self.stats = RuntimeStats()
+
+        self.browser = None
+        self._playwright = None
+        self._contexts = []
+        self._idle = []
+        self._default = None
+        self._from_cache = {}       # url -> cache-fulfilled requests not yet finished
+
+    def _context_options(self):
+        if self.persist_state and os.path.exists(self.state_file):
+            return {'storage_state': self.state_file}
+        return {}
+
+    def _plan(self, request):
+        """('abort' | 'continue' | 'hit' | 'fetch', cache entry) for one request"""
+        if request.resource_type in self.block or is_analytics(request.url):
+            return 'abort', None
+        if (self.asset_cache is None or request.method != 'GET'
+                or request.resource_type not in CACHED_RESOURCES):
+            return 'continue', None
+        entry = self.asset_cache.lookup(request.url, None)
+        if entry and self.asset_cache.is_fresh(entry):
+            return 'hit', entry
+        return 'fetch', entry
+
+    def _fetch_headers(self, request, entry):
+        if entry is None:
+            return None
+        return {**request.headers, **self.asset_cache.conditional_headers(entry)}
+
+    def _cached_response(self, url, entry, status):
+        """Fulfil arguments for a cached asset, counting it as a cache hit"""
+        response = self.asset_cache.respond(entry, status)
+        self.stats.cache_hits += 1
+        self.stats.bytes_saved += len(response.content)
+        self._from_cache[url] = self._from_cache.get(url, 0) + 1
+        return {'status': response.status_code, 'headers': dict(response.headers), 'body': response.content}
+
+    def _count_transfer(self, url, sizes):
+        self.stats.requests += 1
+        if self._from_cache.get(url):
+            self._from_cache[url] -= 1
+            return
+        self.stats.bytes += sizes.get('responseBodySize', 0) + sizes.get('responseHeadersSize', 0)
+
+
+class ScraperRuntime(_Runtime):
+    """Scraper runtime for sync_playwright scripts"""
+
+    def __enter__(self):
+        start = time.perf_counter()
+        self._playwright = sync_playwright().start()
+        endpoint = os.environ.get(BROWSER_ENDPOINT_ENV)
+        if endpoint:
+            self.browser = self._playwright.chromium.connect_over_cdp(endpoint)
+            self.stats.reused_browser = True
+        else:
+            self.browser = self._playwright.chromium.launch(headless=self.headless)
+        self.stats.startup_seconds = time.perf_counter() - start
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _route(self, route):
+        request = route.request
+        action, entry = self._plan(request)
+        if action == 'abort':
+            self.stats.blocked += 1
+            route.abort()
+        elif action == 'continue':
+            route.continue_()
+        elif action == 'hit':
+            route.fulfill(**self._cached_response(request.url, entry, 'HIT'))
+        else:
+            try:
+                response = route.fetch(headers=self._fetch_headers(request, entry))
+            except Exception:
+                route.continue_()
+                return
+            if response.status == 304 and entry:
+                route.fulfill(**self._cached_response(request.url, entry, 'REVALIDATED'))
+                return
+            self.asset_cache.store(request.url, None, _Fetched(response.status, response.headers, response.body()))
+            route.fulfill(response=response)
+
+    def _on_finished(self, request):
+        try:
+            sizes = request.sizes()
+        except Exception:
+            sizes = {}
+        self._count_transfer(request.url, sizes)
+
+    def _acquire(self):
+        if self._idle:
+            return self._idle.pop()
+        context = self.browser.new_context(**self._context_options())
+        context.route('**/*', self._route)
+        context.on('requestfinished', self._on_finished)
+        self._contexts.append(context)
+        self.stats.contexts += 1
+        return context
+
+    def _release(self, context):
+        for page in list(context.pages):
+            page.close()
+        self._idle.append(context)
+
+    @contextmanager
+    def context(self):
+        """Borrow a pooled context; its pages are closed when it is returned"""
+        context = self._acquire()
+        try:
+            yield context
+        finally:
+            self._release(context)
+
+    def new_page(self):
+        """A new page in the runtime's default context"""
+        if self._default is None:
+            self._default = self._acquire()
+        return self._default.new_page()
+
+    def close(self):
+        if self.browser is None:
+            return
+        if self.persist_state and self._contexts:
+            self._contexts[0].storage_state(path=self.state_file)
+        for context in self._contexts:
+            context.close()
+        self.browser.close()
+        self._playwright.stop()
+        self.browser = None
+        if self.asset_cache is not None:
+            self.asset_cache.close()
+        self.stats.report()
+
+
+class AsyncScraperRuntime(_Runtime):
+    """Scraper runtime for async_playwright scripts, with an optional cap on live contexts"""
+
+    def __init__(self, max_contexts=None, **options):
+        super().__init__(**options)
+        self._slots = asyncio.Semaphore(max_contexts) if max_contexts else None
+
+    async def __aenter__(self):
+        start = time.perf_counter()
+        self._playwright = await async_playwright().start()
+        endpoint = os.environ.get(BROWSER_ENDPOINT_ENV)
+        if endpoint:
+            self.browser = await self._playwright.chromium.connect_over_cdp(endpoint)
+            self.stats.reused_browser = True
+        else:
+            self.browser = await self._playwright.chromium.launch(headless=self.headless)
+        self.stats.startup_seconds = time.perf_counter() - start
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _route(self, route):
+        request = route.request
+        action, entry = self._plan(request)
+        if action == 'abort':
+            self.stats.blocked += 1
+            await route.abort()
+        elif action == 'continue':
+            await route.continue_()
+        elif action == 'hit':
+            await route.fulfill(**self._cached_response(request.url, entry, 'HIT'))
+        else:
+            try:
+                response = await route.fetch(headers=self._fetch_headers(request, entry))
+            except Exception:
+                await route.continue_()
+                return
+            if response.status == 304 and entry:
+                await route.fulfill(**self._cached_response(request.url, entry, 'REVALIDATED'))
+                return
+            body = await response.body()
+            self.asset_cache.store(request.url, None, _Fetched(response.status, response.headers, body))
+            await route.fulfill(response=response)
+
+    async def _on_finished(self, request):
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            sizes = {}
+        self._count_transfer(request.url, sizes)
+
+    async def _acquire(self):
+        if self._slots is not None:
+            await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+        context = await self.browser.new_context(**self._context_options())
+        await context.route('**/*', self._route)
+        context.on('requestfinished', self._on_finished)
+        self._contexts.append(context)
+        self.stats.contexts += 1
+        return context
+
+    async def _release(self, context):
+        for page in list(context.pages):
+            await page.close()
+        self._idle.append(context)
+        if self._slots is not None:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def context(self):
+        """Borrow a pooled context; its pages are closed when it is returned"""
+        context = await self._acquire()
+        try:
+            yield context
+        finally:
+            await self._release(context)
+
+    async def new_page(self):
+        """A new page in the runtime's default context (outside the pool cap)"""
+        if self._default is None:
+            self._default = await self.browser.new_context(**self._context_options())
+            await self._default.route('**/*', self._route)
+            self._default.on('requestfinished', self._on_finished)
+            self._contexts.append(self._default)
+            self.stats.contexts += 1
+        return await self._default.new_page()
+
+    async def close(self):
+        if self.browser is None:
+            return
+        if self.persist_state and self._contexts:
+            await self._contexts[0].storage_state(path=self.state_file)
+        for context in self._contexts:
+            await context.close()
+        await self.browser.close()
+        await self._playwright.stop()
+        self.browser = None
+        if self.asset_cache is not None:
+            self.asset_cache.close()
+        self.stats.report()
+
+
+def serve(port=DEFAULT_CDP_PORT, headless=True):
+    """Keep one Chromium running so scraper runs can attach instead of launching"""
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless, args=[f'--remote-debugging-port={port}'])
+        print(f"✓ Browser running - in other shells:")
+        print(f"  export {BROWSER_ENDPOINT_ENV}=http://127.0.0.1:{port}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared browser for the Playwright scrapers")
+    parser.add_argument('--serve', action='store_true', help="run a long-lived browser for scrapers to attach to")
+    parser.add_argument('--port', type=int, default=DEFAULT_CDP_PORT)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Snapshot Store
+Versioned, compressed columnar snapshots of every collection run
+
+Each run is kept in its own directory instead of overwriting the JSON:
+
+    snapshots/
+      20260301T120000Z/
+        run.json            run metadata: source, arguments, row counts,
+                            column types and per-row-group statistics
+        agents.parquet      one file per table (agents, posts, edges,
+        posts.parquet       submolts), Parquet when pyarrow is installed
+        edges.parquet
+      20260302T120000Z/
+        agents.mcol         ...or the stdlib columnar format below
+        ...
+
+Rows are flattened before they are stored (post['author']['id'] becomes
+the column 'author.id'). Reads take a projection and a predicate:
+
+    store.read(run, 'agents', columns=['id', 'karma'], where=[('karma', '>', 100)])
+    store.read(run, 'posts', where=[('submolt', '==', 'm/general')])
+
+With pyarrow the predicate goes to pyarrow.parquet as filters, which skip
+row groups by their statistics. The stdlib format (.mcol) pushes it down
+the same way: rows are cut into groups of ROW_GROUP rows, every column of
+a group is a separately zlib-compressed chunk (typed array bytes for
+int/float/bool columns, JSON for the rest) and run.json records each
+chunk's offset, length and min/max, so a read skips groups the predicate
+rules out and only decompresses the columns it needs.
+
+Listing reads nothing but run.json files; diff() compares two runs on a
+key (agent id, post id, edge endpoints) using only the columns compared.
+
+    python3 snapshot_store.py list
+    python3 snapshot_store.py read latest agents --where "karma>100" --columns id,username,karma
+    python3 snapshot_store.py diff 20260301T120000Z latest
+    python3 snapshot_store.py import network-data.json
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import time
+import zlib
+from array import array
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+DEFAULT_SNAPSHOT_DIR = 'snapshots'
+RUN_FILE = 'run.json'
+BACKENDS = ('parquet', 'columnar')
+ROW_GROUP = 65536
+COMPRESSION_LEVEL = 6
+TABLE_KEYS = {
+    'agents': ('id',),
+    'posts': ('id',),
+    'edges': ('source', 'target'),
+    'submolts': ('name',),
+}
+OPERATORS = ('==', '!=', '<', '<=', '>', '>=', 'in')
+STATS_MAX_LENGTH = 64       # longer strings (post bodies) get no min/max
+ARRAY_CODES = {'int': 'q', 'float': 'd', 'bool': 'b'}
+
+
+def flatten(row, prefix=''):
+    """{'author': {'id': 1}} -> {'author.id': 1}; lists stay values"""
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def _row_groups(rows, size=ROW_GROUP):
+    group = []
+    for row in rows:
+        group.append(flatten(row))
+        if len(group) == size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def _kind(values):
+    """Storage kind of a column chunk: int, float, bool, str or json"""
+    present = [v for v in values if v is not None]
+    if all(isinstance(v, str) for v in present):
+        return 'str'
+    if len(present) < len(values):
+        return 'json'
+    if all(type(v) is bool for v in present):
+        return 'bool'
+    if all(type(v) is int for v in present):
+        return 'int'
+    if all(type(v) in (int, float) for v in present):
+        return 'float'
+    return 'json'
+
+
+def _stats(values):
+    """(min, max) of the non-null values when they are all numbers or all short strings"""
+    present = [v for v in values if v is not None]
+    if not present:
+        return None
+    if all(isinstance(v, str) and len(v) <= STATS_MAX_LENGTH for v in present) or all(
+            isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return [min(present), max(present)]
+    return None
+
+
+def _typed(kind, values):
+    arr = array(ARRAY_CODES[kind], values)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr
+
+
+def encode_chunk(values):
+    """(kind, compressed bytes) of one column chunk"""
+    kind = _kind(values)
+    if kind in ARRAY_CODES:
+        try:
+            data = _typed(kind, values).tobytes()
+        except OverflowError:
+            kind = 'json'
+    if kind not in ARRAY_CODES:
+        data = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return kind, zlib.compress(data, COMPRESSION_LEVEL)
+
+
+def decode_chunk(kind, blob):
+    data = zlib.decompress(blob)
+    if kind in ARRAY_CODES:
+        arr = array(ARRAY_CODES[kind])
+        arr.frombytes(data)
+        if sys.byteorder != 'little':
+            arr.byteswap()
+        return [bool(v) for v in arr] if kind == 'bool' else arr.tolist()
+    return json.loads(data)
+
+
+def _matches(value, op, target):
+    """SQL-style comparison: null never matches"""
+    if value is None:
+        return False
+    try:
+        if op == '==':
+            return value == target
+        if op == '!=':
+            return value != target
+        if op == '<':
+            return value < target
+        if op == '<=':
+            return value <= target
+        if op == '>':
+            return value > target
+        if op == '>=':
+            return value >= target
+        if op == 'in':
+            return value in target
+    except TypeError:
+        return False
+    raise ValueError(f"Unknown operator: {op} (expected one of {OPERATORS})")
+
+
+def _may_match(stats, op, target):
+    """False when a chunk's min/max rule out every row for the predicate"""
+    if stats is None:
+        return True
+    low, high = stats
+    try:
+        if op == '==':
+            return low <= target <= high
+        if op == '<':
+            return low < target
+        if op == '<=':
+            return low <= target
+        if op == '>':
+            return high > target
+        if op == '>=':
+            return high >= target
+        if op == 'in':
+            return any(low <= t <= high for t in target)
+    except TypeError:
+        return True
+    return True
+
+
+def parse_predicate(text):
+    """'karma>100' -> ('karma', '>', 100); values are JSON, else plain strings"""
+    match = re.match(r'^\s*([\w.]+)\s*(==|!=|>=|<=|>|<|=|\bin\b)\s*(.+?)\s*$', text)
+    if not match:
+        raise ValueError(f"Cannot parse predicate: {text!r} (e.g. karma>100 or submolt==m/general)")
+    column, op, raw = match.groups()
+    op = {'=': '=='}.get(op, op)
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    return column, op, value
+
+
+class ColumnarWriter:
+    """Stdlib backend: one .mcol file of compressed column chunks per table"""
+
+    extension = '.mcol'
+
+    def write(self, path, rows):
+        """Write rows in groups; returns the table's metadata"""
+        groups = []
+        columns = {}
+        total = 0
+        with open(path, 'wb') as f:
+            for group in _row_groups(rows):
+                names = list(dict.fromkeys(key for row in group for key in row))
+                chunks = {}
+                for name in names:
+                    values = [row.get(name) for row in group]
+                    kind, blob = encode_chunk(values)
+                    chunks[name] = {'offset': f.tell(), 'length': len(blob), 'kind': kind,
+                                    'stats': _stats(values)}
+                    f.write(blob)
+                    columns.setdefault(name, kind)
+                    if columns[name] != kind:
+                        columns[name] = 'json'
+                groups.append({'rows': len(group), 'chunks': chunks})
+                total += len(group)
+        return {'rows': total, 'columns': columns, 'groups': groups}
+
+    def read(self, path, table_meta, columns, where):
+        wanted = columns or list(table_meta['columns'])
+        needed = list(dict.fromkeys(list(wanted) + [column for column, _, _ in where]))
+        with open(path, 'rb') as f:
+            for group in table_meta['groups']:
+                chunks = group['chunks']
+                if not all(column in chunks and _may_match(chunks[column]['stats'], op, value)
+                           for column, op, value in where):
+                    continue
+
+                def load(name):
+                    chunk = chunks.get(name)
+                    if chunk is None:
+                        return [None] * group['rows']
+                    f.seek(chunk['offset'])
+                    return decode_chunk(chunk['kind'], f.read(chunk['length']))
+
+                data = {}
+                keep = range(group['rows'])
+                for column, op, value in where:
+                    data[column] = load(column)
+                    keep = [i for i in keep if _matches(data[column][i], op, value)]
+                    if not keep:
+                        break
+                if not keep:
+                    continue
+                for name in needed:
+                    if name not in data:
+                        data[name] = load(name)
+                for i in keep:
+                    yield {name: data[name][i] for name in wanted}
+
+
+class ParquetWriter:
+    """pyarrow backend: one zstd-compressed Parquet file per table"""
+
+    extension = '.parquet'
+
+    def write(self, path, rows):
+        tables = [self._arrow_table(group) for group in _row_groups(rows)]
+        if not tables:
+            table = pa.table({})
+        elif len(tables) == 1:
+            table = tables[0]
+        else:
+            try:
+                table = pa.concat_tables(tables, promote_options='default')
+            except TypeError:       # pyarrow < 14
+                table = pa.concat_tables(tables, promote=True)
+        pq.write_table(table, path, compression='zstd', row_group_size=ROW_GROUP)
+        return {'rows': table.num_rows,
+                'columns': {field.name: str(field.type) for field in table.schema}}
+
+    @staticmethod
+    def _arrow_table(group):
+        """
+        Arrow table of one row group with a column for every key in any row.
+
+        Table.from_pylist takes its schema from the first row only, so keys
+        that first appear later (an edge's `reason`, a post's optional
+        fields) would be dropped; rows without a key get null.
+        """
+        names = list(dict.fromkeys(key for row in group for key in row))
+        return pa.Table.from_pydict({name: [row.get(name) for row in group] for name in names})
+
+    def read(self, path, table_meta, columns, where):
+        filters = [(column, op, list(value) if op == 'in' else value) for column, op, value in where]
+        table = pq.read_table(path, columns=list(columns) if columns else None, filters=filters or None)
+        yield from table.to_pylist()
+
+
+BACKEND_CLASSES = {'parquet': ParquetWriter, 'columnar': ColumnarWriter}
+
+
+def default_backend():
+    return 'parquet' if pq is not None else 'columnar'
+
+
+class SnapshotStore:
+    """A directory of snapshot runs, newest last"""
+
+    def __init__(self, root=DEFAULT_SNAPSHOT_DIR, backend=None):
+        self.root = root
+        self.backend = backend or default_backend()
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown snapshot backend: {self.backend} (expected one of {BACKENDS})")
+        if self.backend == 'parquet' and pq is None:
+            raise ImportError("The parquet backend needs pyarrow: pip3 install pyarrow")
+
+    def write(self, tables, metadata=None):
+        """
+        Store one run. `tables` maps table names to iterables of row dicts
+        (a PostStore works); returns the run's metadata.
+        """
+        run_id = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+        suffix = 1
+        while os.path.exists(os.path.join(self.root, run_id)):
+            suffix += 1
+            run_id = f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{suffix}"
+
+        staging = os.path.join(self.root, f".{run_id}.tmp")
+        os.makedirs(staging)
+        start = time.perf_counter()
+        writer = BACKEND_CLASSES[self.backend]()
+        run = {
+            'run_id': run_id,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'backend': self.backend,
+            'tables': {},
+            **(metadata or {}),
+        }
+        try:
+            for name, rows in tables.items():
+                path = os.path.join(staging, name + writer.extension)
+                run['tables'][name] = writer.write(path, rows)
+                run['tables'][name]['bytes'] = os.path.getsize(path)
+            run['seconds'] = round(time.perf_counter() - start, 2)
+            with open(os.path.join(staging, RUN_FILE), 'w') as f:
+                json.dump(run, f, indent=2)
+            # Appears in listings only once complete
+            os.replace(staging, os.path.join(self.root, run_id))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return run
+
+    def runs(self):
+        """Metadata of every stored run, oldest first (only run.json files are read)"""
+        if not os.path.isdir(self.root):
+            return []
+        runs = []
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name, RUN_FILE)
+            if not name.startswith('.') and os.path.exists(path):
+                with open(path) as f:
+                    runs.append(json.load(f))
+        return runs
+
+    def run(self, run_id):
+        """Metadata of one run; 'latest' and 'previous' name the last two"""
+        if run_id in ('latest', 'previous'):
+            runs = self.runs()
+            position = -1 if run_id == 'latest' else -2
+            if len(runs) < -position:
+                raise KeyError(f"No {run_id} snapshot in {self.root}/")
+            return runs[position]
+        path = os.path.join(self.root, run_id, RUN_FILE)
+        if not os.path.exists(path):
+            raise KeyError(f"No snapshot {run_id} in {self.root}/")
+        with open(path) as f:
+            return json.load(f)
+
+    def scan(self, run_id, table, columns=None, where=()):
+        """Yield the rows of one table, projected to `columns`, that match every (column, op, value)"""
+        run = self.run(run_id)
+        if table not in run['tables']:
+            raise KeyError(f"Snapshot {run['run_id']} has no {table} table")
+        where = [tuple(predicate) for predicate in where]
+        for _, op, _ in where:
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown operator: {op} (expected one of {OPERATORS})")
+        reader = BACKEND_CLASSES[run['backend']]()
+        path = os.path.join(self.root, run['run_id'], table + reader.extension)
+        yield from reader.read(path, run['tables'][table], columns, where)
+
+    def read(self, run_id, table, columns=None, where=()):
+        return list(self.scan(run_id, table, columns=columns, where=where))
+
+    def diff(self, old_run, new_run, table='agents', key=None, columns=None):
+        """
+        Rows added, removed and changed between two runs, matched on `key`
+        (a column tuple; edges match either orientation). Only the key and
+        compared columns are read.
+        """
+        key = tuple(key or TABLE_KEYS.get(table, ('id',)))
+        old_meta, new_meta = self.run(old_run), self.run(new_run)
+        if columns is None:
+            shared = set(old_meta['tables'][table]['columns']) & set(new_meta['tables'][table]['columns'])
+            columns = [c for c in new_meta['tables'][table]['columns'] if c in shared and c not in key]
+
+        def keyed(run_id):
+            rows = {}
+            for row in self.scan(run_id, table, columns=list(key) + list(columns)):
+                k = tuple(row[c] for c in key)
+                if table == 'edges':
+                    k = tuple(sorted(k, key=str))
+                rows[k] = tuple(row[c] for c in columns)
+            return rows
+
+        old, new = keyed(old_meta['run_id']), keyed(new_meta['run_id'])
+        changed = {}
+        for k, values in new.items():
+            before = old.get(k)
+            if before is not None and before != values:
+                changed[k] = {c: [a, b] for c, a, b in zip(columns, before, values) if a != b}
+        return {
+            'table': table,
+            'old': old_meta['run_id'],
+            'new': new_meta['run_id'],
+            'key': list(key),
+            'added': [k for k in new if k not in old],
+            'removed': [k for k in old if k not in new],
+            'changed': changed,
+        }
+
+    def growth(self):
+        """Row counts per run over time, e.g. for the growth animation"""
+        return [{'run_id': run['run_id'], 'created_at': run['created_at'],
+                 **{name: table['rows'] for name, table in run['tables'].items()}}
+                for run in self.runs()]
+
+
+def snapshot_graph(graph, root=DEFAULT_SNAPSHOT_DIR, posts=None, source=None, extra=None, backend=None):
+    """
+    Store a built graph as a run: its nodes as the agents table, edges,
+    and optionally posts and the metadata's submolts. Returns the run.
+    """
+    metadata = dict(graph.get('metadata', {}))
+    tables = {'agents': graph['nodes'], 'edges': graph['edges']}
+    if posts is not None:
+        tables['posts'] = posts
+    if metadata.get('submolts'):
+        tables['submolts'] = metadata.pop('submolts')
+    metadata.pop('edge_format', None)
+    return SnapshotStore(root, backend=backend).write(tables, {'source': source, 'graph': metadata, **(extra or {})})
+
+
+def print_snapshot(run, root=DEFAULT_SNAPSHOT_DIR):
+    size = sum(table['bytes'] for table in run['tables'].values())
+    counts = ', '.join(f"{table['rows']:,} {name}" for name, table in run['tables'].items())
+    print(f"✓ Snapshot {root}/{run['run_id']} ({run['backend']}, {size / 1e6:.1f} MB): {counts}")
+
+
+def _print_diff(result, limit=10):
+    print(f"{result['table']}: {result['old']} -> {result['new']} (key {', '.join(result['key'])})")
+    print(f"  + {len(result['added']):,} added, - {len(result['removed']):,} removed, "
+          f"~ {len(result['changed']):,} changed")
+    for k, changes in list(result['changed'].items())[:limit]:
+        shown = ', '.join(f"{c}: {a} -> {b}" for c, (a, b) in changes.items())
+        print(f"    {'/'.join(map(str, k))}: {shown}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="List, read and diff collection snapshots")
+    parser.add_argument('--dir', default=DEFAULT_SNAPSHOT_DIR, help="snapshot directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help="one line per run")
+    commands.add_parser('growth', help="row counts per run as JSON")
+
+    read = commands.add_parser('read', help="rows of one table")
+    read.add_argument('run', help="run id, 'latest' or 'previous'")
+    read.add_argument('table')
+    read.add_argument('--columns', help="comma-separated projection")
+    read.add_argument('--where', action='append', default=[], metavar='PREDICATE',
+                      help="e.g. karma>100 or submolt==m/general (repeat to AND)")
+    read.add_argument('--limit', type=int, default=20, help="rows to print (0 = all)")
+
+    diff = commands.add_parser('diff', help="added/removed/changed rows between two runs")
+    diff.add_argument('old', nargs='?', default='previous')
+    diff.add_argument('new', nargs='?', default='latest')
+    diff.add_argument('--table', default='agents')
+    diff.add_argument('--columns', help="comma-separated columns to compare (default: all shared)")
+
+    imported = commands.add_parser('import', help="snapshot an existing network-data.json")
+    imported.add_argument('input', nargs='?', default='network-data.json')
+    imported.add_argument('--backend', choices=BACKENDS)
+    return parser.parse_args()
+
+
+def run_command(args):
+    store = SnapshotStore(args.dir, backend=getattr(args, 'backend', None))
+
+    if args.command == 'list':
+        for run in store.runs():
+            counts = ', '.join(f"{table['rows']:,} {name}" for name, table in run['tables'].items())
+            print(f"{run['run_id']}  {run['backend']:8s}  {run.get('source') or '-':22s}  {counts}")
+    elif args.command == 'growth':
+        print(json.dumps(store.growth(), indent=2))
+    elif args.command == 'read':
+        columns = args.columns.split(',') if args.columns else None
+        where = [parse_predicate(text) for text in args.where]
+        for n, row in enumerate(store.scan(args.run, args.table, columns=columns, where=where)):
+            if args.limit and n >= args.limit:
+                break
+            print(json.dumps(row))
+    elif args.command == 'diff':
+        columns = args.columns.split(',') if args.columns else None
+        _print_diff(store.diff(args.old, args.new, table=args.table, columns=columns))
+    elif args.command == 'import':
+        from graph_json import load_graph
+        graph = load_graph(args.input)
+        run = snapshot_graph(graph, args.dir, source=os.path.basename(args.input), backend=args.backend)
+        print_snapshot(run, args.dir)
+
+
+def main():
+    args = parse_args()
+    try:
+        run_command(args)
+    except (KeyError, ValueError, ImportError) as e:
+        # KeyError's str() quotes the message; print it as written
+        print(f"❌ {e.args[0] if e.args else e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
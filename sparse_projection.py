@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Sparse Submolt Projection
+Computes submolt co-activity edges with NumPy/SciPy sparse matrices
+
+Two agents are connected with weight = sum over shared submolts of
+min(posts_a, posts_b), the same rule as build_network_graph. Because
+min(x, y) = number of levels t >= 1 with x >= t and y >= t, the weight
+matrix is the sum of B_t @ B_t.T where B_t marks agent/submolt cells with
+at least t posts. Consecutive levels with the same non-zero pattern are
+folded into one product, so the work is a handful of compiled sparse
+matrix products instead of a Python loop over every agent pair.
+"""
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+except ImportError:
+    np = None
+    sp = None
+
+DEFAULT_BLOCK_ROWS = 65536
+
+
+def require_scipy():
+    """Fail with an install hint if NumPy/SciPy are missing"""
+    if np is None or sp is None:
+        raise ImportError(
+            "The sparse engine needs NumPy and SciPy: pip3 install numpy scipy"
+        )
+
+
+def incidence_matrix(posts, default_submolt='m/general'):
+    """
+    Build the agent x submolt post-count matrix from feed posts.
+
+    Returns (matrix, agent_ids, submolt_names); row i is agent_ids[i] and
+    column j is submolt_names[j]. Agents and submolts are indexed in the
+    order they first appear in the feed.
+    """
+    require_scipy()
+
+    agent_index = {}
+    submolt_index = {}
+    rows = np.fromiter(
+        (agent_index.setdefault(post['author']['id'], len(agent_index)) for post in posts),
+        dtype=np.int64, count=len(posts)
+    )
+    cols = np.fromiter(
+        (submolt_index.setdefault(post.get('submolt', default_submolt), len(submolt_index))
+         for post in posts),
+        dtype=np.int64, count=len(posts)
+    )
+
+    # Duplicate (agent, submolt) cells are summed into post counts
+    matrix = sp.csr_matrix(
+        (np.ones(len(posts), dtype=np.int64), (rows, cols)),
+        shape=(len(agent_index), len(submolt_index))
+    )
+    matrix.sum_duplicates()
+
+    return matrix, list(agent_index), list(submolt_index)
+
+
+def min_weighted_projection(matrix, block_rows=DEFAULT_BLOCK_ROWS):
+    """
+    Project an agent x submolt count matrix onto agent pairs.
+
+    Returns a COO matrix holding the upper triangle (row < col) of
+    W[a, b] = sum_s min(matrix[a, s], matrix[b, s]). Rows are processed
+    in blocks of `block_rows` against columns from the block onwards, so
+    only the upper triangle is computed and peak memory stays bounded by
+    the edges of one block.
+    """
+    require_scipy()
+
+    n_agents = matrix.shape[0]
+
+    # Split the counts into 0/1 level matrices, folding runs of levels
+    # that share a non-zero pattern into one (step, matrix) pair
+    levels = []
+    residual = sp.csr_matrix(matrix, dtype=np.int64, copy=True)
+    residual.eliminate_zeros()
+    while residual.nnz:
+        step = int(residual.data.min())
+        level = residual.copy()
+        level.data = np.ones_like(level.data)
+        levels.append((step, level))
+
+        residual.data -= step
+        residual.eliminate_zeros()
+
+    rows, cols, weights = [], [], []
+    for start in range(0, n_agents, block_rows):
+        stop = min(start + block_rows, n_agents)
+        block = None
+        for step, level in levels:
+            product = step * (level[start:stop] @ level[start:].T)
+            block = product if block is None else block + product
+
+        # Local column c is global start + c; keep strictly above diagonal
+        block = sp.triu(block, k=1).tocoo()
+        rows.append(block.row.astype(np.int64) + start)
+        cols.append(block.col.astype(np.int64) + start)
+        weights.append(block.data)
+
+    if not rows:
+        return sp.coo_matrix((n_agents, n_agents), dtype=np.int64)
+
+    return sp.coo_matrix(
+        (np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n_agents, n_agents)
+    )
+
+
+def submolt_coactivity_coo(posts):
+    """
+    Compute submolt co-activity edges as a COO edge list.
+
+    Returns (agent_ids, submolt_names, rows, cols, weights) where edge k
+    joins agent_ids[rows[k]] and agent_ids[cols[k]] with weights[k].
+    """
+    matrix, agent_ids, submolt_names = incidence_matrix(posts)
+    projection = min_weighted_projection(matrix)
+    return agent_ids, submolt_names, projection.row, projection.col, projection.data
+
+
+def build_submolt_edges(posts, with_submolts=True):
+    """
+    Build the submolt_activity edge dicts for network-data.json.
+
+    Edges come out sorted by agent index rather than in feed-scan order.
+    Pass with_submolts=False to skip the per-edge provenance list, which
+    is the only part of this engine that runs per edge in Python.
+    """
+    matrix, agent_ids, submolt_names = incidence_matrix(posts)
+    projection = min_weighted_projection(matrix)
+
+    order = np.lexsort((projection.col, projection.row))
+    rows = projection.row[order]
+    cols = projection.col[order]
+    weights = projection.data[order]
+
+    agent_submolts = None
+    if with_submolts:
+        agent_submolts = [
+            set(matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]].tolist())
+            for i in range(matrix.shape[0])
+        ]
+
+    edges = []
+    for source, target, weight in zip(rows.tolist(), cols.tolist(), weights.tolist()):
+        edge = {
+            'source': agent_ids[source],
+            'target': agent_ids[target],
+            'weight': weight,
+            'type': 'submolt_activity'
+        }
+        if agent_submolts is not None:
+            shared = agent_submolts[source] & agent_submolts[target]
+            edge['submolts'] = [submolt_names[j] for j in sorted(shared)]
+        edges.append(edge)
+
+    return edges
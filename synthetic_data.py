@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Moltbook Network Map - Synthetic Data Generator
+Seeded agents/posts/submolts fixtures shaped like the real API responses
+
+Activity is heavy-tailed the way the live directory is: most agents never
+post, a few post a lot, and submolt popularity follows a Zipf curve.
+Each agent sticks to one to three home submolts, so co-activity is
+clustered rather than uniform. The same seed always produces the same
+dataset.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from bisect import bisect_left
+
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+ACTIVE_SHARE = 0.3          # agents with at least one post
+VERIFIED_SHARE = 0.005
+POSTS_PER_AGENT = 0.5       # feed posts generated per registered agent
+ACTIVITY_ALPHA = 1.2        # Pareto shape of posts_count
+SUBMOLT_ZIPF = 1.1          # Zipf exponent of submolt popularity
+FEED_START = 1769904000     # 2026-02-01T00:00:00Z, posts 5s apart
+
+NAME_PARTS = [
+    'neural', 'quantum', 'data', 'code', 'cipher', 'oracle', 'nova', 'flux',
+    'echo', 'atlas', 'pulse', 'helix', 'claw', 'molt', 'vector', 'prism',
+    'spark', 'nexus', 'cortex', 'beacon', 'ronin', 'pith', 'luna', 'forge',
+]
+TOPICS = [
+    'general', 'agents', 'ai', 'coding', 'philosophy', 'crypto', 'memes',
+    'research', 'tools', 'showcase', 'help', 'news', 'music', 'art', 'games',
+]
+
+
+def parse_size(value):
+    """'10k' -> 10000, '2.5m' -> 2500000; plain integers are accepted too"""
+    value = value.lower()
+    if value in SIZES:
+        return SIZES[value]
+    for suffix, scale in (('k', 1_000), ('m', 1_000_000)):
+        if value.endswith(suffix):
+            return int(float(value[:-1]) * scale)
+    return int(value)
+
+
+def _zipf_cumulative(count, exponent):
+    weights = [1 / (rank ** exponent) for rank in range(1, count + 1)]
+    return list(itertools.accumulate(weights))
+
+
+def _pick(rng, cumulative):
+    return bisect_left(cumulative, rng.random() * cumulative[-1])
+
+
+def submolt_count_for(n_agents):
+    """Roughly one submolt per 300 agents, between 10 and 5000"""
+    return max(10, min(5000, n_agents // 300))
+
+
+def generate_dataset(n_agents, seed=0, posts_per_agent=POSTS_PER_AGENT):
+    """
+    Generate {'agents', 'posts', 'submolts'} for n_agents agents.
+
+    Agents carry id/username/posts_count/karma/verified like /agents;
+    posts carry id/author/submolt/upvotes/created_at like /feed, newest
+    first; submolts carry name/subscriber_count like /submolts.
+    """
+    rng = random.Random(seed)
+
+    n_submolts = submolt_count_for(n_agents)
+    submolt_names = [
+        f"m/{TOPICS[i]}" if i < len(TOPICS) else f"m/{rng.choice(TOPICS)}-{i}"
+        for i in range(n_submolts)
+    ]
+    popularity = _zipf_cumulative(n_submolts, SUBMOLT_ZIPF)
+    subscribers = [0] * n_submolts
+
+    agents = []
+    homes = []
+    for i in range(n_agents):
+        active = rng.random() < ACTIVE_SHARE
+        posts_count = int(rng.paretovariate(ACTIVITY_ALPHA)) if active else 0
+        karma = int(posts_count * rng.paretovariate(1.5)) if posts_count and rng.random() < 0.4 else 0
+        name = f"{rng.choice(NAME_PARTS).title()}{rng.choice(NAME_PARTS).title()}{i}"
+
+        agent_homes = {_pick(rng, popularity) for _ in range(rng.randint(1, 3))}
+        for submolt in agent_homes:
+            subscribers[submolt] += 1
+        homes.append(sorted(agent_homes))
+
+        agents.append({
+            'id': f"{rng.getrandbits(64):016x}",
+            'username': name,
+            'posts_count': posts_count,
+            'karma': karma,
+            'verified': rng.random() < VERIFIED_SHARE
+        })
+
+    # Post authors are drawn in proportion to posts_count
+    authors = [i for i, agent in enumerate(agents) if agent['posts_count']]
+    author_weights = list(itertools.accumulate(agents[i]['posts_count'] for i in authors))
+
+    posts = []
+    n_posts = int(n_agents * posts_per_agent) if authors else 0
+    for k in range(n_posts):
+        author = authors[bisect_left(author_weights, rng.random() * author_weights[-1])]
+        agent = agents[author]
+        posts.append({
+            'id': f"post_{n_posts - k:08d}",
+            'author': {'id': agent['id'], 'username': agent['username']},
+            'submolt': submolt_names[rng.choice(homes[author])],
+            'upvotes': int(rng.paretovariate(1.5)) - 1,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(FEED_START + (n_posts - k) * 5))
+        })
+
+    submolts = [
+        {'name': name, 'subscriber_count': subscribers[i]}
+        for i, name in enumerate(submolt_names)
+    ]
+
+    return {'agents': agents, 'posts': posts, 'submolts': submolts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Moltbook fixtures")
+    parser.add_argument('--sizes', nargs='+', default=list(SIZES),
+                        help="agent counts to generate (1k, 10k, 100k, 1m or integers)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='fixtures', help="output directory")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for size in args.sizes:
+        n_agents = parse_size(size)
+        data = generate_dataset(n_agents, seed=args.seed)
+        path = os.path.join(args.out, f"synthetic-{size}.json")
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        print(f"✓ {path}: {len(data['agents'])} agents, {len(data['posts'])} posts, "
+              f"{len(data['submolts'])} submolts")
+
+
+if __name__ == '__main__':
+    main()
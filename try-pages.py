@@ -3,8 +3,10 @@
 Try accessing different pages of agents via URL parameters
 """
 
-from playwright.sync_api import sync_playwright
-import time
+from page_readiness import AGENT_LINKS, PageWaiter
+from scraper_runtime import ScraperRuntime
+
+waiter = PageWaiter()
 
 urls_to_try = [
     "https://www.moltbook.com/u?page=2",
@@ -14,14 +16,13 @@ urls_to_try = [
     "https://www.moltbook.com/u?page=1&limit=200",
 ]
 
-with sync_playwright() as p:
-    browser = p.chromium.launch(headless=True)
-    page = browser.new_page()
+with ScraperRuntime() as runtime:
+    page = runtime.new_page()
     
     for url in urls_to_try:
         print(f"\nTrying: {url}")
         page.goto(url, timeout=15000)
-        time.sleep(3)
+        waiter.content(page, AGENT_LINKS, label='directory')
         
         # Count agents
         links = page.query_selector_all('a[href^="/u/"]')
@@ -35,4 +36,4 @@ with sync_playwright() as p:
         if agents:
             print(f"  Sample: {list(agents)[:5]}")
     
-    browser.close()
+    waiter.report()